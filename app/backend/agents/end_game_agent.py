@@ -1,13 +1,17 @@
 from langgraph.prebuilt import create_react_agent
-from ..utils.model import model
+from ..utils.context_window import windowed_prompt
+from ..utils.model import model_for
 from ..tools.end_game_tools import end_game
 
 end_game_agent = create_react_agent(
-    model=model,
+    model=model_for("end_game_agent"),
     tools=[end_game],
     name="end_game_agent",
-    prompt="You are essentially a game ending agent. If the user decides to quit, "
-           "you will show them the number of games they have played."
-           "You may use end_game to display the stats.\n\n"
+    prompt=windowed_prompt(
+        "end_game_agent",
+        "You are essentially a game ending agent. If the user decides to quit, "
+        "you will show them the number of games they have played."
+        "You may use end_game to display the stats.\n\n",
+    ),
 
 )
\ No newline at end of file
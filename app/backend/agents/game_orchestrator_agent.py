@@ -1,11 +1,14 @@
-SUPERVISOR_PROMPT = """You are a game orchestrator supervisor. Based on the user's request and the route_to field, you need to route them to the appropriate agent.
+from app.backend.tools.number_game_tools import MAX_NUMBER, MIN_NUMBER
+from app.backend.tools.word_game_planner import word_index
+
+SUPERVISOR_PROMPT = f"""You are a game orchestrator supervisor. Based on the user's request and the route_to field, you need to route them to the appropriate agent.
 
 IMPORTANT: If the state has route_to="word_game", you MUST route to word_game_agent.
 If the state has route_to="number_game", you MUST route to number_game_agent.
 
 Available agents:
-- number_game_agent: For number guessing games (1-50 range)
-- word_game_agent: For word guessing games (apple, kiwi, desk, chair, car, pen)
+- number_game_agent: For number guessing games ({MIN_NUMBER}-{MAX_NUMBER} range)
+- word_game_agent: For word guessing games ({word_index.vocabulary_hint()})
 - end_game_agent: For ending the session
 
 Look at both the route_to field AND the user's message:
@@ -21,11 +24,12 @@ from langgraph_supervisor import create_supervisor
 from app.backend.agents.number_game_agent import number_game_agent
 from app.backend.agents.word_game_agent import word_game_agent
 from app.backend.agents.end_game_agent import end_game_agent
-from app.backend.utils.model import model
+from app.backend.utils.context_window import windowed_prompt
+from app.backend.utils.model import model_for
 
 game_orchestrator = create_supervisor(
     [number_game_agent, word_game_agent, end_game_agent],
-    model=model,
-    prompt=SUPERVISOR_PROMPT,
+    model=model_for("supervisor"),
+    prompt=windowed_prompt("supervisor", SUPERVISOR_PROMPT),
     supervisor_name="game_orchestrator"
 )
\ No newline at end of file
@@ -1,10 +1,14 @@
 from langgraph.prebuilt import create_react_agent
-from ..utils.model import model
-from ..tools.number_game_tools import guess_number
+from ..utils.context_window import windowed_prompt
+from ..utils.model import model_for
+from ..tools.number_game_tools import MAX_NUMBER, MIN_NUMBER, guess_number
 
 number_game_agent = create_react_agent(
-    model=model,
+    model=model_for("number_game_agent"),
     tools=[guess_number],
     name="number_game_agent",
-    prompt="You are a number guessing game agent. Your job is to guess the human's number between 1 and 50. Use the guess_number tool to start the guessing game.\n\n"
+    prompt=windowed_prompt(
+        "number_game_agent",
+        f"You are a number guessing game agent. Your job is to guess the human's number between {MIN_NUMBER} and {MAX_NUMBER}. Use the guess_number tool to start the guessing game.\n\n",
+    ),
 )
\ No newline at end of file
@@ -1,10 +1,14 @@
 from langgraph.prebuilt import create_react_agent
-from ..utils.model import model
+from ..utils.context_window import windowed_prompt
+from ..utils.model import model_for
 from ..tools.word_game_tools import play_word_game
 
 word_game_agent = create_react_agent(
-    model=model,
+    model=model_for("word_game_agent"),
     tools=[play_word_game],
     name="word_game_agent",
-    prompt="You are a word guessing game agent. Your job is to guess the human's chosen word by asking 5 yes/no/maybe questions, then making a final guess. Use the play_word_game tool to play the game."
+    prompt=windowed_prompt(
+        "word_game_agent",
+        "You are a word guessing game agent. Your job is to guess the human's chosen word by asking yes/no/maybe questions, then making a final guess. Use the play_word_game tool to play the game.",
+    ),
 )
\ No newline at end of file
@@ -1,14 +1,61 @@
-from fastapi import APIRouter, Request
-from app.backend.graph.graph import compiled_graph
+from typing import Union
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.backend.graph.graph import compiled_graph, routing_stats
 from app.backend.schemas.game_state import GameState
+from app.backend.schemas.requests import RouteRequest
+from app.backend.schemas.responses import GameDelta, GameResponse
+from app.backend.utils.model import llm_cache
+from app.backend.utils.request_limits import json_body
+from app.backend.utils.responses import graph_response
+from app.backend.utils.tracing import exporter
+from app.backend.utils.streaming import SSE_HEADERS, finish_game, stream_graph_events
+from app.backend.utils.log import get_logger
+import uuid
 
 router = APIRouter()
+log = get_logger(__name__)
+
+@router.post("/route", response_model=Union[GameResponse, GameDelta])
+async def orchestrate_game(
+    body: RouteRequest = Depends(json_body(RouteRequest)),
+    delta: bool = False,
+    since: int = Query(0, ge=0),
+):
+    state: GameState = body.model_dump(exclude_unset=True)
+    session_id = body.session_id or str(uuid.uuid4())
+    config = {"configurable": {"thread_id": session_id}}
+    result = await compiled_graph.ainvoke(state, config)
+    if "__interrupt__" not in result:
+        result = {**result, **await finish_game(compiled_graph, session_id)}
+    log.debug("route.result", thread_id=session_id, result=result)
+    return await graph_response(result, session_id, delta, since)
+
+
+@router.get("/route/stats")
+async def routing_statistics():
+    return dict(routing_stats)
+
+
+@router.get("/llm_cache/stats")
+async def llm_cache_statistics():
+    return llm_cache.stats()
+
+
+@router.get("/traces")
+async def recent_traces(limit: int = 100):
+    """Most recent finished spans when TRACE_EXPORTER is memory or jsonl."""
+    return exporter.recent(limit)
+
 
-@router.post("/route")
-async def orchestrate_game(request: Request):
-    print("Received request to orchestrate game")
-    body = await request.json()
-    state: GameState = body
-    result = compiled_graph.invoke(state)
-    print("Game orchestrated successfully, returning result")
-    return result
+@router.post("/route/stream")
+async def stream_orchestrated_game(body: RouteRequest = Depends(json_body(RouteRequest))):
+    state: GameState = body.model_dump(exclude_unset=True)
+    session_id = body.session_id or str(uuid.uuid4())
+    config = {"configurable": {"thread_id": session_id}}
+    return StreamingResponse(
+        stream_graph_events(compiled_graph, state, config, session_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
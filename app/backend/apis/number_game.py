@@ -1,224 +1,231 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+import os
 import uuid
-import traceback
+
+from ..schemas.requests import PlayRequest, ResumeRequest
+from ..schemas.responses import NumberGameResponse
+from ..tools.number_game_tools import MAX_NUMBER, MIN_NUMBER, TERNARY, parse_ternary_answer, ternary_prompt
+from ..utils.log import get_logger
+from ..utils.metrics import track_sessions
+from ..utils.request_limits import json_body
+from ..utils.responses import model_response
+from ..utils.session_store import SessionRecord, build_session_store
 
 router = APIRouter()
+log = get_logger(__name__)
 
-game_sessions = {}
 
+class NumberGameSession(SessionRecord):
+    __slots__ = ("min_val", "max_val", "guess_count", "game_started", "waiting_for", "version")
 
-@router.post("/number_game/play")
-async def play_number_game(request: Request):
-    try:
-        print("🎮 Number game play endpoint called")
-        body = await request.json()
-        print(f"DEBUG: Received: {body}")
+    def __init__(self, min_val: int, max_val: int, game_started: bool = False, waiting_for: str = "ready"):
+        super().__init__()
+        self.min_val = min_val
+        self.max_val = max_val
+        self.guess_count = 0
+        self.game_started = game_started
+        self.waiting_for = waiting_for
+        self.version = 0
 
-        session_id = body.get("session_id", str(uuid.uuid4()))
 
-        # Initialize game session
-        if session_id not in game_sessions:
-            game_sessions[session_id] = {
-                "min_val": 1,
-                "max_val": 50,
-                "guess_count": 0,
-                "game_started": False
-            }
+# Abandoned games expire after NUMBER_GAME_SESSION_TTL idle seconds. With
+# SHARED_STATE_BACKEND set sessions live there, so changes must be saved with put().
+game_sessions = build_session_store(
+    NumberGameSession,
+    "number_game:",
+    max_entries=int(os.getenv("NUMBER_GAME_MAX_SESSIONS", "100000")),
+    ttl_seconds=float(os.getenv("NUMBER_GAME_SESSION_TTL", "1800")),
+)
+track_sessions("number_game", lambda: game_sessions.stats().get("live_sessions"))
 
-        game_state = game_sessions[session_id]
 
-        # Start the game
-        if not game_state["game_started"]:
-            game_state["game_started"] = True
-            return {
-                "route_to": "number_game",
-                "number_game_count": 1,
-                "word_game_count": 0,
-                "type": "interrupt",
-                "message": "Great! Think of a number between 1 and 50, then say 'ready' when you're prepared!",
-                "session_id": session_id,
-                "min_val": 1,
-                "max_val": 50,
-                "guess_count": 0,
-                "messages": body.get("messages", [])
-            }
-
-        mid = (game_state["min_val"] + game_state["max_val"]) // 2
-        game_state["guess_count"] += 1
-
-        return {
-            "route_to": "number_game",
-            "number_game_count": 1,
-            "word_game_count": 0,
-            "type": "interrupt",
-            "message": f"Is your number {mid}?",
-            "session_id": session_id,
-            "min_val": game_state["min_val"],
-            "max_val": game_state["max_val"],
-            "guess_count": game_state["guess_count"],
-            "messages": body.get("messages", [])
-        }
+def number_game_response(new_messages: tuple = (), **fields) -> ORJSONResponse:
+    """Neither the request body nor the client's history is echoed back, only this turn's messages."""
+    return model_response(NumberGameResponse(messages=list(new_messages), **fields))
 
-    except Exception as e:
-        print(f"API Exception: {e}")
-        print(f"Traceback: {traceback.format_exc()}")
-        return {
-            "error": str(e),
-            "message": "Failed to play number game",
-            "messages": [{"role": "assistant", "content": f"Error: {str(e)}"}]
-        }
 
+def failed(message: str, e: Exception) -> ORJSONResponse:
+    return model_response(NumberGameResponse(
+        error=str(e),
+        message=message,
+        messages=[{"role": "assistant", "content": f"Error: {str(e)}"}],
+    ))
 
-@router.post("/number_game/resume")
-async def resume_number_game(request: Request):
+
+@router.post("/number_game/play", response_model=NumberGameResponse)
+async def play_number_game(body: PlayRequest = Depends(json_body(PlayRequest))):
     try:
-        body = await request.json()
+        log.debug("number_game.play", body=body)
+
+        session_id = body.session_id or str(uuid.uuid4())
 
-        user_input = body.get("user_input", "").lower().strip()
-        session_id = body.get("session_id")
+        # Initialize game session; the range can be chosen per game
+        game_state = await game_sessions.aget(session_id)
+        if game_state is None:
+            min_val = MIN_NUMBER if body.min_val is None else body.min_val
+            max_val = MAX_NUMBER if body.max_val is None else body.max_val
+            if min_val > max_val:
+                return model_response(NumberGameResponse(
+                    error="min_val must not be greater than max_val", session_id=session_id
+                ))
+            game_state = await game_sessions.aput(session_id, NumberGameSession(min_val, max_val))
 
-        if not user_input:
-            return {"error": "Missing user input to resume game"}
+        game_state.version += 1
 
-        if not session_id or session_id not in game_sessions:
-            game_sessions[session_id] = {
-                "min_val": 1,
-                "max_val": 50,
-                "guess_count": 0,
-                "game_started": True,
-                "waiting_for": "ready"
-            }
+        # Start the game
+        if not game_state.game_started:
+            game_state.game_started = True
+            await game_sessions.aput(session_id, game_state)
+            return number_game_response(
+                route_to="number_game",
+                number_game_count=1,
+                word_game_count=0,
+                type="interrupt",
+                message=f"Great! Think of a number between {game_state.min_val} and {game_state.max_val}, then say 'ready' when you're prepared!",
+                session_id=session_id,
+                state_version=game_state.version,
+                min_val=game_state.min_val,
+                max_val=game_state.max_val,
+                guess_count=0,
+            )
+
+        mid = (game_state.min_val + game_state.max_val) // 2
+        game_state.guess_count += 1
+        await game_sessions.aput(session_id, game_state)
+
+        return number_game_response(
+            route_to="number_game",
+            number_game_count=1,
+            word_game_count=0,
+            type="interrupt",
+            message=ternary_prompt(mid) if TERNARY else f"Is your number {mid}?",
+            session_id=session_id,
+            state_version=game_state.version,
+            min_val=game_state.min_val,
+            max_val=game_state.max_val,
+            guess_count=game_state.guess_count,
+        )
 
-        game_state = game_sessions[session_id]
+    except Exception as e:
+        log.exception("number_game.play_failed", error=str(e))
+        return failed("Failed to play number game", e)
 
-        waiting_for = game_state.get("waiting_for", "ready")
+
+@router.get("/number_game/stats")
+async def number_game_statistics():
+    return game_sessions.stats()
+
+
+@router.post(
+    "/number_game/resume",
+    response_model=NumberGameResponse,
+    responses={404: {"model": NumberGameResponse, "description": "Unknown or expired session"}},
+)
+async def resume_number_game(body: ResumeRequest = Depends(json_body(ResumeRequest))):
+    try:
+        user_input = body.user_input.lower().strip()
+        session_id = body.session_id
+
+        game_state = await game_sessions.aget(session_id)
+        if game_state is None:
+            # Finished, expired or never started: answering it must not silently start a new game
+            return model_response(NumberGameResponse(
+                error="Unknown or expired session; start a new game with /number_game/play",
+                session_id=session_id,
+            ), status_code=404)
+
+        game_state.version += 1
+        waiting_for = game_state.waiting_for
+
+        async def ask(message: str, waiting_for: str) -> ORJSONResponse:
+            await game_sessions.aput(session_id, game_state)
+            return number_game_response(
+                type="interrupt",
+                message=message,
+                session_id=session_id,
+                state_version=game_state.version,
+                min_val=game_state.min_val,
+                max_val=game_state.max_val,
+                guess_count=game_state.guess_count,
+                waiting_for=waiting_for,
+            )
+
+        async def finish(reply: str, **fields) -> ORJSONResponse:
+            await game_sessions.adelete(session_id)
+            return number_game_response(
+                ({"role": "user", "content": user_input}, {"role": "assistant", "content": reply}),
+                session_id=session_id,
+                state_version=game_state.version,
+                type=None,
+                message=None,
+                **fields,
+            )
 
         if waiting_for == "ready" and user_input == "ready":
-            mid = (game_state["min_val"] + game_state["max_val"]) // 2
-            game_state["guess_count"] += 1
-            game_state["waiting_for"] = "yes_no"
-
-            return {
-                **body,
-                "type": "interrupt",
-                "message": f"Is your number {mid}?",
-                "min_val": game_state["min_val"],
-                "max_val": game_state["max_val"],
-                "guess_count": game_state["guess_count"],
-                "waiting_for": "yes_no"
-            }
+            mid = (game_state.min_val + game_state.max_val) // 2
+            game_state.guess_count += 1
+            game_state.waiting_for = "ternary" if TERNARY else "yes_no"
+            return await ask(ternary_prompt(mid) if TERNARY else f"Is your number {mid}?", game_state.waiting_for)
+
+        elif waiting_for == "ternary" and parse_ternary_answer(user_input):
+            # One answer per guess: "yes" ends the game, higher/lower narrows and asks again
+            answer = parse_ternary_answer(user_input)
+            mid = (game_state.min_val + game_state.max_val) // 2
+
+            if answer == "yes":
+                return await finish(
+                    f"Excellent! I guessed your number ({mid}) correctly! 🎉 Thanks for playing!",
+                    game_completed=True,
+                )
+
+            if answer == "higher":
+                game_state.min_val = mid + 1
+            else:
+                game_state.max_val = mid - 1
+
+            if game_state.min_val > game_state.max_val:
+                return await finish("Something went wrong with the range. Let's start over!", error="Invalid range")
+
+            next_mid = (game_state.min_val + game_state.max_val) // 2
+            game_state.guess_count += 1
+            return await ask(ternary_prompt(next_mid), "ternary")
 
         elif waiting_for == "yes_no" and user_input == "yes":
-            mid = (game_state["min_val"] + game_state["max_val"]) // 2
-            del game_sessions[session_id]
-
-            return {
-                **body,
-                "messages": body.get("messages", []) + [
-                    {"role": "user", "content": user_input},
-                    {"role": "assistant",
-                     "content": f"Excellent! I guessed your number ({mid}) correctly! 🎉 Thanks for playing!"}
-                ],
-                "game_completed": True,
-                "type": None,
-                "message": None
-            }
+            mid = (game_state.min_val + game_state.max_val) // 2
+            return await finish(
+                f"Excellent! I guessed your number ({mid}) correctly! 🎉 Thanks for playing!",
+                game_completed=True,
+            )
 
         elif waiting_for == "yes_no" and user_input == "no":
-            mid = (game_state["min_val"] + game_state["max_val"]) // 2
-            game_state["waiting_for"] = "higher_lower"
-
-            return {
-                **body,
-                "type": "interrupt",
-                "message": f"Is your number higher or lower than {mid}?",
-                "min_val": game_state["min_val"],
-                "max_val": game_state["max_val"],
-                "guess_count": game_state["guess_count"],
-                "waiting_for": "higher_lower"
-            }
-
-        elif waiting_for == "higher_lower" and user_input == "higher":
-            mid = (game_state["min_val"] + game_state["max_val"]) // 2
-            game_state["min_val"] = mid + 1
-
-            if game_state["min_val"] > game_state["max_val"]:
-                del game_sessions[session_id]
-                return {
-                    **body,
-                    "messages": body.get("messages", []) + [
-                        {"role": "user", "content": user_input},
-                        {"role": "assistant", "content": "Something went wrong with the range. Let's start over!"}
-                    ],
-                    "error": "Invalid range",
-                    "type": None,
-                    "message": None
-                }
-
-            next_mid = (game_state["min_val"] + game_state["max_val"]) // 2
-            game_state["guess_count"] += 1
-            game_state["waiting_for"] = "yes_no"
-
-            return {
-                **body,
-                "type": "interrupt",
-                "message": f"Is your number {next_mid}?",
-                "min_val": game_state["min_val"],
-                "max_val": game_state["max_val"],
-                "guess_count": game_state["guess_count"],
-                "waiting_for": "yes_no"
-            }
-
-        elif waiting_for == "higher_lower" and user_input == "lower":
-            # Number is lower, adjust range
-            mid = (game_state["min_val"] + game_state["max_val"]) // 2
-            game_state["max_val"] = mid - 1
-
-            if game_state["min_val"] > game_state["max_val"]:
-                del game_sessions[session_id]
-                return {
-                    **body,
-                    "messages": body.get("messages", []) + [
-                        {"role": "user", "content": user_input},
-                        {"role": "assistant", "content": "Something went wrong with the range. Let's start over!"}
-                    ],
-                    "error": "Invalid range",
-                    "type": None,
-                    "message": None
-                }
-
-            next_mid = (game_state["min_val"] + game_state["max_val"]) // 2
-            game_state["guess_count"] += 1
-            game_state["waiting_for"] = "yes_no"
-
-            return {
-                **body,
-                "type": "interrupt",
-                "message": f"Is your number {next_mid}?",
-                "min_val": game_state["min_val"],
-                "max_val": game_state["max_val"],
-                "guess_count": game_state["guess_count"],
-                "waiting_for": "yes_no"
-            }
+            mid = (game_state.min_val + game_state.max_val) // 2
+            game_state.waiting_for = "higher_lower"
+            return await ask(f"Is your number higher or lower than {mid}?", "higher_lower")
+
+        elif waiting_for == "higher_lower" and user_input in ("higher", "lower"):
+            mid = (game_state.min_val + game_state.max_val) // 2
+            if user_input == "higher":
+                game_state.min_val = mid + 1
+            else:
+                game_state.max_val = mid - 1
+
+            if game_state.min_val > game_state.max_val:
+                return await finish("Something went wrong with the range. Let's start over!", error="Invalid range")
+
+            next_mid = (game_state.min_val + game_state.max_val) // 2
+            game_state.guess_count += 1
+            game_state.waiting_for = "yes_no"
+            return await ask(f"Is your number {next_mid}?", "yes_no")
 
         else:
-            expected = "ready" if waiting_for == "ready" else (
-                "yes or no" if waiting_for == "yes_no" else "higher or lower")
-            return {
-                **body,
-                "type": "interrupt",
-                "message": f"I didn't understand '{user_input}'. Please respond with: {expected}",
-                "min_val": game_state["min_val"],
-                "max_val": game_state["max_val"],
-                "guess_count": game_state["guess_count"],
-                "waiting_for": waiting_for
-            }
+            expected = {
+                "ready": "ready",
+                "ternary": "yes, higher or lower",
+                "yes_no": "yes or no",
+            }.get(waiting_for, "higher or lower")
+            return await ask(f"I didn't understand '{user_input}'. Please respond with: {expected}", waiting_for)
 
     except Exception as e:
-        print(f"Resume Exception: {e}")
-        print(f"Traceback: {traceback.format_exc()}")
-        return {
-            "error": str(e),
-            "message": "Failed to resume number game",
-            "messages": [{"role": "assistant", "content": f"Error: {str(e)}"}]
-        }
+        log.exception("number_game.resume_failed", error=str(e))
+        return failed("Failed to resume number game", e)
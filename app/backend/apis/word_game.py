@@ -1,95 +1,127 @@
-from fastapi import APIRouter, Request
+from typing import Union
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from langgraph.types import Command
 from app.backend.graph.graph import compiled_graph
 from app.backend.schemas.game_state import GameState
+from app.backend.schemas.requests import PlayRequest, ResumeRequest
+from app.backend.schemas.responses import GameDelta, GameResponse
+from app.backend.utils.log import get_logger
+from app.backend.utils.request_limits import json_body
+from app.backend.utils.responses import graph_response, model_response
+from app.backend.utils.streaming import (
+    SSE_HEADERS,
+    finish_game,
+    has_pending_interrupt,
+    run_graph_turn,
+    stream_graph_events,
+)
 import uuid
-import traceback
 import time
 
 router = APIRouter()
+log = get_logger(__name__)
 
 
-@router.post("/word_game/play")
-async def play_word_game(request: Request):
-    try:
-        print("Word game play endpoint called")
-        body = await request.json()
-        print(f"DEBUG: Received: {body}")
+def new_game_state() -> GameState:
+    unique_session_id = f"word_game_{int(time.time())}_{str(uuid.uuid4())[:8]}"
+    return {
+        "route_to": "word_game",
+        "messages": [{"role": "user", "content": "Let's play the word game"}],
+        "session_id": unique_session_id
+    }
 
-        unique_session_id = f"word_game_{int(time.time())}_{str(uuid.uuid4())[:8]}"
 
-        state: GameState = {
-            "route_to": "word_game",
-            "number_game_count": 0,
-            "word_game_count": 0,
-            "messages": [{"role": "user", "content": "Let's play the word game"}],
-            "session_id": unique_session_id
-        }
+@router.post("/word_game/play", response_model=Union[GameResponse, GameDelta])
+async def play_word_game(
+    body: PlayRequest = Depends(json_body(PlayRequest)),
+    delta: bool = False,
+    since: int = Query(0, ge=0),
+):
+    try:
+        log.debug("word_game.play", body=body)
 
-        print(f"DEBUG: Created FRESH state with unique session: {unique_session_id}")
+        state = new_game_state()
+        unique_session_id = state["session_id"]
 
         config = {"configurable": {"thread_id": unique_session_id}}
-        print(f"DEBUG: Config with unique thread_id: {config}")
-
-        print("DEBUG: Invoking compiled_graph with FRESH session...")
-        result = compiled_graph.invoke(state, config)
-        print(f"DEBUG: Graph result: {result}")
+        result, nodes_ran = await run_graph_turn(compiled_graph, state, config)
+        result["turn_nodes"] = nodes_ran
+        log.debug("word_game.play_result", session_id=unique_session_id, result=result)
 
-        return result
+        return await graph_response(result, unique_session_id, delta, since)
 
     except Exception as e:
-        print(f"Word Game API Exception: {e}")
-        print(f"Traceback: {traceback.format_exc()}")
-        return {
-            "error": str(e),
-            "message": "Failed to play word game",
-            "messages": [{"role": "assistant", "content": f"Error: {str(e)}"}]
-        }
-
-
-@router.post("/word_game/resume")
-async def resume_word_game(request: Request):
+        log.exception("word_game.play_failed", error=str(e))
+        return model_response(GameResponse(
+            error=str(e),
+            message="Failed to play word game",
+            messages=[{"role": "assistant", "content": f"Error: {str(e)}"}],
+        ))
+
+
+@router.post("/word_game/resume", response_model=Union[GameResponse, GameDelta])
+async def resume_word_game(
+    body: ResumeRequest = Depends(json_body(ResumeRequest)),
+    delta: bool = False,
+    since: int = Query(0, ge=0),
+):
     try:
-        print("Word game resume endpoint called")
-        body = await request.json()
-        print(f"DEBUG: Resume body: {body}")
-
-        # Get user response
-        user_input = body.get("user_input")
-        if not user_input:
-            return {"error": "Missing user input to resume word game"}
+        log.debug("word_game.resume", body=body)
 
-        print(f"DEBUG: User input: {user_input}")
+        # Both are required and size-checked by ResumeRequest
+        user_input = body.user_input
+        session_id = body.session_id
 
-        # Extract the session ID - CRITICAL for proper resumption
-        session_id = body.get("session_id")
-        if not session_id:
-            print("DEBUG: No session_id found in resume request")
-            return {"error": "Missing session_id for resume"}
-
-        print(f"DEBUG: Resuming with session_id: {session_id}")
+        config = {"configurable": {"thread_id": session_id}}
+        if not await has_pending_interrupt(compiled_graph, config):
+            return model_response(GameResponse(
+                error="No pending question to answer for this session", session_id=session_id
+            ))
 
+        # Resume the paused node directly instead of re-entering the graph from the start
+        result, nodes_ran = await run_graph_turn(compiled_graph, Command(resume=user_input), config)
+        result["turn_nodes"] = nodes_ran
+        log.debug("word_game.resume_result", session_id=session_id, result=result)
 
-        resume_state = {
-            "user_input": user_input,
-            "route_to": "word_game"
-        }
+        if "__interrupt__" not in result:
+            result.update(await finish_game(compiled_graph, session_id, complete=True))
 
-        print(f"DEBUG: Minimal resume state: {resume_state}")
+        return await graph_response(result, session_id, delta, since)
 
+    except Exception as e:
+        log.exception("word_game.resume_failed", error=str(e))
+        return model_response(GameResponse(
+            error=str(e),
+            message="Failed to resume word game",
+            messages=[{"role": "assistant", "content": f"Error: {str(e)}"}],
+        ))
+
+
+@router.post("/word_game/stream")
+async def stream_word_game(body: PlayRequest = Depends(json_body(PlayRequest))):
+    """
+    Server-sent-events variant of play/resume. Without a user_input a new game
+    is started; with session_id and user_input the existing game is resumed.
+    """
+    user_input = body.user_input
+    session_id = body.session_id
+
+    if user_input and session_id:
+        config = {"configurable": {"thread_id": session_id}}
+        if not await has_pending_interrupt(compiled_graph, config):
+            return model_response(GameResponse(
+                error="No pending question to answer for this session", session_id=session_id
+            ))
+        graph_input = Command(resume=user_input)
+    else:
+        graph_input = new_game_state()
+        session_id = graph_input["session_id"]
         config = {"configurable": {"thread_id": session_id}}
-        print(f"DEBUG: Using config: {config}")
-
-        print("DEBUG: Calling compiled_graph.invoke() to resume...")
-        result = compiled_graph.invoke(resume_state, config)
-        print(f"DEBUG: Resume result: {result}")
-
-        return result
 
-    except Exception as e:
-        print(f"Word Game Resume Exception: {e}")
-        print(f"Traceback: {traceback.format_exc()}")
-        return {
-            "error": str(e),
-            "message": "Failed to resume word game",
-            "messages": [{"role": "assistant", "content": f"Error: {str(e)}"}]
-        }
\ No newline at end of file
+    return StreamingResponse(
+        stream_graph_events(compiled_graph, graph_input, config, session_id, complete=True),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
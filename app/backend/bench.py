@@ -0,0 +1,369 @@
+"""
+HTTP load benchmark for the game APIs.
+
+Simulates concurrent scripted players against a running server, or starts a local
+uvicorn server with the offline fake model when no --base-url is given:
+
+    python -m app.backend.bench --players 20 --games 5 --output bench.json
+
+Each player plays whole games end to end: number games via /api/number_game/play
+and /resume, word games via /api/word_game/play and /resume, and routed games start
+at /api/route and are answered through /api/word_game/resume, which resumes any
+paused graph thread. The JSON report has p50/p95/p99 latency, throughput and error rate per
+endpoint plus server RSS, so runs can be compared across commits.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Optional
+
+import httpx
+
+from app.backend.tools.number_game_tools import MAX_NUMBER, MIN_NUMBER
+from app.backend.tools.word_game_planner import ATTRIBUTES, WORD_ATTRIBUTES
+
+QUESTION_ATTRIBUTES = {question: attribute for attribute, question in ATTRIBUTES.items()}
+SCENARIOS = ("number", "word", "route")
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint."""
+
+    def __init__(self) -> None:
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def post(self, client: httpx.AsyncClient, endpoint: str, body: dict) -> Optional[dict]:
+        start = time.perf_counter()
+        try:
+            response = await client.post(endpoint, json=body)
+            data = response.json()
+            failed = response.status_code != 200 or bool(data.get("error"))
+        except (httpx.HTTPError, ValueError):
+            data, failed = None, True
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if failed:
+            self.errors[endpoint] += 1
+        return data
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": self.errors[endpoint],
+                "error_rate": self.errors[endpoint] / len(samples),
+                "rps": len(samples) / elapsed,
+                **latency_percentiles(samples),
+            }
+        samples = [s for endpoint_samples in self.latencies.values() for s in endpoint_samples]
+        errors = sum(self.errors.values())
+        total = {
+            "requests": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples) if samples else 0.0,
+            "rps": len(samples) / elapsed,
+            **latency_percentiles(samples),
+        }
+        return {"endpoints": endpoints, "total": total}
+
+
+def latency_percentiles(samples: list) -> dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {"p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99), "max_ms": pct(1.0)}
+
+
+# -- scripted players -------------------------------------------------------------
+
+
+def _guess_in(message: str) -> Optional[int]:
+    match = re.search(r"number (-?\d+)\?", message or "")
+    return int(match.group(1)) if match else None
+
+
+def number_answer(message: str, secret: int) -> Optional[str]:
+    """What a player thinking of `secret` says to a number game prompt; None if it is not a guess."""
+    guess = _guess_in(message)
+    if "higher or lower" in message:
+        match = re.search(r"than (-?\d+)\?", message)
+        guess = int(match.group(1)) if match else guess
+        return None if guess is None else "higher" if secret > guess else "lower"
+    if guess is None:
+        return None
+    if "yes/higher/lower" in message:
+        return "yes" if secret == guess else "higher" if secret > guess else "lower"
+    return "yes" if secret == guess else "no"
+
+
+def word_answer(prompt: str, word: str) -> str:
+    """What a player thinking of `word` says to a word game prompt."""
+    if "ready" in prompt.lower() and "question" not in prompt.lower():
+        return "ready"
+    if match := re.match(r"Question \d+: (.+?)\n", prompt):
+        attribute = QUESTION_ATTRIBUTES.get(match.group(1).strip())
+        if attribute is None:
+            return "maybe"
+        return "yes" if attribute in WORD_ATTRIBUTES[word] else "no"
+    return "yes" if f"word is {word}" in prompt else "no"
+
+
+async def play_number_game(client, recorder: Recorder, rng: random.Random) -> None:
+    low, high = 1, 50
+    secret = rng.randint(low, high)
+    session_id = str(uuid.uuid4())
+    data = await recorder.post(
+        client, "/api/number_game/play", {"session_id": session_id, "min_val": low, "max_val": high}
+    )
+    if not data:
+        return
+    data = await recorder.post(
+        client, "/api/number_game/resume", {"session_id": session_id, "user_input": "ready"}
+    )
+    for _ in range(4 * high.bit_length() + 4):
+        if not data or data.get("type") != "interrupt":
+            return
+        answer = number_answer(data.get("message") or "", secret)
+        if answer is None:
+            return
+        data = await recorder.post(
+            client, "/api/number_game/resume", {"session_id": session_id, "user_input": answer}
+        )
+
+
+def _interrupt_value(data: dict) -> Optional[str]:
+    interrupts = data.get("__interrupt__") if data else None
+    return str(interrupts[0]["value"]) if interrupts else None
+
+
+async def resume_graph_game(client, recorder: Recorder, data: dict, answer, max_turns: int) -> None:
+    """
+    Answer a graph game's interrupts until it ends: `answer(prompt)` gives the reply,
+    None to stop. /word_game/resume resumes whichever game the session's graph paused in.
+    """
+    session_id = data.get("session_id") if data else None
+    for _ in range(max_turns):
+        prompt = _interrupt_value(data)
+        reply = None if prompt is None else answer(prompt)
+        if reply is None:
+            return
+        data = await recorder.post(
+            client, "/api/word_game/resume", {"session_id": session_id, "user_input": reply}
+        )
+
+
+async def play_word_game(client, recorder: Recorder, rng: random.Random) -> None:
+    word = rng.choice(list(WORD_ATTRIBUTES))
+    data = await recorder.post(client, "/api/word_game/play", {})
+    if not data or not data.get("session_id"):
+        return
+    await resume_graph_game(
+        client, recorder, data, lambda prompt: word_answer(prompt, word), len(ATTRIBUTES) + 4
+    )
+
+
+async def route_game(client, recorder: Recorder, rng: random.Random) -> None:
+    """Ask the supervisor for a game, then play the routed game to the end."""
+    game = rng.choice(("number game", "word game"))
+    data = await recorder.post(client, "/api/route", {
+        "session_id": str(uuid.uuid4()),
+        "messages": [{"role": "user", "content": f"Let's play the {game}"}],
+    })
+    if game == "number game":
+        secret = rng.randint(MIN_NUMBER, MAX_NUMBER)
+        await resume_graph_game(
+            client, recorder, data, lambda prompt: number_answer(prompt, secret),
+            4 * (MAX_NUMBER - MIN_NUMBER + 1).bit_length() + 4,
+        )
+    else:
+        word = rng.choice(list(WORD_ATTRIBUTES))
+        await resume_graph_game(
+            client, recorder, data, lambda prompt: word_answer(prompt, word), len(ATTRIBUTES) + 4
+        )
+
+
+PLAYERS = {"number": play_number_game, "word": play_word_game, "route": route_game}
+
+
+async def player(client, recorder: Recorder, scenarios, games: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for game in range(games):
+        await PLAYERS[scenarios[(seed + game) % len(scenarios)]](client, recorder, rng)
+
+
+# -- server process -----------------------------------------------------------------
+
+
+def process_tree_rss(pid: int) -> int:
+    """Resident set size in bytes of a process and all its descendants (Linux /proc)."""
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children[ppid].append(int(entry))
+
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children[current])
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return total
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    env = {
+        "MODEL_PROVIDER": "fake",
+        "CHECKPOINT_BACKEND": "memory",
+        **os.environ,
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.backend.main:app",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = start_server(args.port, args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+    server_pid = server.pid if server else args.server_pid
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    limits = httpx.Limits(max_connections=args.players, max_keepalive_connections=args.players)
+    recorder = Recorder()
+    rss = {"start": None, "peak": 0, "end": None}
+
+    async def sample_rss():
+        while True:
+            rss["peak"] = max(rss["peak"], process_tree_rss(server_pid))
+            await asyncio.sleep(0.5)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await wait_until_ready(client)
+            if server_pid:
+                rss["start"] = process_tree_rss(server_pid)
+                sampler = asyncio.create_task(sample_rss())
+
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                player(client, recorder, scenarios, args.games, args.seed + i)
+                for i in range(args.players)
+            ))
+            elapsed = time.perf_counter() - start
+
+            if server_pid:
+                sampler.cancel()
+                rss["end"] = process_tree_rss(server_pid)
+                rss["peak"] = max(rss["peak"], rss["end"])
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGINT)
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "config": {
+            "base_url": base_url,
+            "players": args.players,
+            "games_per_player": args.games,
+            "scenarios": scenarios,
+            "workers": args.workers if server else None,
+            "seed": args.seed,
+        },
+        "elapsed_s": round(elapsed, 3),
+        **recorder.summary(elapsed),
+        "server_rss_mb": {
+            key: None if value is None else round(value / 2**20, 1) for key, value in rss.items()
+        } if server_pid else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the game APIs with scripted players")
+    parser.add_argument(
+        "--base-url", help="server to test; default starts a local one with the fake model"
+    )
+    parser.add_argument("--server-pid", type=int, help="pid of the server under --base-url, for RSS")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--players", type=int, default=10, help="concurrent players")
+    parser.add_argument("--games", type=int, default=3, help="games per player")
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="comma-separated: number,word,route"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for endpoint, stats in {**report["endpoints"], "total": report["total"]}.items():
+        print(
+            f"{endpoint:28} {stats['requests']:6d} req  {stats['rps']:8.1f} rps  "
+            f"p50 {stats.get('p50_ms', 0):8.1f} ms  p95 {stats.get('p95_ms', 0):8.1f} ms  "
+            f"p99 {stats.get('p99_ms', 0):8.1f} ms  errors {stats['error_rate']:.1%}"
+        )
+    if report["server_rss_mb"]:
+        print(f"server RSS MB: {report['server_rss_mb']}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from .versions import next_channel_version
+
+
+def _typed_size(typed: tuple[str, bytes]) -> int:
+    return len(typed[0]) + len(typed[1])
+
+
+class _ThreadEntry:
+    """Everything stored for one thread, plus its serialized size in bytes."""
+
+    __slots__ = ("checkpoints", "writes", "blobs", "nbytes", "puts", "completed")
+
+    def __init__(self) -> None:
+        # ns -> checkpoint_id -> (checkpoint, metadata, parent_id, channel_versions, size)
+        self.checkpoints: dict[str, OrderedDict] = {}
+        # (ns, checkpoint_id) -> (task_id, idx) -> (task_id, channel, value, task_path)
+        self.writes: dict[tuple[str, str], dict] = {}
+        # (ns, channel, version) -> serialized value
+        self.blobs: dict[tuple[str, str, str], tuple[str, bytes]] = {}
+        self.nbytes = 0
+        self.puts = 0
+        self.completed = False
+
+
+class BoundedMemorySaver(BaseCheckpointSaver[str]):
+    """
+    In-memory checkpointer with a byte budget.
+
+    Each thread's serialized size is tracked. Only the latest `keep_latest`
+    checkpoints of every namespace are kept, and once the total size exceeds
+    `max_bytes` whole threads are evicted, completed threads first and then the
+    least recently used ones.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        keep_latest: int = 4,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.max_bytes = max_bytes
+        self.keep_latest = max(1, keep_latest)
+        self.threads: OrderedDict[str, _ThreadEntry] = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.lock = threading.RLock()
+
+    # -- accounting -----------------------------------------------------------
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                "live_threads": len(self.threads),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+            }
+
+    def thread_bytes(self, thread_id: str) -> int:
+        with self.lock:
+            entry = self.threads.get(thread_id)
+            return entry.nbytes if entry else 0
+
+    def checkpoint_writes(self, thread_id: str) -> int:
+        """Number of checkpoints written for the thread, including pruned ones."""
+        with self.lock:
+            entry = self.threads.get(thread_id)
+            return entry.puts if entry else 0
+
+    def mark_completed(self, thread_id: str) -> None:
+        """Flag a finished thread so it is the first to go when the budget is exceeded."""
+        with self.lock:
+            if entry := self.threads.get(thread_id):
+                entry.completed = True
+
+    def _grow(self, entry: _ThreadEntry, nbytes: int) -> None:
+        entry.nbytes += nbytes
+        self.total_bytes += nbytes
+
+    def _enforce_budget(self, keep: str) -> None:
+        while self.total_bytes > self.max_bytes and len(self.threads) > 1:
+            victim = next(
+                (tid for tid, e in self.threads.items() if e.completed and tid != keep),
+                None,
+            )
+            if victim is None:
+                victim = next(tid for tid in self.threads if tid != keep)
+            self.evictions += 1
+            self.evicted_bytes += self.threads[victim].nbytes
+            self._drop_thread(victim)
+
+    def _drop_thread(self, thread_id: str) -> None:
+        entry = self.threads.pop(thread_id, None)
+        if entry is not None:
+            self.total_bytes -= entry.nbytes
+
+    def _prune(self, entry: _ThreadEntry, checkpoint_ns: str) -> None:
+        checkpoints = entry.checkpoints[checkpoint_ns]
+        if len(checkpoints) <= self.keep_latest:
+            return
+        while len(checkpoints) > self.keep_latest:
+            checkpoint_id, saved = checkpoints.popitem(last=False)
+            self._grow(entry, -saved[4])
+            for write in entry.writes.pop((checkpoint_ns, checkpoint_id), {}).values():
+                self._grow(entry, -_typed_size(write[2]))
+
+        referenced = {
+            (checkpoint_ns, channel, str(version))
+            for saved in checkpoints.values()
+            for channel, version in saved[3].items()
+        }
+        for key in [k for k in entry.blobs if k[0] == checkpoint_ns and k not in referenced]:
+            self._grow(entry, -_typed_size(entry.blobs.pop(key)))
+
+    # -- reads ----------------------------------------------------------------
+
+    def _to_tuple(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, entry: _ThreadEntry
+    ) -> CheckpointTuple:
+        checkpoint, metadata, parent_checkpoint_id, versions, _ = entry.checkpoints[
+            checkpoint_ns
+        ][checkpoint_id]
+        channel_values = {}
+        for channel, version in versions.items():
+            blob = entry.blobs.get((checkpoint_ns, channel, str(version)))
+            if blob is not None and blob[0] != "empty":
+                channel_values[channel] = self.serde.loads_typed(blob)
+        writes = entry.writes.get((checkpoint_ns, checkpoint_id), {}).values()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**self.serde.loads_typed(checkpoint), "channel_values": channel_values},
+            metadata=self.serde.loads_typed(metadata),
+            pending_writes=[(tid, c, self.serde.loads_typed(v)) for tid, c, v, _ in writes],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self.lock:
+            entry = self.threads.get(thread_id)
+            if entry is None or not (checkpoints := entry.checkpoints.get(checkpoint_ns)):
+                return None
+            self.threads.move_to_end(thread_id)
+            checkpoint_id = get_checkpoint_id(config) or max(checkpoints)
+            if checkpoint_id not in checkpoints:
+                return None
+            return self._to_tuple(thread_id, checkpoint_ns, checkpoint_id, entry)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self.lock:
+            thread_ids = (config["configurable"]["thread_id"],) if config else tuple(self.threads)
+            config_ns = config["configurable"].get("checkpoint_ns") if config else None
+            config_checkpoint_id = get_checkpoint_id(config) if config else None
+            before_id = get_checkpoint_id(before) if before else None
+            results = []
+            for thread_id in thread_ids:
+                entry = self.threads.get(thread_id)
+                if entry is None:
+                    continue
+                for checkpoint_ns, checkpoints in entry.checkpoints.items():
+                    if config_ns is not None and checkpoint_ns != config_ns:
+                        continue
+                    for checkpoint_id in sorted(checkpoints, reverse=True):
+                        if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                            continue
+                        if before_id and checkpoint_id >= before_id:
+                            continue
+                        if filter:
+                            metadata = self.serde.loads_typed(checkpoints[checkpoint_id][1])
+                            if not all(metadata.get(k) == v for k, v in filter.items()):
+                                continue
+                        if limit is not None and len(results) >= limit:
+                            break
+                        results.append(self._to_tuple(thread_id, checkpoint_ns, checkpoint_id, entry))
+        yield from results
+
+    # -- writes ---------------------------------------------------------------
+
+    def _entry(self, thread_id: str) -> _ThreadEntry:
+        entry = self.threads.get(thread_id)
+        if entry is None:
+            entry = self.threads[thread_id] = _ThreadEntry()
+        else:
+            self.threads.move_to_end(thread_id)
+        return entry
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values: dict[str, Any] = c.pop("channel_values")
+        blobs = {
+            (checkpoint_ns, channel, str(version)): (
+                self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            )
+            for channel, version in new_versions.items()
+        }
+        serialized = self.serde.dumps_typed(c)
+        serialized_metadata = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        size = _typed_size(serialized) + _typed_size(serialized_metadata)
+
+        with self.lock:
+            entry = self._entry(thread_id)
+            for key, blob in blobs.items():
+                if old := entry.blobs.get(key):
+                    self._grow(entry, -_typed_size(old))
+                entry.blobs[key] = blob
+                self._grow(entry, _typed_size(blob))
+            checkpoints = entry.checkpoints.setdefault(checkpoint_ns, OrderedDict())
+            if old := checkpoints.pop(checkpoint["id"], None):
+                self._grow(entry, -old[4])
+            checkpoints[checkpoint["id"]] = (
+                serialized,
+                serialized_metadata,
+                config["configurable"].get("checkpoint_id"),
+                dict(c["channel_versions"]),
+                size,
+            )
+            self._grow(entry, size)
+            entry.puts += 1
+            self._prune(entry, checkpoint_ns)
+            self._enforce_budget(keep=thread_id)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self.lock:
+            entry = self._entry(thread_id)
+            stored = entry.writes.setdefault((checkpoint_ns, checkpoint_id), {})
+            for idx, (channel, value) in enumerate(writes):
+                inner_key = (task_id, WRITES_IDX_MAP.get(channel, idx))
+                if inner_key[1] >= 0 and inner_key in stored:
+                    continue
+                if old := stored.get(inner_key):
+                    self._grow(entry, -_typed_size(old[2]))
+                serialized = self.serde.dumps_typed(value)
+                stored[inner_key] = (task_id, channel, serialized, task_path)
+                self._grow(entry, _typed_size(serialized))
+            self._enforce_budget(keep=thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock:
+            self._drop_thread(thread_id)
+
+    # -- async API ------------------------------------------------------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return self.delete_thread(thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        return next_channel_version(current)
@@ -0,0 +1,317 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from ..shared_state.base import SharedStateBackend
+from .versions import next_channel_version
+
+
+def _pack(typed: tuple[str, bytes]) -> bytes:
+    return typed[0].encode() + b"\0" + typed[1]
+
+
+def _unpack(packed: bytes) -> tuple[str, bytes]:
+    type_, _, data = packed.partition(b"\0")
+    return type_.decode(), data
+
+
+class SharedStateSaver(BaseCheckpointSaver[str]):
+    """
+    Checkpointer on a `SharedStateBackend`, so any worker can resume any thread.
+
+    Per thread it keeps one hash per namespace for checkpoints and channel blobs,
+    one hash per checkpoint for pending writes, and a namespace -> latest checkpoint
+    hash, so loading the latest checkpoint is a handful of hash reads. Every key
+    expires `ttl_seconds` after the thread was last written, or `completed_ttl`
+    seconds after `mark_completed`.
+    """
+
+    def __init__(
+        self,
+        backend: SharedStateBackend,
+        *,
+        ttl_seconds: float = 24 * 60 * 60,
+        completed_ttl: float = 60.0,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.completed_ttl = completed_ttl
+
+    # -- key layout -------------------------------------------------------------
+
+    @staticmethod
+    def _namespaces_key(thread_id: str) -> str:
+        return f"checkpoint:{thread_id}:ns"
+
+    @staticmethod
+    def _checkpoints_key(thread_id: str, checkpoint_ns: str) -> str:
+        return f"checkpoint:{thread_id}:checkpoints:{checkpoint_ns}"
+
+    @staticmethod
+    def _blobs_key(thread_id: str, checkpoint_ns: str) -> str:
+        return f"checkpoint:{thread_id}:blobs:{checkpoint_ns}"
+
+    @staticmethod
+    def _writes_key(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> str:
+        return f"checkpoint:{thread_id}:writes:{checkpoint_ns}:{checkpoint_id}"
+
+    @staticmethod
+    def _puts_key(thread_id: str) -> str:
+        return f"checkpoint:{thread_id}:puts"
+
+    def _thread_keys(self, thread_id: str) -> list[str]:
+        keys = [self._namespaces_key(thread_id), self._puts_key(thread_id)]
+        for checkpoint_ns in self.backend.hkeys(self._namespaces_key(thread_id)):
+            keys.append(self._checkpoints_key(thread_id, checkpoint_ns))
+            keys.append(self._blobs_key(thread_id, checkpoint_ns))
+            for checkpoint_id in self.backend.hkeys(self._checkpoints_key(thread_id, checkpoint_ns)):
+                keys.append(self._writes_key(thread_id, checkpoint_ns, checkpoint_id))
+        return keys
+
+    # -- accounting -----------------------------------------------------------
+
+    def checkpoint_writes(self, thread_id: str) -> int:
+        """Number of checkpoints written for the thread, across all namespaces."""
+        return int(self.backend.get(self._puts_key(thread_id)) or 0)
+
+    def mark_completed(self, thread_id: str) -> None:
+        """Let a finished thread expire after completed_ttl instead of the idle TTL."""
+        self.backend.expire(self._thread_keys(thread_id), self.completed_ttl)
+
+    # -- reads ----------------------------------------------------------------
+
+    def _to_tuple(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, packed: bytes
+    ) -> CheckpointTuple:
+        saved = self.serde.loads_typed(_unpack(packed))
+        checkpoint = saved["checkpoint"]
+        versions = checkpoint["channel_versions"]
+        fields = [f"{channel}\x1f{version}" for channel, version in versions.items()]
+        blobs = self.backend.hmget(self._blobs_key(thread_id, checkpoint_ns), fields)
+        channel_values = {}
+        for channel, blob in zip(versions, blobs):
+            if blob is not None:
+                typed = _unpack(blob)
+                if typed[0] != "empty":
+                    channel_values[channel] = self.serde.loads_typed(typed)
+
+        writes = self.backend.hgetall(self._writes_key(thread_id, checkpoint_ns, checkpoint_id))
+        pending_writes = []
+        for field in sorted(writes):
+            task_id, channel, value, _ = self.serde.loads_typed(_unpack(writes[field]))
+            pending_writes.append((task_id, channel, value))
+
+        parent_checkpoint_id = saved["parent"]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=saved["metadata"],
+            pending_writes=pending_writes,
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        if not checkpoint_id:
+            latest = self.backend.hget(self._namespaces_key(thread_id), checkpoint_ns)
+            if latest is None:
+                return None
+            checkpoint_id = latest.decode()
+        packed = self.backend.hget(self._checkpoints_key(thread_id, checkpoint_ns), checkpoint_id)
+        if packed is None:
+            return None
+        return self._to_tuple(thread_id, checkpoint_ns, checkpoint_id, packed)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Checkpoints of the thread in `config`, newest first. Keys are only reachable
+        per thread, so listing across threads (`config=None`) raises ValueError.
+        """
+        if not config:
+            raise ValueError(
+                "SharedStateSaver.list() needs a config with a thread_id; "
+                "listing checkpoints across all threads is not supported"
+            )
+        thread_id = config["configurable"]["thread_id"]
+        config_ns = config["configurable"].get("checkpoint_ns")
+        config_checkpoint_id = get_checkpoint_id(config)
+        before_id = get_checkpoint_id(before) if before else None
+
+        candidates = []
+        for checkpoint_ns in self.backend.hkeys(self._namespaces_key(thread_id)):
+            if config_ns is not None and checkpoint_ns != config_ns:
+                continue
+            for checkpoint_id, packed in self.backend.hgetall(
+                self._checkpoints_key(thread_id, checkpoint_ns)
+            ).items():
+                if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                    continue
+                if before_id and checkpoint_id >= before_id:
+                    continue
+                candidates.append((checkpoint_id, checkpoint_ns, packed))
+
+        results = 0
+        for checkpoint_id, checkpoint_ns, packed in sorted(candidates, reverse=True):
+            if limit is not None and results >= limit:
+                break
+            item = self._to_tuple(thread_id, checkpoint_ns, checkpoint_id, packed)
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            results += 1
+            yield item
+
+    # -- writes ---------------------------------------------------------------
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values: dict[str, Any] = c.pop("channel_values")
+        blobs = {
+            f"{channel}\x1f{version}": _pack(
+                self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            )
+            for channel, version in new_versions.items()
+        }
+        saved = _pack(self.serde.dumps_typed({
+            "checkpoint": c,
+            "metadata": get_checkpoint_metadata(config, metadata),
+            "parent": config["configurable"].get("checkpoint_id"),
+        }))
+
+        if blobs:
+            self.backend.hset(self._blobs_key(thread_id, checkpoint_ns), blobs, self.ttl_seconds)
+        self.backend.hset(
+            self._checkpoints_key(thread_id, checkpoint_ns), {checkpoint["id"]: saved}, self.ttl_seconds
+        )
+        # Written last: readers only see the new checkpoint once everything it needs is stored
+        self.backend.hset(
+            self._namespaces_key(thread_id), {checkpoint_ns: checkpoint["id"].encode()}, self.ttl_seconds
+        )
+        self.backend.incr(self._puts_key(thread_id), 1, self.ttl_seconds)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        replace, insert = {}, {}
+        for idx, (channel, value) in enumerate(writes):
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            # Fields sort as (task_id, idx); the offset keeps negative indices in order too
+            field = f"{task_id}\x1f{write_idx + 2**31:010d}"
+            packed = _pack(self.serde.dumps_typed([task_id, channel, value, task_path]))
+            # Special channels (errors, interrupts, resumes) overwrite; regular writes are idempotent.
+            (replace if write_idx < 0 else insert)[field] = packed
+        key = self._writes_key(thread_id, checkpoint_ns, checkpoint_id)
+        if replace:
+            self.backend.hset(key, replace, self.ttl_seconds)
+        if insert:
+            self.backend.hset(key, insert, self.ttl_seconds, only_new=True)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.backend.delete(*self._thread_keys(thread_id))
+
+    # -- async API ------------------------------------------------------------
+    # Backend calls are blocking network or disk round trips, so they run in a
+    # worker thread instead of stalling the event loop.
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        return next_channel_version(current)
@@ -0,0 +1,481 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from app.backend.utils.log import get_logger
+
+from .versions import next_channel_version
+
+log = get_logger(__name__)
+
+# Every primary key leads with thread_id, so each lookup by thread is an index seek.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    puts INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS threads_updated_at_idx ON threads (updated_at);
+"""
+
+# Columns added to `threads` after its first release, for databases created before them
+THREAD_COLUMNS = {
+    "puts": "INTEGER NOT NULL DEFAULT 0",
+    "completed": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    File-backed checkpointer using SQLite in WAL mode.
+
+    Writes are grouped: they go into one open transaction that is committed every
+    `batch_size` operations or every `flush_interval` seconds by a background thread,
+    whichever comes first. The same thread also deletes threads that have not been
+    touched for `ttl_seconds`, and threads marked completed.
+    """
+
+    def __init__(
+        self,
+        path: str = "checkpoints.sqlite",
+        *,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        ttl_seconds: Optional[float] = 24 * 60 * 60,
+        cleanup_interval: float = 300.0,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval = cleanup_interval
+
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(threads)")}
+        for column, definition in THREAD_COLUMNS.items():
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE threads ADD COLUMN {column} {definition}")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS threads_completed_idx ON threads (completed) WHERE completed = 1"
+        )
+
+        self._pending = 0
+        self._last_cleanup = time.monotonic()
+        self._closed = threading.Event()
+        self._worker = threading.Thread(
+            target=self._background_loop, name="sqlite-checkpoint-flusher", daemon=True
+        )
+        self._worker.start()
+
+    # -- transaction handling -------------------------------------------------
+
+    def _begin_write(self) -> None:
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+
+    def _end_write(self) -> None:
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self._commit()
+
+    def _commit(self) -> None:
+        if self.conn.in_transaction:
+            self.conn.execute("COMMIT")
+        self._pending = 0
+
+    def flush(self) -> None:
+        """Commit any grouped writes now."""
+        with self.lock:
+            self._commit()
+
+    def _background_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+                if (
+                    self.ttl_seconds is not None
+                    and time.monotonic() - self._last_cleanup >= self.cleanup_interval
+                ):
+                    self._last_cleanup = time.monotonic()
+                    self.cleanup_expired()
+            except sqlite3.Error as e:
+                log.exception("checkpoint_background_task_failed", error=str(e))
+
+    def cleanup_expired(self, now: Optional[float] = None) -> int:
+        """
+        Delete threads idle for longer than ttl_seconds, and completed ones.
+        Returns how many were removed.
+        """
+        if self.ttl_seconds is None:
+            return 0
+        cutoff = (now or time.time()) - self.ttl_seconds
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT thread_id FROM threads WHERE updated_at < ? OR completed = 1", (cutoff,)
+            ).fetchall()
+            for (thread_id,) in rows:
+                self._delete_thread(thread_id)
+            self._commit()
+        return len(rows)
+
+    def checkpoint_writes(self, thread_id: str) -> int:
+        """Number of checkpoints written for the thread, across all namespaces."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT puts FROM threads WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+            return row[0] if row else 0
+
+    def mark_completed(self, thread_id: str) -> None:
+        """
+        Flag a finished thread so the next cleanup pass removes it. Later writes
+        to the thread refresh updated_at but leave the flag set.
+        """
+        with self.lock:
+            self._begin_write()
+            self.conn.execute("UPDATE threads SET completed = 1 WHERE thread_id = ?", (thread_id,))
+            self._end_write()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._worker.join(timeout=1.0)
+        with self.lock:
+            self._commit()
+            self.conn.close()
+
+    # -- reads ----------------------------------------------------------------
+
+    def _load_blobs(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        channel_values: dict[str, Any] = {}
+        for channel, version in versions.items():
+            row = self.conn.execute(
+                "SELECT type, blob FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if row and row[0] != "empty":
+                channel_values[channel] = self.serde.loads_typed((row[0], row[1]))
+        return channel_values
+
+    def _load_writes(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> list[tuple[str, str, Any]]:
+        rows = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return [
+            (task_id, channel, self.serde.loads_typed((type_, value)))
+            for task_id, channel, type_, value in rows
+        ]
+
+    def _row_to_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        checkpoint_: Checkpoint = self.serde.loads_typed((type_, checkpoint))
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint_,
+                "channel_values": self._load_blobs(
+                    thread_id, checkpoint_ns, checkpoint_["channel_versions"]
+                ),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            pending_writes=self._load_writes(thread_id, checkpoint_ns, checkpoint_id),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        with self.lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._row_to_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                metadata = self.serde.loads_typed((row[4], row[5]))
+                if filter and not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+                results.append(self._row_to_tuple(thread_id, checkpoint_ns, tuple(row)))
+        yield from results
+
+    # -- writes ---------------------------------------------------------------
+
+    def _touch_thread(self, thread_id: str, puts: int = 0) -> None:
+        self.conn.execute(
+            "INSERT INTO threads (thread_id, updated_at, puts) VALUES (?, ?, ?) "
+            "ON CONFLICT(thread_id) DO UPDATE SET "
+            "updated_at = excluded.updated_at, puts = puts + excluded.puts",
+            (thread_id, time.time(), puts),
+        )
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values: dict[str, Any] = c.pop("channel_values")
+        blob_rows = []
+        for channel, version in new_versions.items():
+            type_, blob = (
+                self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            )
+            blob_rows.append((thread_id, checkpoint_ns, channel, str(version), type_, blob))
+        type_, serialized = self.serde.dumps_typed(c)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        with self.lock:
+            self._begin_write()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blob_rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    serialized,
+                    metadata_type,
+                    serialized_metadata,
+                ),
+            )
+            self._touch_thread(thread_id, puts=1)
+            self._end_write()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        replace_rows, insert_rows = [], []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            row = (
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                task_id,
+                write_idx,
+                channel,
+                type_,
+                blob,
+                task_path,
+            )
+            # Special channels (errors, interrupts, resumes) overwrite; regular writes are idempotent.
+            (replace_rows if write_idx < 0 else insert_rows).append(row)
+        with self.lock:
+            self._begin_write()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", replace_rows
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", insert_rows
+            )
+            self._touch_thread(thread_id)
+            self._end_write()
+
+    def _delete_thread(self, thread_id: str) -> None:
+        self._begin_write()
+        for table in ("checkpoints", "blobs", "writes", "threads"):
+            self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock:
+            self._delete_thread(thread_id)
+            self._end_write()
+
+    # -- async API ------------------------------------------------------------
+    # Every call takes self.lock, which the flusher holds through COMMIT, so a slow
+    # fsync would stall the event loop; the async variants run in a worker thread.
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        return next_channel_version(current)
@@ -0,0 +1,16 @@
+import random
+from typing import Optional, Union
+
+
+def next_channel_version(current: Optional[Union[str, int]]) -> str:
+    """
+    Channel version after `current`: a zero-padded counter plus a random suffix, so
+    versions sort as strings and two writers bumping the same version never collide.
+    """
+    if current is None:
+        current_v = 0
+    elif isinstance(current, int):
+        current_v = current
+    else:
+        current_v = int(current.split(".")[0])
+    return f"{current_v + 1:032}.{random.random():016}"
@@ -1,53 +1,140 @@
+import atexit
+import os
+import re
+from collections import Counter
+
 from langgraph.graph import StateGraph
-from langgraph.checkpoint.memory import MemorySaver
 
+from app.backend.checkpointers.bounded_memory_saver import BoundedMemorySaver
+from app.backend.checkpointers.shared_saver import SharedStateSaver
+from app.backend.checkpointers.sqlite_saver import SqliteCheckpointSaver
 from app.backend.agents.end_game_agent import end_game_agent
 from app.backend.agents.game_orchestrator_agent import game_orchestrator
 from app.backend.nodes.number_game import number_game_node
 from app.backend.nodes.word_game import word_game_node
 from app.backend.schemas.game_state import GameState
+from app.backend.shared_state.base import get_shared_backend
+from app.backend.utils.log import get_logger
+from app.backend.utils.metrics import GraphMetricsHandler, MeteredSerializer, track_sessions
+
+log = get_logger(__name__)
 
 builder = StateGraph(GameState)
 
-memory = MemorySaver()
+
+def build_checkpointer():
+    backend = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+    if backend == "memory":
+        return BoundedMemorySaver(
+            max_bytes=int(os.getenv("CHECKPOINT_MAX_BYTES", str(256 * 1024 * 1024))),
+            keep_latest=int(os.getenv("CHECKPOINT_KEEP_LATEST", "4")),
+        )
+    if backend == "shared":
+        shared_backend = get_shared_backend()
+        if shared_backend is None:
+            raise ValueError("CHECKPOINT_BACKEND=shared needs SHARED_STATE_BACKEND to be set")
+        return SharedStateSaver(
+            shared_backend, ttl_seconds=float(os.getenv("CHECKPOINT_TTL_SECONDS", "86400"))
+        )
+
+    saver = SqliteCheckpointSaver(
+        os.getenv("CHECKPOINT_DB_PATH", "checkpoints.sqlite"),
+        batch_size=int(os.getenv("CHECKPOINT_BATCH_SIZE", "64")),
+        flush_interval=float(os.getenv("CHECKPOINT_FLUSH_INTERVAL", "0.05")),
+        ttl_seconds=float(os.getenv("CHECKPOINT_TTL_SECONDS", "86400")),
+    )
+    atexit.register(saver.close)
+    return saver
+
+
+checkpointer = build_checkpointer()
+checkpointer.serde = MeteredSerializer(checkpointer.serde)
+if hasattr(checkpointer, "stats"):
+    track_sessions("graph_threads", lambda: checkpointer.stats().get("live_threads"))
+
+GAME_ROUTES = ("number_game", "word_game", "end_game")
+
+# Phrases are checked before single keywords so "word guessing" is not read as a number game
+INTENT_PHRASES = {
+    "word_game": ("word game", "word guessing"),
+    "number_game": ("number game", "number guessing"),
+    "end_game": ("end game", "end the game", "i'm done", "i am done"),
+}
+INTENT_KEYWORDS = {
+    "word_game": ("word",),
+    "number_game": ("number", "guess"),
+    "end_game": ("end", "quit", "stop", "exit"),
+}
+
+# How many runs each routing path handled: explicit route_to, keyword rule or supervisor LLM
+routing_stats = Counter()
+
+
+def _latest_user_text(state) -> str:
+    for msg in reversed(state.get("messages") or []):
+        if isinstance(msg, dict):
+            if msg.get("role") in ("user", "human"):
+                return str(msg.get("content", "")).lower()
+        elif getattr(msg, "type", None) == "human":
+            return str(msg.content).lower()
+    return str(state.get("user_input") or "").lower()
+
+
+def detect_intent(text: str):
+    """Return the single game the text asks for, or None if it is unclear."""
+    matches = {route for route, phrases in INTENT_PHRASES.items() if any(p in text for p in phrases)}
+    if not matches:
+        words = set(re.findall(r"[a-z']+", text))
+        matches = {route for route, keywords in INTENT_KEYWORDS.items() if words.intersection(keywords)}
+    return matches.pop() if len(matches) == 1 else None
+
+
+def pre_route(state):
+    """Pick the game without an LLM call when the request already makes it obvious."""
+    route = state.get("route_to")
+    if route in GAME_ROUTES:
+        routing_stats["explicit"] += 1
+        return route
+
+    route = detect_intent(_latest_user_text(state))
+    if route:
+        routing_stats["keyword"] += 1
+        return route
+
+    routing_stats["supervisor"] += 1
+    return "game_orchestrator"
 
 
 def route_from_orchestrator(state):
-    print(f"DEBUG: route_from_orchestrator state keys: {list(state.keys())}")
+    log.debug("route_from_orchestrator.called", keys=state.keys())
 
     if "route_to" in state:
         route = state["route_to"]
-        print(f"DEBUG: Using route_to field: {route}")
 
         if route in ["number_game", "word_game", "end_game"]:
-            print(f"DEBUG: Valid route_to found, routing to: {route}")
+            log.debug("route_from_orchestrator.route_to", route=route)
             return route
         else:
-            print(f"Warning: Invalid route_to '{route}', will analyze messages instead")
+            log.warning("route_from_orchestrator.invalid_route_to", route=route)
 
-    print("DEBUG: No valid route_to found, analyzing messages...")
     messages = state.get("messages", [])
     route = "number_game"
 
     for msg in messages:
         if isinstance(msg, dict):
             content = msg.get("content", "").lower()
-            print(f"DEBUG: Analyzing message content: '{content}'")
 
             if any(keyword in content for keyword in ["word game", "word guessing", "word"]):
                 route = "word_game"
-                print(f"DEBUG: Detected word game from message content")
                 break
             elif any(keyword in content for keyword in ["number game", "number guessing", "number", "guess"]):
                 route = "number_game"
-                print(f"DEBUG: Detected number game from message content")
                 break
             elif any(keyword in content for keyword in ["end", "quit", "stop", "exit"]):
                 route = "end_game"
-                print(f"DEBUG: Detected end game from message content")
                 break
 
-    print(f"DEBUG: Final routing decision: {route}")
+    log.debug("route_from_orchestrator.from_messages", route=route)
     return route
 
 
@@ -57,8 +144,16 @@ builder.add_node("number_game", number_game_node)
 builder.add_node("word_game", word_game_node)
 builder.add_node("end_game", end_game_agent)
 
-# Set entry point
-builder.set_entry_point("game_orchestrator")
+# Set entry point: rule-based routing first, the supervisor only for ambiguous requests
+builder.set_conditional_entry_point(
+    pre_route,
+    {
+        "game_orchestrator": "game_orchestrator",
+        "number_game": "number_game",
+        "word_game": "word_game",
+        "end_game": "end_game"
+    }
+)
 
 builder.add_conditional_edges(
     "game_orchestrator",
@@ -73,9 +168,9 @@ builder.add_conditional_edges(
 # End game always ends the session
 builder.add_edge("end_game", "__end__")
 
-# Compile the graph
-compiled_graph = builder.compile(checkpointer=memory)
+# Compile the graph; the callback times nodes and LLM calls for /metrics
+compiled_graph = builder.compile(checkpointer=checkpointer).with_config(
+    callbacks=[GraphMetricsHandler()]
+)
 
-print("Graph compiled successfully with FRESH memory!")
-print(f"Graph type: {type(compiled_graph)}")
-print(f"Graph has invoke method: {hasattr(compiled_graph, 'invoke')}")
\ No newline at end of file
+log.info("graph_compiled", checkpointer=type(checkpointer).__name__)
@@ -0,0 +1,303 @@
+"""
+In-process throughput benchmark for the compiled graph, without HTTP.
+
+Plays complete games straight against `compiled_graph` with the offline fake model
+and scripted answers, optionally across a process pool:
+
+    python -m app.backend.graph_bench --games 2000 --processes 4 --output graph_bench.json
+
+Reports games and turns per second, wall time per top-level node (taken from the
+graph's debug events), serialized checkpoint bytes written per turn and, with
+--tracemalloc, the peak memory allocated per turn. Failed tasks, tool calls that
+errored and games not ending with their scenario's expected message count as errors.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from langchain_core.messages import ToolMessage
+
+from app.backend.bench import git_commit, latency_percentiles, number_answer, word_answer
+
+SCENARIOS = ("number", "word", "routed", "end")
+START_MESSAGES = {
+    "number": ({"role": "user", "content": "Let's play the number game"}, "number_game"),
+    "word": ({"role": "user", "content": "Let's play the word game"}, "word_game"),
+    # No keyword and no route_to, so the supervisor decides
+    "routed": ({"role": "user", "content": "Let's play something"}, None),
+    "end": ({"role": "user", "content": "I'm done, end the game"}, "end_game"),
+}
+# What the last message of a game that went as scripted says, per scenario. The tools
+# turn their own exceptions into ordinary replies, so a task error alone misses them.
+NUMBER_ENDING = r"I guessed your number"
+WORD_ENDING = r"Thanks for playing!$"
+EXPECTED_ENDINGS = {
+    "number": NUMBER_ENDING,
+    "word": WORD_ENDING,
+    "routed": f"{NUMBER_ENDING}|{WORD_ENDING}",
+    "end": r"You played the Number Guessing Game \d+ time",
+}
+
+
+class GraphStats:
+    """Per-turn samples from one worker; merged across workers for the report."""
+
+    def __init__(self) -> None:
+        self.elapsed = 0.0
+        self.games = 0
+        self.turns = 0
+        self.errors = 0
+        # "task", "tool", "max_turns" or "ending:<scenario>" -> count
+        self.error_kinds = Counter()
+        self.turn_seconds = []
+        self.node_seconds = defaultdict(list)
+        self.checkpoint_bytes = 0
+        self.alloc_peak_bytes = []
+
+    def merge(self, other: "GraphStats") -> None:
+        # Workers run side by side, so the slowest one sets the wall time
+        self.elapsed = max(self.elapsed, other.elapsed)
+        self.games += other.games
+        self.turns += other.turns
+        self.errors += other.errors
+        self.error_kinds += other.error_kinds
+        self.turn_seconds += other.turn_seconds
+        for node, samples in other.node_seconds.items():
+            self.node_seconds[node] += samples
+        self.checkpoint_bytes += other.checkpoint_bytes
+        self.alloc_peak_bytes += other.alloc_peak_bytes
+
+    def error(self, kind: str) -> None:
+        self.errors += 1
+        self.error_kinds[kind] += 1
+
+
+def _timestamp(event: dict) -> float:
+    return datetime.fromisoformat(event["timestamp"]).timestamp()
+
+
+async def run_turn(graph, graph_input, config, stats: GraphStats):
+    """Run one superstep sequence up to the next pause and return the interrupt value, if any."""
+    started, interrupt_value = {}, None
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+    turn_start = time.perf_counter()
+
+    # Subgraph updates carry the agents' ToolMessages; timings and interrupts are top level
+    async for namespace, mode, chunk in graph.astream(
+        graph_input, config, stream_mode=["debug", "updates"], subgraphs=True
+    ):
+        if mode == "debug" and not namespace and chunk["type"] == "task":
+            started[chunk["payload"]["id"]] = _timestamp(chunk)
+        elif mode == "debug" and not namespace and chunk["type"] == "task_result":
+            begun = started.pop(chunk["payload"]["id"], None)
+            if begun is not None:
+                stats.node_seconds[chunk["payload"]["name"]].append(_timestamp(chunk) - begun)
+            if chunk["payload"].get("error"):
+                stats.error("task")
+        elif mode == "updates" and "__interrupt__" in chunk:
+            if not namespace:
+                interrupt_value = str(chunk["__interrupt__"][0].value)
+        elif mode == "updates" and isinstance(chunk.get("tools"), dict):
+            # The react agents' tool node; parent nodes repeat its messages in their own updates
+            for message in chunk["tools"].get("messages", ()):
+                if isinstance(message, ToolMessage) and message.status == "error":
+                    stats.error("tool")
+
+    stats.turn_seconds.append(time.perf_counter() - turn_start)
+    if tracemalloc.is_tracing():
+        stats.alloc_peak_bytes.append(tracemalloc.get_traced_memory()[1] - traced_before)
+    stats.turns += 1
+    return interrupt_value
+
+
+async def play_game(graph, stats: GraphStats, scenario: str, game_id: str, rng, max_turns: int):
+    from langgraph.types import Command
+    from app.backend.tools.number_game_tools import MAX_NUMBER, MIN_NUMBER
+    from app.backend.tools.word_game_planner import WORD_ATTRIBUTES
+
+    secret = rng.randint(MIN_NUMBER, MAX_NUMBER)
+    word = rng.choice(list(WORD_ATTRIBUTES))
+    message, route = START_MESSAGES[scenario]
+    state = {"messages": [message], "session_id": game_id}
+    if route:
+        state["route_to"] = route
+    config = {"configurable": {"thread_id": game_id}}
+
+    prompt = await run_turn(graph, state, config, stats)
+    for _ in range(max_turns):
+        if prompt is None:
+            break
+        answer = number_answer(prompt, secret)
+        if answer is None:
+            answer = word_answer(prompt, word)
+        prompt = await run_turn(graph, Command(resume=answer), config, stats)
+    else:
+        stats.error("max_turns")
+
+    if prompt is None:
+        last = ((await graph.aget_state(config)).values.get("messages") or [{}])[-1]
+        content = last.get("content") if isinstance(last, dict) else last.content
+        if not re.search(EXPECTED_ENDINGS[scenario], str(content or "")):
+            stats.error(f"ending:{scenario}")
+    stats.games += 1
+
+
+async def run_games(games: int, scenarios, seed: int, concurrency: int, max_turns: int) -> GraphStats:
+    from app.backend.graph.graph import compiled_graph
+    from app.backend.utils.metrics import checkpoint_bytes
+
+    bytes_before = checkpoint_bytes.value()
+    stats = GraphStats()
+    rng = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await play_game(
+                compiled_graph, stats, scenarios[i % len(scenarios)],
+                f"graph-bench-{seed}-{i}", rng, max_turns,
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(games)))
+    stats.elapsed = time.perf_counter() - start
+    stats.checkpoint_bytes = checkpoint_bytes.value() - bytes_before
+    return stats
+
+
+def run_worker(games: int, scenarios, seed: int, concurrency: int, max_turns: int,
+               trace_allocations: bool, verbose: bool) -> GraphStats:
+    """Entry point of each pool process: the graph is imported and warmed up here."""
+    os.environ.setdefault("MODEL_PROVIDER", "fake")
+    os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+    # Keep anything the graph writes to stdout out of the report
+    with open(os.devnull, "w") as devnull, contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        asyncio.run(run_games(len(scenarios), scenarios, seed - 1, 1, max_turns))
+        if trace_allocations:
+            tracemalloc.start()
+        try:
+            return asyncio.run(run_games(games, scenarios, seed, concurrency, max_turns))
+        finally:
+            tracemalloc.stop()
+
+
+def _mean(samples: list) -> Optional[float]:
+    return sum(samples) / len(samples) if samples else None
+
+
+def build_report(args, stats: GraphStats) -> dict:
+    """Throughput is over the timed runs only; process start-up, imports and warm-up are excluded."""
+    elapsed = stats.elapsed
+    nodes = {}
+    for node, samples in sorted(stats.node_seconds.items()):
+        nodes[node] = {
+            "calls": len(samples),
+            "total_s": round(sum(samples), 3),
+            "share": round(sum(samples) / sum(stats.turn_seconds), 3) if stats.turn_seconds else None,
+            **latency_percentiles(samples),
+        }
+    mean_alloc = _mean(stats.alloc_peak_bytes)
+    return {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "config": {
+            "games": args.games,
+            "processes": args.processes,
+            "concurrency": args.concurrency,
+            "scenarios": args.scenarios.split(","),
+            "seed": args.seed,
+            "checkpoint_backend": os.environ.get("CHECKPOINT_BACKEND", "memory"),
+        },
+        "elapsed_s": round(elapsed, 3),
+        "games": stats.games,
+        "turns": stats.turns,
+        "errors": stats.errors,
+        "error_kinds": dict(stats.error_kinds),
+        "games_per_s": round(stats.games / elapsed, 2),
+        "turns_per_s": round(stats.turns / elapsed, 2),
+        "turn": latency_percentiles(stats.turn_seconds),
+        "nodes": nodes,
+        "checkpoint_bytes": {
+            "total": stats.checkpoint_bytes,
+            "per_turn": round(stats.checkpoint_bytes / stats.turns) if stats.turns else None,
+            "per_game": round(stats.checkpoint_bytes / stats.games) if stats.games else None,
+        },
+        "alloc_peak_kb_per_turn": None if mean_alloc is None else round(mean_alloc / 1024, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the compiled graph in-process")
+    parser.add_argument("--games", type=int, default=1000, help="games in total")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes")
+    parser.add_argument("--concurrency", type=int, default=1, help="games in flight per process")
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="comma-separated: number,word,routed,end"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=100, help="turns before a game counts as stuck")
+    parser.add_argument(
+        "--tracemalloc", action="store_true",
+        help="measure peak allocation per turn (slower; overlapping turns add up above --concurrency 1)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="keep the graph's own output")
+    parser.add_argument("--output", default="graph_bench.json")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    processes = max(1, args.processes)
+    shares = [args.games // processes + (i < args.games % processes) for i in range(processes)]
+    worker_args = [
+        (share, scenarios, args.seed + 1000 * i, args.concurrency, args.max_turns,
+         args.tracemalloc, args.verbose)
+        for i, share in enumerate(shares)
+    ]
+
+    stats = GraphStats()
+    if processes == 1:
+        stats = run_worker(*worker_args[0])
+    else:
+        # Spawned workers import the graph themselves; forking would copy its threads and locks
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(processes, mp_context=context) as pool:
+            for worker_stats in pool.map(run_worker, *zip(*worker_args)):
+                stats.merge(worker_stats)
+
+    report = build_report(args, stats)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"{report['games']} games, {report['turns']} turns in {report['elapsed_s']} s: "
+        f"{report['games_per_s']} games/s, {report['turns_per_s']} turns/s, {report['errors']} errors"
+    )
+    if report["error_kinds"]:
+        print(f"  errors by kind: {report['error_kinds']}")
+    for node, node_stats in report["nodes"].items():
+        print(
+            f"  {node:20} {node_stats['calls']:7d} calls  p50 {node_stats['p50_ms']:8.2f} ms  "
+            f"p95 {node_stats['p95_ms']:8.2f} ms  share {node_stats['share']:.0%}"
+        )
+    print(f"  checkpoint bytes per turn: {report['checkpoint_bytes']['per_turn']}")
+    if report["alloc_peak_kb_per_turn"] is not None:
+        print(f"  peak allocation per turn: {report['alloc_peak_kb_per_turn']} KiB")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,19 @@ Main entry point for the application.
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from app.backend.apis import game_orchestrator
 
 from app.backend.apis import number_game, word_game
+from app.backend.utils.metrics import MetricsMiddleware, registry
+from app.backend.utils.request_limits import BodySizeLimitMiddleware
+from app.backend.utils.responses import GZIP_MIN_BYTES
 
 app = FastAPI(
     title="LangGraph Game Hub",
-    description="A multi-game system built with LangGraph and FastAPI"
+    description="A multi-game system built with LangGraph and FastAPI",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -20,6 +26,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(BodySizeLimitMiddleware)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_BYTES, compresslevel=5)
+app.add_middleware(MetricsMiddleware)
 
 # Include routers
 app.include_router(game_orchestrator.router, prefix="/api", tags=["Game Orchestrator"])
@@ -28,4 +37,9 @@ app.include_router(word_game.router, prefix="/api", tags=["Word Game"])
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the LangGraph Game Hub"}
\ No newline at end of file
+    return {"message": "Welcome to the LangGraph Game Hub"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -1,46 +1,36 @@
-from langchain_core.messages import BaseMessage
+from langgraph.errors import GraphInterrupt
 
 from app.backend.agents.number_game_agent import number_game_agent
+from app.backend.schemas.game_state import new_agent_messages
+from app.backend.utils.log import get_logger
 
+log = get_logger(__name__)
 
-def number_game_node(state):
+
+async def number_game_node(state):
     try:
-        print(f"DEBUG: number_game_node called with state: {state}")
+        log.debug("number_game_node.called", state=state)
 
         # Invoke the react agent which will use the tool
-        result = number_game_agent.invoke(state)
-        print(f"DEBUG: Agent result: {result}")
+        result = await number_game_agent.ainvoke(state)
+        log.debug("number_game_node.agent_result", result=result)
 
         # Handle interrupt results from the tool
         if isinstance(result, dict) and result.get("type") == "interrupt":
-            print(f"DEBUG: Tool returned interrupt: {result}")
+            log.debug("number_game_node.interrupt", result=result)
             return result
 
-        # Convert LangChain messages to dicts
-        if "messages" in result:
-            converted_messages = []
-            for msg in result["messages"]:
-                if isinstance(msg, BaseMessage):
-                    converted_messages.append({
-                        "role": "assistant" if msg.__class__.__name__ == "AIMessage" else "user",
-                        "content": msg.content
-                    })
-                else:
-                    converted_messages.append(msg)
-            result["messages"] = converted_messages
-
-        # Return updated state
-        updated_count = state.get('number_game_count', 0) + 1
+        # Return only what changed: the agent's new messages and one more game played
         return {
-            **state,
-            **result,
-            'number_game_count': updated_count
+            "messages": new_agent_messages(state, result),
+            "number_game_count": 1,
         }
 
+    except GraphInterrupt:
+        raise
     except Exception as e:
-        print(f"DEBUG: Exception in number_game_node: {e}")
+        log.exception("number_game_node.failed", error=str(e))
         return {
-            **state,
             "error": str(e),
             "messages": [{"role": "assistant", "content": f"Error: {str(e)}"}]
         }
\ No newline at end of file
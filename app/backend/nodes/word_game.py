@@ -1,61 +1,35 @@
-from langchain_core.messages import BaseMessage
+from langgraph.errors import GraphInterrupt
 from app.backend.agents.word_game_agent import word_game_agent
+from app.backend.schemas.game_state import new_agent_messages
+from app.backend.utils.log import get_logger
 
+log = get_logger(__name__)
 
-def word_game_node(state):
+
+async def word_game_node(state):
     try:
-        print(f"DEBUG: word_game_node called with state: {state}")
+        log.debug("word_game_node.called", state=state)
 
         # Invoke the react agent which will use the tool
-        print(f"DEBUG: About to invoke word_game_agent")
-        result = word_game_agent.invoke(state)
-        print(f"DEBUG: Agent result: {result}")
-        print(f"DEBUG: Agent result type: {type(result)}")
-
-        # Check if result contains messages to see what the agent did
-        if "messages" in result:
-            print(f"DEBUG: Agent generated {len(result['messages'])} messages")
-            for i, msg in enumerate(result['messages']):
-                if isinstance(msg, BaseMessage):
-                    print(f"DEBUG: Message {i}: {msg.__class__.__name__} - {msg.content[:100]}...")
-                else:
-                    print(f"DEBUG: Message {i}: {msg}")
+        result = await word_game_agent.ainvoke(state)
+        log.debug("word_game_node.agent_result", messages=len(result.get("messages", [])), result=result)
 
         # Handle interrupt results from the tool
         if isinstance(result, dict) and result.get("type") == "interrupt":
-            print(f"DEBUG: Tool returned interrupt: {result}")
+            log.debug("word_game_node.interrupt", result=result)
             return result
 
-        # Convert LangChain messages to dicts
-        if "messages" in result:
-            converted_messages = []
-            for msg in result["messages"]:
-                if isinstance(msg, BaseMessage):
-                    converted_messages.append({
-                        "role": "assistant" if msg.__class__.__name__ == "AIMessage" else "user",
-                        "content": msg.content
-                    })
-                else:
-                    converted_messages.append(msg)
-            result["messages"] = converted_messages
-
-        # Return updated state
-        updated_count = state.get('word_game_count', 0) + 1
-        final_result = {
-            **state,
-            **result,
-            'word_game_count': updated_count
+        # Return only what changed: the agent's new messages and one more game played
+        return {
+            "messages": new_agent_messages(state, result),
+            "word_game_count": 1,
         }
 
-        print(f"DEBUG: Returning final result with {len(final_result)} keys")
-        return final_result
-
+    except GraphInterrupt:
+        raise
     except Exception as e:
-        print(f"DEBUG: Exception in word_game_node: {e}")
-        import traceback
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
+        log.exception("word_game_node.failed", error=str(e))
         return {
-            **state,
             "error": str(e),
             "messages": [{"role": "assistant", "content": f"Error: {str(e)}"}]
         }
\ No newline at end of file
@@ -1,13 +1,120 @@
-from typing import TypedDict, Literal, List, Dict, Any, Optional
+import operator
+import uuid
+from typing import Annotated, TypedDict, Literal, List, Dict, Any, Optional
+
+from langchain_core.messages import BaseMessage
+
+
+def _message_id(message):
+    return message.id if isinstance(message, BaseMessage) else message.get("id")
+
+
+class MessageHistory(list):
+    """
+    The `messages` list plus an id -> position index shared by every later version of it.
+
+    Versions are copies (checkpoints keep referencing the old list), but the index is
+    only ever added to, so a reduce step never rebuilds it. A position is trusted only
+    when the message stored there still has that id, which keeps branches forked from
+    an older checkpoint correct.
+    """
+
+    __slots__ = ("positions",)
+
+    @classmethod
+    def of(cls, messages: list) -> "MessageHistory":
+        if isinstance(messages, cls):
+            return messages
+        # Plain lists come from a fresh channel or a checkpoint load; index them once
+        history = cls(messages)
+        history.positions = {_message_id(message): i for i, message in enumerate(history)}
+        return history
+
+    def _has_id(self, message_id) -> bool:
+        position = self.positions.get(message_id)
+        if position is not None and position < len(self) and _message_id(self[position]) == message_id:
+            return True
+        # Appended under the same id on another branch; rare enough to scan
+        return position is not None and any(_message_id(message) == message_id for message in self)
+
+    def appended(self, messages: list) -> "MessageHistory":
+        """A new version with `messages` added; ids are checked only for the incoming ones."""
+        merged = MessageHistory(self)
+        merged.positions = self.positions
+        for message in messages:
+            message_id = _message_id(message)
+            if message_id is None:
+                message_id = str(uuid.uuid4())
+                # Stamp a copy: the caller may still hold the message
+                if isinstance(message, BaseMessage):
+                    message = message.model_copy(update={"id": message_id})
+                else:
+                    message = {**message, "id": message_id}
+            elif merged._has_id(message_id):
+                continue
+            merged.positions[message_id] = len(merged)
+            merged.append(message)
+        return merged
+
+
+def append_messages(left: Optional[list], right) -> list:
+    """
+    Append-only reducer for `messages`: nodes return just the messages they produced.
+
+    Every message gets a stable id when it is first appended. Messages whose id is
+    already in the history are skipped, so handing back messages a node was given
+    (as subgraphs do) does not duplicate them.
+    """
+    if not isinstance(right, list):
+        right = [right]
+    if not right:
+        return left or []
+    return MessageHistory.of(left or []).appended(right)
+
+
+def extend_list(left: Optional[list], right) -> list:
+    """Append reducer for list fields: a node returns only the items it adds."""
+    if right is None:
+        return left or []
+    return (left or []) + (right if isinstance(right, list) else [right])
+
+
+def new_agent_messages(state, result) -> list:
+    """
+    The messages a react agent added, converted to state dicts.
+
+    An agent returns its input messages first, so only the tail past the input
+    is converted; ids are kept so the history stays stable.
+    """
+    converted = []
+    for message in result.get("messages", [])[len(state.get("messages") or []):]:
+        if isinstance(message, BaseMessage):
+            converted.append({
+                "role": "assistant" if message.__class__.__name__ == "AIMessage" else "user",
+                "content": message.content,
+                "id": message.id,
+            })
+        else:
+            converted.append(message)
+    return converted
+
 
 class GameState(TypedDict, total=False):
+    """
+    Graph state. Nodes return only the keys they change: counters are summed,
+    list fields are appended to and every other field is last-write-wins, so each
+    step only versions and checkpoints the channels it touched.
+    """
+
     # Core routing and game state
     route_to: Literal["number_game", "word_game", "end_game", "game_orchestrator"]
-    number_game_count: int
-    word_game_count: int
+    # Increments: a node returns 1 when it finishes a game. Input values would be added
+    # too, so the APIs never pass client-supplied counts into the graph
+    number_game_count: Annotated[int, operator.add]
+    word_game_count: Annotated[int, operator.add]
 
-    # Messages for conversation flow
-    messages: List[Dict[str, Any]]
+    # Messages for conversation flow; nodes return only new messages
+    messages: Annotated[List[Dict[str, Any]], append_messages]
 
     # Additional fields for enhanced functionality
     current_game: Optional[str]
@@ -20,10 +127,10 @@ class GameState(TypedDict, total=False):
     # Number game specific fields
     min_val: Optional[int]
     max_val: Optional[int]
-    guess_history: Optional[List[str]]
+    guess_history: Annotated[Optional[List[str]], extend_list]
 
     # Word game specific fields
     current_question_number: Optional[int]
-    asked_questions: Optional[List[str]]
-    qa_pairs: Optional[List[tuple]]
+    asked_questions: Annotated[Optional[List[str]], extend_list]
+    qa_pairs: Annotated[Optional[List[tuple]], extend_list]
     chosen_word: Optional[str]
\ No newline at end of file
@@ -0,0 +1,73 @@
+import os
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic_core import PydanticCustomError
+
+from .responses import ChatMessage
+
+MAX_REQUEST_MESSAGES = int(os.getenv("MAX_REQUEST_MESSAGES", "100"))
+MAX_MESSAGE_CHARS = int(os.getenv("MAX_MESSAGE_CHARS", "4000"))
+MAX_USER_INPUT_CHARS = int(os.getenv("MAX_USER_INPUT_CHARS", "1000"))
+
+
+class InputMessage(ChatMessage):
+    role: str = Field(max_length=32)
+    # Plain text, or LangChain-style content blocks as the responses may carry them
+    content: Union[str, List[Union[str, Dict[str, Any]]]]
+    id: Optional[str] = Field(None, max_length=128)
+
+    @field_validator("content")
+    @classmethod
+    def content_text(cls, content):
+        # The graph routes on message text, so content blocks are reduced to theirs
+        if isinstance(content, list):
+            content = "".join(
+                block if isinstance(block, str) else str(block.get("text", "")) for block in content
+            )
+        if len(content) > MAX_MESSAGE_CHARS:
+            raise PydanticCustomError(
+                "string_too_long",
+                "String should have at most {max_length} characters",
+                {"max_length": MAX_MESSAGE_CHARS},
+            )
+        return content
+
+
+class GameRequest(BaseModel):
+    """
+    Clients send back the state they were given; keys that are not part of a request
+    are ignored. That includes `messages` everywhere but /route, since the games keep
+    their own history.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    session_id: Optional[str] = Field(None, min_length=1, max_length=128)
+
+
+class PlayRequest(GameRequest):
+    """Start a game; `user_input` is only used by /word_game/stream to resume instead."""
+
+    user_input: Optional[str] = Field(None, max_length=MAX_USER_INPUT_CHARS)
+    min_val: Optional[int] = None
+    max_val: Optional[int] = None
+
+
+class ResumeRequest(GameRequest):
+    session_id: str = Field(min_length=1, max_length=128)
+    user_input: str = Field(min_length=1, max_length=MAX_USER_INPUT_CHARS)
+
+
+class RouteRequest(GameRequest):
+    """
+    The GameState fields a client may set when routing a message. The game counters
+    are summed by their reducers, so they are server-side only and ignored here.
+    """
+
+    messages: List[InputMessage] = Field([], max_length=MAX_REQUEST_MESSAGES)
+    route_to: Optional[Literal["number_game", "word_game", "end_game", "game_orchestrator"]] = None
+    user_input: Optional[str] = Field(None, max_length=MAX_USER_INPUT_CHARS)
+    current_game: Optional[str] = Field(None, max_length=32)
+    min_val: Optional[int] = None
+    max_val: Optional[int] = None
@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Literal, Optional
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+ROLES = {"human": "user", "ai": "assistant"}
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: Any
+    id: Optional[str] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def from_langchain(cls, value):
+        # Agent subgraphs leave LangChain messages in the state
+        if isinstance(value, BaseMessage):
+            return {"role": ROLES.get(value.type, value.type), "content": value.content, "id": value.id}
+        return value
+
+
+class PendingInterrupt(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    value: Any
+    resumable: bool = False
+    ns: Optional[List[str]] = None
+    when: str = "during"
+
+
+class GameDelta(BaseModel):
+    """`?delta=true&since=N` response: messages from offset N on and the pending interrupt."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    session_id: Optional[str] = None
+    state_version: Optional[int] = None
+    # Length of the full history; pass it as `since` on the next delta request
+    message_count: Optional[int] = None
+    messages: List[ChatMessage] = []
+    interrupt: Optional[List[PendingInterrupt]] = Field(None, alias="__interrupt__")
+    error: Optional[str] = None
+    game_report: Optional[Dict[str, Any]] = None
+    llm_calls: Optional[Dict[str, Any]] = None
+
+
+class GameResponse(GameDelta):
+    """Full graph state after a turn, as the play/resume/route endpoints return it."""
+
+    route_to: Optional[str] = None
+    number_game_count: Optional[int] = None
+    word_game_count: Optional[int] = None
+    current_game: Optional[str] = None
+    user_input: Optional[str] = None
+    game_status: Optional[str] = None
+    type: Optional[str] = None
+    message: Optional[str] = None
+    min_val: Optional[int] = None
+    max_val: Optional[int] = None
+    guess_history: Optional[List[str]] = None
+    current_question_number: Optional[int] = None
+    asked_questions: Optional[List[str]] = None
+    qa_pairs: Optional[List[Any]] = None
+    chosen_word: Optional[str] = None
+
+    turn_nodes: Optional[List[str]] = None
+
+
+class NumberGameResponse(BaseModel):
+    """The number game keeps no history: `messages` holds only this turn's messages."""
+
+    session_id: Optional[str] = None
+    state_version: Optional[int] = None
+    route_to: Optional[Literal["number_game"]] = None
+    number_game_count: Optional[int] = None
+    word_game_count: Optional[int] = None
+    type: Optional[str] = None
+    message: Optional[str] = None
+    min_val: Optional[int] = None
+    max_val: Optional[int] = None
+    guess_count: Optional[int] = None
+    waiting_for: Optional[str] = None
+    game_completed: Optional[bool] = None
+    error: Optional[str] = None
+    messages: List[ChatMessage] = []
@@ -0,0 +1,80 @@
+import os
+from functools import lru_cache
+from typing import Iterable, Optional
+
+
+class SharedStateBackend:
+    """
+    Key/value store shared by every worker process, modelled on a subset of Redis.
+
+    Values are bytes. Plain keys hold one value; hash keys hold field -> value maps.
+    A `ttl` (seconds) applies to the whole key and is refreshed by every write that
+    passes one.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> None:
+        """Add `amount` to the integer stored at a plain key, starting from 0."""
+        raise NotImplementedError
+
+    def hget(self, key: str, field: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def hmget(self, key: str, fields: Iterable[str]) -> list[Optional[bytes]]:
+        raise NotImplementedError
+
+    def hgetall(self, key: str) -> dict[str, bytes]:
+        raise NotImplementedError
+
+    def hkeys(self, key: str) -> list[str]:
+        raise NotImplementedError
+
+    def hlen(self, key: str) -> int:
+        raise NotImplementedError
+
+    def hset(
+        self,
+        key: str,
+        mapping: dict[str, bytes],
+        ttl: Optional[float] = None,
+        only_new: bool = False,
+    ) -> None:
+        """Set fields of a hash; with only_new, fields that already exist are left alone."""
+        raise NotImplementedError
+
+    def expire(self, keys: Iterable[str], ttl: float) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+@lru_cache(maxsize=None)
+def get_shared_backend() -> Optional[SharedStateBackend]:
+    """
+    The process-wide backend selected by SHARED_STATE_BACKEND, or None when state is
+    kept in-process. "sqlite" shares a WAL database between the workers of one host;
+    "redis" talks to any Redis-protocol server at SHARED_STATE_URL.
+    """
+    kind = os.getenv("SHARED_STATE_BACKEND", "").lower()
+    if not kind:
+        return None
+    if kind == "sqlite":
+        from .sqlite_backend import SqliteStateBackend
+
+        return SqliteStateBackend(os.getenv("SHARED_STATE_PATH", "shared_state.sqlite"))
+    if kind == "redis":
+        from .redis_backend import RedisStateBackend
+
+        return RedisStateBackend(os.getenv("SHARED_STATE_URL", "redis://localhost:6379/0"))
+    raise ValueError(f"Unknown SHARED_STATE_BACKEND: {kind}")
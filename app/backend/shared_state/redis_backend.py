@@ -0,0 +1,88 @@
+from typing import Iterable, Optional
+
+from .base import SharedStateBackend
+
+try:
+    import redis
+except ImportError:  # optional dependency, only needed for SHARED_STATE_BACKEND=redis
+    redis = None
+
+
+class RedisStateBackend(SharedStateBackend):
+    """
+    Shared state on a Redis-protocol server, for workers spread over several hosts.
+
+    Multi-command writes are pipelined so each call is one round trip.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", *, client=None) -> None:
+        if client is None:
+            if redis is None:
+                raise ImportError("SHARED_STATE_BACKEND=redis needs the redis package: pip install redis")
+            client = redis.Redis.from_url(url)
+        self.client = client
+
+    @staticmethod
+    def _ms(ttl: float) -> int:
+        return max(1, int(ttl * 1000))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self.client.set(key, value, px=None if ttl is None else self._ms(ttl))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*keys)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.incrby(key, amount)
+        if ttl is not None:
+            pipe.pexpire(key, self._ms(ttl))
+        pipe.execute()
+
+    def hget(self, key: str, field: str) -> Optional[bytes]:
+        return self.client.hget(key, field)
+
+    def hmget(self, key: str, fields: Iterable[str]) -> list[Optional[bytes]]:
+        fields = list(fields)
+        return self.client.hmget(key, fields) if fields else []
+
+    def hgetall(self, key: str) -> dict[str, bytes]:
+        return {field.decode(): value for field, value in self.client.hgetall(key).items()}
+
+    def hkeys(self, key: str) -> list[str]:
+        return [field.decode() for field in self.client.hkeys(key)]
+
+    def hlen(self, key: str) -> int:
+        return self.client.hlen(key)
+
+    def hset(
+        self,
+        key: str,
+        mapping: dict[str, bytes],
+        ttl: Optional[float] = None,
+        only_new: bool = False,
+    ) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        if only_new:
+            for field, value in mapping.items():
+                pipe.hsetnx(key, field, value)
+        elif mapping:
+            pipe.hset(key, mapping=mapping)
+        if ttl is not None:
+            pipe.pexpire(key, self._ms(ttl))
+        pipe.execute()
+
+    def expire(self, keys: Iterable[str], ttl: float) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.pexpire(key, self._ms(ttl))
+        pipe.execute()
+
+    def close(self) -> None:
+        self.client.close()
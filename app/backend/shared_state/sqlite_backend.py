@@ -0,0 +1,145 @@
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from .base import SharedStateBackend
+
+# Plain keys are stored with field ''. expires_at is wall-clock time so every process agrees.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT NOT NULL,
+    field TEXT NOT NULL DEFAULT '',
+    value BLOB,
+    expires_at REAL,
+    PRIMARY KEY (key, field)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_expires_at_idx ON entries (expires_at);
+"""
+
+
+class SqliteStateBackend(SharedStateBackend):
+    """
+    Shared state in one SQLite database in WAL mode, for several workers on one host.
+
+    Every write is its own committed transaction, so the next request sees it no
+    matter which worker serves it. Expired keys are hidden from reads and deleted
+    in passes at most every `cleanup_interval` seconds.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = "shared_state.sqlite", *, cleanup_interval: float = 60.0) -> None:
+        self.path = path
+        self.cleanup_interval = cleanup_interval
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.executescript(SCHEMA)
+        self._last_cleanup = time.time()
+
+    @staticmethod
+    def _expires_at(ttl: Optional[float]) -> Optional[float]:
+        return None if ttl is None else time.time() + ttl
+
+    def _write(self, statements) -> None:
+        """Run (sql, rows) pairs with executemany inside one transaction."""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, rows in statements:
+                    self.conn.executemany(sql, rows)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            if time.time() - self._last_cleanup >= self.cleanup_interval:
+                self.cleanup_expired()
+
+    def cleanup_expired(self) -> int:
+        with self.lock:
+            self._last_cleanup = time.time()
+            cursor = self.conn.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (self._last_cleanup,),
+            )
+            return cursor.rowcount
+
+    def _select(self, sql: str, params) -> list:
+        with self.lock:
+            return self.conn.execute(
+                sql + " AND (expires_at IS NULL OR expires_at >= ?)", (*params, time.time())
+            ).fetchall()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.hget(key, "")
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self.hset(key, {"": value}, ttl)
+
+    def delete(self, *keys: str) -> None:
+        self._write([("DELETE FROM entries WHERE key = ?", tuple((key,) for key in keys))])
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> None:
+        # Stored as ASCII digits like Redis does, so get() returns the same bytes on both
+        self._write([(
+            "DELETE FROM entries WHERE key = ? AND expires_at < ?",
+            [(key, time.time())],
+        ), (
+            "INSERT INTO entries (key, field, value, expires_at) VALUES (?, '', CAST(? AS BLOB), ?) "
+            "ON CONFLICT(key, field) DO UPDATE SET "
+            "value = CAST(CAST(CAST(value AS TEXT) AS INTEGER) + ? AS BLOB), "
+            "expires_at = COALESCE(excluded.expires_at, expires_at)",
+            [(key, str(amount), self._expires_at(ttl), amount)],
+        )])
+
+    def hget(self, key: str, field: str) -> Optional[bytes]:
+        rows = self._select("SELECT value FROM entries WHERE key = ? AND field = ?", (key, field))
+        return rows[0][0] if rows else None
+
+    def hmget(self, key: str, fields: Iterable[str]) -> list[Optional[bytes]]:
+        found = self.hgetall(key)
+        return [found.get(field) for field in fields]
+
+    def hgetall(self, key: str) -> dict[str, bytes]:
+        return dict(self._select("SELECT field, value FROM entries WHERE key = ?", (key,)))
+
+    def hkeys(self, key: str) -> list[str]:
+        return [field for (field,) in self._select("SELECT field FROM entries WHERE key = ?", (key,))]
+
+    def hlen(self, key: str) -> int:
+        return self._select("SELECT COUNT(*) FROM entries WHERE key = ?", (key,))[0][0]
+
+    def hset(
+        self,
+        key: str,
+        mapping: dict[str, bytes],
+        ttl: Optional[float] = None,
+        only_new: bool = False,
+    ) -> None:
+        expires_at = self._expires_at(ttl)
+        verb = "INSERT OR IGNORE" if only_new else "INSERT OR REPLACE"
+        statements = [(
+            # Drop an expired copy of the key first so it cannot come back to life
+            "DELETE FROM entries WHERE key = ? AND expires_at < ?",
+            [(key, time.time())],
+        ), (
+            f"{verb} INTO entries (key, field, value, expires_at) VALUES (?, ?, ?, ?)",
+            tuple((key, field, value, expires_at) for field, value in mapping.items()),
+        )]
+        if ttl is not None:
+            statements.append(("UPDATE entries SET expires_at = ? WHERE key = ?", [(expires_at, key)]))
+        self._write(statements)
+
+    def expire(self, keys: Iterable[str], ttl: float) -> None:
+        expires_at = self._expires_at(ttl)
+        self._write([(
+            "UPDATE entries SET expires_at = ? WHERE key = ?",
+            tuple((expires_at, key) for key in keys),
+        )])
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
@@ -1,7 +1,7 @@
 from langchain_core.tools import tool
 
 @tool
-def end_game(state: dict) -> str:
+async def end_game(state: dict) -> str:
     """Ends the game and shows the user how many times they played each game."""
     number_count = state.get("number_game_count", 0)
     word_count = state.get("word_game_count", 0)
@@ -1,19 +1,64 @@
+import os
+
 from langchain_core.tools import tool
+from langgraph.errors import GraphInterrupt
 from langgraph.types import interrupt
 
+# Range the user picks from; any size works, the search needs log2(range) turns
+MIN_NUMBER = int(os.getenv("NUMBER_GAME_MIN", "1"))
+MAX_NUMBER = int(os.getenv("NUMBER_GAME_MAX", "50"))
+
+# Ask "yes/higher/lower" in one interrupt per guess instead of two separate questions
+TERNARY = os.getenv("NUMBER_GAME_TERNARY", "true").lower() == "true"
+
+TERNARY_ANSWERS = {
+    "yes": "yes", "y": "yes", "correct": "yes",
+    "higher": "higher", "h": "higher", "more": "higher", "bigger": "higher",
+    "lower": "lower", "l": "lower", "less": "lower", "smaller": "lower",
+}
+
+
+def parse_ternary_answer(answer: str):
+    """Map a reply to "yes", "higher" or "lower"; None when it is none of them."""
+    return TERNARY_ANSWERS.get(answer.lower().strip().rstrip(".!"))
+
+
+def ternary_prompt(mid: int) -> str:
+    return f"Is your number {mid}? (yes/higher/lower)"
+
+
 @tool
-def guess_number():
+async def guess_number():
     """
-    Number guessing game where the user has to choose a number between 1 and 50.
+    Number guessing game where the user has to choose a number in the game's range (1 to 50 by default).
     The game tries to guess what the number is based on user feedback.
     """
-    min_val = 1
-    max_val = 50
+    min_val = MIN_NUMBER
+    max_val = MAX_NUMBER
     history = []
 
     try:
         while min_val <= max_val:
             mid = (min_val + max_val) // 2
+
+            if TERNARY:
+                # One interrupt per guess: the answer both confirms and narrows
+                user_response = interrupt(ternary_prompt(mid))
+                history.append(f"Asked: Is your number {mid}? User: {user_response}")
+                answer = parse_ternary_answer(user_response)
+                while answer is None:
+                    user_response = interrupt(f"Please answer yes, higher or lower. {ternary_prompt(mid)}")
+                    history.append(f"Asked: Is your number {mid}? User: {user_response}")
+                    answer = parse_ternary_answer(user_response)
+
+                if answer == "yes":
+                    return f"Great! I guessed your number: {mid}"
+                if answer == "higher":
+                    min_val = mid + 1
+                else:
+                    max_val = mid - 1
+                continue
+
             user_response = interrupt(f"Is your number {mid}? (yes/no)")
 
             # Add to history
@@ -37,8 +82,10 @@ def guess_number():
                 interrupt("Please respond with 'higher' or 'lower'. Let's try again.")
                 continue
 
-        result = "Something went wrong. Please make sure you chose a number between 1 and 50."
+        result = f"Something went wrong. Please make sure you chose a number between {MIN_NUMBER} and {MAX_NUMBER}."
         return result
+    except GraphInterrupt:
+        raise
     except Exception as e:
         error_msg = f"Error in number game: {str(e)}"
-        return error_msg
\ No newline at end of file
+        return error_msg
@@ -0,0 +1,215 @@
+"""
+Local question planner for the word guessing game.
+
+Every word is described by a set of yes/no attributes. Attributes are stored as
+bitsets over the word list (bit i set when word i has the attribute), so narrowing
+the candidate set after an answer is a single AND and counting candidates is a
+popcount. The planner greedily asks the question whose answer is expected to
+remove the most uncertainty about the word.
+"""
+import math
+import os
+from typing import Optional
+
+# attribute -> question asked to the user
+ATTRIBUTES = {
+    "edible": "Is it something you can eat?",
+    "handheld": "Can you easily hold it in one hand?",
+    "furniture": "Is it a piece of furniture?",
+    "wooden": "Is it usually made of wood?",
+    "has_legs": "Does it have legs?",
+    "sit_on": "Do people sit on or in it?",
+    "wheels": "Does it have wheels?",
+    "engine": "Does it have an engine?",
+    "writing": "Is it used for writing?",
+    "grows": "Does it grow on a plant?",
+    "fuzzy": "Does it have fuzzy skin?",
+    "bigger_than_person": "Is it bigger than a person?",
+    "work_surface": "Does it have a flat surface you work on?",
+}
+
+# word -> attributes that are true for it
+WORD_ATTRIBUTES = {
+    "apple": {"edible", "handheld", "grows"},
+    "kiwi": {"edible", "handheld", "grows", "fuzzy"},
+    "desk": {"furniture", "wooden", "has_legs", "work_surface"},
+    "chair": {"furniture", "wooden", "has_legs", "sit_on"},
+    "car": {"sit_on", "wheels", "engine", "bigger_than_person"},
+    "pen": {"handheld", "writing"},
+}
+
+YES_ANSWERS = {"yes", "y", "yeah", "yep", "true"}
+NO_ANSWERS = {"no", "n", "nope", "false"}
+
+
+def normalize_answer(answer: str) -> str:
+    answer = answer.lower().strip().rstrip(".!")
+    if answer in YES_ANSWERS:
+        return "yes"
+    if answer in NO_ANSWERS:
+        return "no"
+    return "maybe"
+
+
+class WordIndex:
+    """Word x attribute matrix stored as one Python-int bitset per attribute."""
+
+    def __init__(self, words, attributes, word_attributes):
+        self.words = list(words)
+        self.questions = dict(attributes)
+        self.attributes = list(self.questions)
+        self.all_words = (1 << len(self.words)) - 1
+        self.masks = {
+            attribute: sum(1 << i for i, word in enumerate(self.words) if attribute in word_attributes[word])
+            for attribute in self.attributes
+        }
+
+    def __len__(self):
+        return len(self.words)
+
+    def word(self, i: int) -> str:
+        return self.words[i]
+
+    def vocabulary_hint(self) -> str:
+        return ", ".join(self.words)
+
+    def has(self, i: int, attribute: str) -> bool:
+        return bool(self.masks[attribute] >> i & 1)
+
+    @staticmethod
+    def count(candidates: int) -> int:
+        return candidates.bit_count()
+
+    @staticmethod
+    def has_candidate(candidates: int, i: int) -> bool:
+        return bool(candidates >> i & 1)
+
+    def words_in(self, candidates: int) -> list:
+        return [word for i, word in enumerate(self.words) if candidates >> i & 1]
+
+    def narrow(self, candidates: int, attribute: str, answer: str) -> int:
+        """Apply one answer; "maybe" leaves the candidates untouched."""
+        answer = normalize_answer(answer)
+        if answer == "yes":
+            return candidates & self.masks[attribute]
+        if answer == "no":
+            return candidates & ~self.masks[attribute]
+        return candidates
+
+    def information_gain(self, candidates: int, attribute: str) -> float:
+        """Expected bits learned by asking about `attribute`, candidates equally likely."""
+        total = self.count(candidates)
+        if total == 0:
+            return 0.0
+        return _binary_entropy(self.count(candidates & self.masks[attribute]) / total)
+
+    def weighted_information_gain(self, weights, attribute: str, noise: float) -> float:
+        """Expected bits learned when words are weighted by `weights` and answers are noisy."""
+        mask = self.masks[attribute]
+        p_has = sum(w for i, w in enumerate(weights) if mask >> i & 1)
+        p_yes = p_has * (1 - noise) + (1 - p_has) * noise
+        return _binary_entropy(p_yes) - _binary_entropy(noise)
+
+    def posterior(self, answers, noise: float) -> list:
+        log_likelihood = [0.0] * len(self)
+        log_right, log_wrong = math.log(1 - noise), math.log(noise)
+        for attribute, answer in answers:
+            answer = normalize_answer(answer)
+            if answer == "maybe":
+                continue
+            mask = self.masks[attribute]
+            for i in range(len(self)):
+                has_attribute = bool(mask >> i & 1)
+                log_likelihood[i] += log_right if has_attribute == (answer == "yes") else log_wrong
+
+        top = max(log_likelihood)
+        weights = [math.exp(value - top) for value in log_likelihood]
+        total = sum(weights)
+        return [weight / total for weight in weights]
+
+    def top(self, weights, k: int) -> list:
+        ranked = sorted(zip(self.words, weights), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+
+def _binary_entropy(p: float) -> float:
+    if p <= 0.0 or p >= 1.0:
+        return 0.0
+    return -(p * math.log2(p) + (1 - p) * math.log2(1 - p))
+
+
+def next_question(
+    index, candidates: int, asked, weights=None, noise: float = 0.1
+) -> Optional[str]:
+    """
+    Greedy max-information-gain pick among the attributes not asked yet.
+
+    With posterior `weights` the split is scored under the noise model; otherwise
+    every remaining candidate counts equally.
+    """
+    best, best_gain = None, -1.0
+    for attribute in index.attributes:
+        if attribute in asked:
+            continue
+        if weights is None:
+            gain = index.information_gain(candidates, attribute)
+        else:
+            gain = index.weighted_information_gain(weights, attribute, noise)
+        if gain > best_gain:
+            best, best_gain = attribute, gain
+    return best
+
+
+def posterior_weights(index, answers, noise: float = 0.1):
+    """
+    Posterior over the words given (attribute, answer) pairs, starting from a uniform prior.
+
+    `noise` is the chance the user answers yes/no wrongly; "maybe" carries no information.
+    The result is only meant for the same index's `weighted_information_gain` and `top`:
+    one probability per word for `WordIndex`, bitsets per disagreement count for the
+    memory-mapped index.
+    """
+    return index.posterior(answers, noise)
+
+
+def score_guess(index, answers, noise: float = 0.1, top_k: int = 3):
+    """Return (best word, its probability, the top_k (word, probability) pairs)."""
+    ranked = index.top(posterior_weights(index, answers, noise), top_k)
+    best_word, confidence = ranked[0]
+    return best_word, float(confidence), [(word, float(p)) for word, p in ranked]
+
+
+def evaluate_planner(index, questions_per_game: int = 5, sample: Optional[int] = None) -> dict:
+    """Play words with truthful answers and report how often only the right word remains."""
+    word_ids = range(len(index)) if sample is None else range(0, len(index), max(1, len(index) // sample))
+    solved, questions_asked, played = 0, 0, 0
+    for i in word_ids:
+        candidates, asked = index.all_words, []
+        while len(asked) < questions_per_game and index.count(candidates) > 1:
+            attribute = next_question(index, candidates, asked)
+            if attribute is None:
+                break
+            asked.append(attribute)
+            candidates = index.narrow(candidates, attribute, "yes" if index.has(i, attribute) else "no")
+        solved += index.count(candidates) == 1 and index.has_candidate(candidates, i)
+        questions_asked += len(asked)
+        played += 1
+    return {
+        "words": len(index),
+        "played": played,
+        "accuracy": solved / played,
+        "avg_questions": questions_asked / played,
+    }
+
+
+def load_word_index():
+    """The built-in six-word game, or a precomputed index file when WORD_INDEX_PATH is set."""
+    path = os.getenv("WORD_INDEX_PATH")
+    if path:
+        from .word_index_file import MmapWordIndex
+
+        return MmapWordIndex(path)
+    return WordIndex(WORD_ATTRIBUTES, ATTRIBUTES.items(), WORD_ATTRIBUTES)
+
+
+word_index = load_word_index()
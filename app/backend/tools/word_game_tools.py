@@ -1,138 +1,165 @@
+import os
+from collections import OrderedDict
+from typing import Annotated
+
 from langchain_core.prompts import PromptTemplate
-from langchain_core.tools import tool
+from langchain_core.tools import InjectedToolCallId, tool
+from langgraph.config import get_config
+from langgraph.errors import GraphInterrupt
 from langgraph.types import interrupt
-from ..utils.model import model
+from ..utils.log import get_logger
+from ..utils.model import cached_model
+from ..utils.replay_memo import replay_memo
+from .word_game_planner import (
+    next_question,
+    normalize_answer,
+    posterior_weights,
+    score_guess,
+    word_index,
+)
+
+log = get_logger(__name__)
+
+# Available words for the game (a lazy sequence when the index is memory-mapped)
+WORDS = word_index.words
+# Upper bound on questions; the game stops earlier once the answers single out a word
+MAX_QUESTIONS = int(os.getenv("WORD_GAME_MAX_QUESTIONS", "8"))
+
+# Let the LLM reword the planner's questions (memoized, so once per question per game)
+LLM_PHRASING = os.getenv("WORD_GAME_LLM_PHRASING", "false").lower() == "true"
+
+# Chance that a yes/no answer is wrong, and the posterior needed to guess without the LLM.
+# The noise model takes log(noise) and log(1 - noise), so 0 and 1 are clamped just inside
+ANSWER_NOISE = min(max(float(os.getenv("WORD_GAME_ANSWER_NOISE", "0.1")), 1e-6), 1 - 1e-6)
+GUESS_CONFIDENCE = float(os.getenv("WORD_GAME_GUESS_CONFIDENCE", "0.8"))
+
+# The planner's questions are a fixed set, so their rewordings can be cached for good;
+# guesses depend on the answers given and are kept for a day
+phrase_model = cached_model("phrase_question")
+guess_model = cached_model("make_final_guess", ttl=24 * 60 * 60)
 
-# Available words for the game
-WORDS = ["apple", "kiwi", "desk", "chair", "car", "pen"]
+# Questions and interrupts used by recently finished games, keyed by thread id
+game_reports = OrderedDict()
+MAX_GAME_REPORTS = 10_000
+
+
+def pop_game_report(thread_id: str) -> dict:
+    return game_reports.pop(thread_id, {})
 
 
 @tool
-def play_word_game():
+async def play_word_game(tool_call_id: Annotated[str, InjectedToolCallId]):
     """
-    Word guessing game where the user has to choose a word from: apple, kiwi, desk, chair, car, pen.
-    The game tries to guess what the word is by asking 5 strategic yes/no/maybe questions.
+    Word guessing game where the user thinks of a word from the game's vocabulary.
+    The game tries to guess what the word is by asking strategic yes/no/maybe questions,
+    stopping as soon as the answers point to a single word.
     """
-    print("🔤 DEBUG: play_word_game tool called - STARTING EXECUTION")
-
-    word_list = ", ".join(WORDS)
+    word_list = word_index.vocabulary_hint()
 
     try:
         # Step 1: Welcome and get ready
-        print("🔤 DEBUG: Step 1 - Welcome phase")
         welcome_message = f"""🎮 Welcome to the Word Guessing Game!
 
 Choose one word from: {word_list}
 
 Say 'ready' when you've chosen your word!"""
 
-        print("🔤 DEBUG: About to call interrupt with welcome message")
         user_response = interrupt(welcome_message)
-        print(f"🔤 DEBUG: Got user response: {user_response}")
+        interrupts = 1
 
         # Keep asking until user is ready
         while "ready" not in user_response.lower():
-            print("🔤 DEBUG: User not ready, asking again")
             retry_message = f"Please choose a word from: {word_list} and say 'ready'!"
             user_response = interrupt(retry_message)
-            print(f"🔤 DEBUG: Got retry response: {user_response}")
+            interrupts += 1
 
-        print("🔤 DEBUG: User is ready, proceeding to questions")
-
-        # Step 2: Generate 5 questions
-        print("🔤 DEBUG: Step 2 - Generating questions")
-        questions = generate_questions()
-        print(f"🔤 DEBUG: Generated {len(questions)} questions")
-
-        # Step 3: Ask all 5 questions and collect answers
-        print("🔤 DEBUG: Step 3 - Asking questions")
+        # Step 2 & 3: Plan each question locally from the answers so far and ask it
         qa_pairs = []
-
-        for i, question in enumerate(questions, 1):
-            print(f"🔤 DEBUG: Asking question {i}: {question}")
-            question_prompt = f"Question {i}/5: {question}\n\nPlease answer: yes, no, or maybe"
+        answers = []
+        candidates = word_index.all_words
+        asked = []
+
+        best_word, confidence, top_words = score_guess(word_index, answers, ANSWER_NOISE)
+
+        while len(asked) < MAX_QUESTIONS:
+            # Stop as soon as one word is left or the posterior is confident enough
+            if word_index.count(candidates) == 1 or confidence >= GUESS_CONFIDENCE:
+                break
+            weights = posterior_weights(word_index, answers, ANSWER_NOISE)
+            attribute = next_question(word_index, candidates, asked, weights, ANSWER_NOISE)
+            if attribute is None:
+                break
+            asked.append(attribute)
+            i = len(asked)
+            question = word_index.questions[attribute]
+            if LLM_PHRASING:
+                # LLM results are memoized so resumes replay them instead of calling the model again
+                question = await replay_memo.call(tool_call_id, f"phrase_question_{i}", phrase_question, question)
+
+            question_prompt = f"Question {i}: {question}\n\nPlease answer: yes, no, or maybe"
             user_answer = interrupt(question_prompt)
-            print(f"🔤 DEBUG: Got answer {i}: {user_answer}")
+            interrupts += 1
+            log.debug("play_word_game.answer", question=question, answer=user_answer)
 
-            # Store the Q&A pair
-            qa_pairs.append((question, user_answer.lower().strip()))
-
-        print(f"🔤 DEBUG: Completed all questions, got {len(qa_pairs)} Q&A pairs")
+            # Store the Q&A pair and narrow the candidate words
+            qa_pairs.append((question, normalize_answer(user_answer)))
+            answers.append((attribute, user_answer))
+            candidates = word_index.narrow(candidates, attribute, user_answer)
+            best_word, confidence, top_words = score_guess(word_index, answers, ANSWER_NOISE)
 
         # Step 4: Make final guess based on all Q&A pairs
-        print("🔤 DEBUG: Step 4 - Making final guess")
-        final_guess = make_final_guess(qa_pairs)
-        print(f"🔤 DEBUG: Generated guess: {final_guess}")
+        log.debug("play_word_game.candidates", questions=len(qa_pairs), top_words=top_words)
+        if word_index.count(candidates) == 1 or confidence >= GUESS_CONFIDENCE:
+            final_guess = f"Based on your answers, I think your word is {best_word}"
+        else:
+            # Only close calls go to the LLM, restricted to the leading candidates
+            close_words = [word for word, _ in top_words]
+            final_guess = await replay_memo.call(
+                tool_call_id, "make_final_guess", make_final_guess, qa_pairs, close_words
+            )
 
         # Step 5: Get verification
-        print("🔤 DEBUG: Step 5 - Getting verification")
         verification_prompt = f"{final_guess}\n\nIs this correct? (yes/no)"
         final_response = interrupt(verification_prompt)
-        print(f"🔤 DEBUG: Got verification: {final_response}")
+        interrupts += 1
 
         # Step 6: Return final result
-        print("🔤 DEBUG: Step 6 - Returning final result")
         if final_response.lower().strip() == "yes":
             result = "🎉 Excellent! I guessed your word correctly! Thanks for playing!"
         else:
             result = "🎮 I didn't get it this time! You win! Thanks for playing!"
 
-        print(f"🔤 DEBUG: Tool execution complete, returning: {result}")
+        thread_id = get_config()["configurable"]["thread_id"]
+        game_reports[thread_id] = {"questions": len(asked), "interrupts": interrupts}
+        while len(game_reports) > MAX_GAME_REPORTS:
+            game_reports.popitem(last=False)
+
+        log.debug("play_word_game.finished", guess=final_guess, verified=final_response, result=result)
         return result
 
+    except GraphInterrupt:
+        raise
     except Exception as e:
-        print(f"🔤 DEBUG: Exception in play_word_game tool: {e}")
-        import traceback
-        print(f"🔤 DEBUG: Tool traceback: {traceback.format_exc()}")
+        log.exception("play_word_game.failed", error=str(e))
         error_msg = f"Error in word game: {str(e)}"
         return error_msg
 
 
-def generate_questions():
-    """Generate 5 strategic questions for the word game"""
-    word_list = ", ".join(WORDS)
-
+async def phrase_question(question):
+    """Reword a planned question so the game sounds less mechanical"""
     prompt = PromptTemplate.from_template(
-        """Generate 5 strategic yes/no/maybe questions for a word guessing game.
-
-AVAILABLE WORDS: {words}
+        """Rephrase this yes/no question for a friendly word guessing game.
+Keep the meaning exactly the same and return only the question.
 
-Generate 5 different strategic questions about properties, uses, or characteristics.
-Do NOT guess words directly - ask about attributes that help narrow down choices.
-
-Examples:
-- "Is it something you can eat?"
-- "Is it found indoors?"
-- "Is it made of wood?"
-- "Can you hold it in your hand?"
-- "Is it used for writing?"
-
-Return exactly 5 questions, one per line, numbered 1-5."""
+QUESTION: {question}"""
     )
-
-    formatted_prompt = prompt.format(words=word_list)
-    response = model.invoke(formatted_prompt).content.strip()
-
-    # Parse questions
-    lines = response.split('\n')
-    questions = []
-    for line in lines:
-        line = line.strip()
-        if line and ('?' in line):
-            if line[0].isdigit():
-                line = line.split('.', 1)[1].strip() if '.' in line else line
-            questions.append(line)
-
-    questions = questions[:5]
-    while len(questions) < 5:
-        questions.append("Is it something commonly found at home?")
-
-    return questions
+    response = (await phrase_model.ainvoke(prompt.format(question=question))).content.strip()
+    return response if response.endswith("?") else question
 
 
-def make_final_guess(qa_pairs):
-    """Make final guess based on Q&A pairs"""
-    word_list = ", ".join(WORDS)
+async def make_final_guess(qa_pairs, words=None):
+    """Make final guess based on Q&A pairs, optionally limited to the given words"""
+    word_list = ", ".join(words or WORDS[:20])
 
     qa_text = ""
     for i, (question, answer) in enumerate(qa_pairs, 1):
@@ -156,4 +183,4 @@ Format: "Based on your answers, I think your word is [WORD]"
         words=word_list
     )
 
-    return model.invoke(formatted_guess).content.strip()
\ No newline at end of file
+    return (await guess_model.ainvoke(formatted_guess)).content.strip()
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Precomputed word x attribute index for large vocabularies.
+
+The index is built offline into a single binary file and memory-mapped read-only
+at startup, so opening it costs no parsing and every worker process shares the same
+page cache instead of holding its own copy. Layout (little endian):
+
+    header   magic, word/attribute/block counts and section offsets
+    meta     JSON {"questions": {attribute: question}} in attribute order
+    offsets  uint64[n_words + 1] byte offsets of each word in the words blob
+    words    utf-8 words, concatenated
+    bits     uint64[n_attributes][n_blocks], bit i of an attribute row set when word i has it
+
+Candidate sets are uint64 arrays of n_blocks, so applying an answer is one
+vectorized AND over words/64 blocks and counting candidates is a popcount.
+Under the noisy-answer model a word's posterior depends only on how many answers
+it disagrees with, so the posterior is kept as one bitset per disagreement count
+and scoring a question is a popcount per level too.
+
+Build one with:
+
+    python -m app.backend.tools.word_index_file attributes.json words.tsv words.idx
+
+where attributes.json maps attribute -> question and every words.tsv line is
+`word<TAB>attribute,attribute,...`.
+"""
+import argparse
+import json
+import mmap
+import struct
+from collections.abc import Sequence
+
+import numpy as np
+
+from .word_game_planner import _binary_entropy, normalize_answer
+
+MAGIC = b"WORDIDX1"
+HEADER = struct.Struct("<8s9Q")
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_word_index(path, attributes: dict, word_attributes) -> None:
+    """Write `word_attributes` ((word, attributes) pairs) as an index file at `path`."""
+    attribute_ids = {attribute: a for a, attribute in enumerate(attributes)}
+    words = []
+    rows, cols = [], []
+    for i, (word, word_attrs) in enumerate(word_attributes):
+        words.append(word.encode("utf-8"))
+        for attribute in word_attrs:
+            rows.append(attribute_ids[attribute])
+            cols.append(i)
+
+    n_words, n_attrs = len(words), len(attribute_ids)
+    n_blocks = -(-n_words // 64)
+    dense = np.zeros((n_attrs, n_blocks * 64), dtype=np.uint8)
+    dense[rows, cols] = 1
+    bits = np.packbits(dense, axis=1, bitorder="little").view("<u8")
+
+    meta = json.dumps({"questions": dict(attributes)}).encode("utf-8")
+    offsets = np.zeros(n_words + 1, dtype="<u8")
+    np.cumsum([len(word) for word in words], out=offsets[1:])
+    blob = b"".join(words)
+
+    meta_offset = HEADER.size
+    offsets_offset = _align(meta_offset + len(meta))
+    words_offset = offsets_offset + offsets.nbytes
+    bits_offset = _align(words_offset + len(blob))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, n_words, n_attrs, n_blocks,
+            meta_offset, len(meta), offsets_offset, words_offset, len(blob), bits_offset,
+        ))
+        f.write(meta)
+        f.write(b"\0" * (offsets_offset - f.tell()))
+        f.write(offsets.tobytes())
+        f.write(blob)
+        f.write(b"\0" * (bits_offset - f.tell()))
+        f.write(bits.tobytes())
+
+
+class _WordList(Sequence):
+    """Words decoded on access straight from the mapped file."""
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+
+class _Posterior:
+    """
+    Posterior over the words of a `MmapWordIndex`: `levels[d]` is the bitset of words
+    disagreeing with d of the answers and `weights[d]` the probability of each of them.
+    """
+
+    __slots__ = ("levels", "weights")
+
+    def __init__(self, levels, weights):
+        self.levels = levels
+        self.weights = weights
+
+
+class MmapWordIndex:
+    """Memory-mapped index with the same interface as `WordIndex`."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+
+        (magic, n_words, n_attrs, n_blocks, meta_offset, meta_len,
+         offsets_offset, words_offset, words_len, bits_offset) = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a word index file")
+
+        self.questions = json.loads(bytes(buf[meta_offset:meta_offset + meta_len]))["questions"]
+        self.attributes = list(self.questions)
+        self._attribute_ids = {attribute: a for a, attribute in enumerate(self.attributes)}
+        self._n_words = n_words
+
+        offsets = np.frombuffer(buf, dtype="<u8", count=n_words + 1, offset=offsets_offset)
+        self.words = _WordList(offsets, buf[words_offset:words_offset + words_len])
+        self.bits = np.frombuffer(buf, dtype="<u8", count=n_attrs * n_blocks, offset=bits_offset)
+        self.bits = self.bits.reshape(n_attrs, n_blocks)
+
+        all_words = np.full(n_blocks, np.iinfo(np.uint64).max, dtype=np.uint64)
+        if n_words % 64:
+            all_words[-1] = np.uint64((1 << n_words % 64) - 1)
+        all_words.flags.writeable = False
+        self.all_words = all_words
+
+    def __len__(self):
+        return self._n_words
+
+    def word(self, i: int) -> str:
+        return self.words[i]
+
+    def vocabulary_hint(self, sample: int = 8) -> str:
+        step = max(1, len(self) // sample)
+        examples = ", ".join(self.words[i] for i in range(0, len(self), step)[:sample])
+        return f"any of {len(self):,} words (e.g. {examples})"
+
+    def _row(self, attribute: str):
+        return self.bits[self._attribute_ids[attribute]]
+
+    def has(self, i: int, attribute: str) -> bool:
+        return bool(int(self._row(attribute)[i >> 6]) >> (i & 63) & 1)
+
+    @staticmethod
+    def count(candidates) -> int:
+        return int(np.bitwise_count(candidates).sum())
+
+    @staticmethod
+    def has_candidate(candidates, i: int) -> bool:
+        return bool(int(candidates[i >> 6]) >> (i & 63) & 1)
+
+    def words_in(self, candidates) -> list:
+        ids = np.flatnonzero(np.unpackbits(candidates.view(np.uint8), bitorder="little"))
+        return [self.words[int(i)] for i in ids]
+
+    def narrow(self, candidates, attribute: str, answer: str):
+        """Apply one answer; "maybe" leaves the candidates untouched."""
+        answer = normalize_answer(answer)
+        if answer == "yes":
+            return candidates & self._row(attribute)
+        if answer == "no":
+            return candidates & ~self._row(attribute)
+        return candidates
+
+    def information_gain(self, candidates, attribute: str) -> float:
+        """Expected bits learned by asking about `attribute`, candidates equally likely."""
+        total = self.count(candidates)
+        if total == 0:
+            return 0.0
+        return _binary_entropy(self.count(candidates & self._row(attribute)) / total)
+
+    def weighted_information_gain(self, weights, attribute: str, noise: float) -> float:
+        """Expected bits learned when words are weighted by `weights` and answers are noisy."""
+        has = np.bitwise_count(weights.levels & self._row(attribute)).sum(axis=1)
+        p_has = float(weights.weights @ has)
+        p_yes = p_has * (1 - noise) + (1 - p_has) * noise
+        return _binary_entropy(p_yes) - _binary_entropy(noise)
+
+    def posterior(self, answers, noise: float) -> _Posterior:
+        """Posterior as bitsets per number of disagreeing answers; O(answers^2 * words/64)."""
+        levels = self.all_words[np.newaxis, :]
+        for attribute, answer in answers:
+            answer = normalize_answer(answer)
+            if answer == "maybe":
+                continue
+            agrees = self._row(attribute) if answer == "yes" else ~self._row(attribute) & self.all_words
+            shifted = np.zeros((len(levels) + 1, levels.shape[1]), dtype=np.uint64)
+            shifted[:-1] = levels & agrees
+            shifted[1:] |= levels & ~agrees
+            levels = shifted
+
+        # Each disagreement multiplies a word's likelihood by noise / (1 - noise)
+        likelihood = (noise / (1 - noise)) ** np.arange(len(levels))
+        sizes = np.bitwise_count(levels).sum(axis=1)
+        return _Posterior(levels, likelihood / float(likelihood @ sizes))
+
+    def top(self, weights, k: int) -> list:
+        """Most likely words, decoding only as many nonzero blocks of each level as needed."""
+        ranked = []
+        for d in np.argsort(-weights.weights, kind="stable"):
+            if len(ranked) >= k:
+                break
+            level = weights.levels[d]
+            blocks = np.flatnonzero(level)[:k - len(ranked)]
+            bits = np.unpackbits(level[blocks].view(np.uint8), bitorder="little").reshape(len(blocks), 64)
+            rows, cols = np.nonzero(bits)
+            for i in (blocks[rows] * 64 + cols)[:k - len(ranked)]:
+                ranked.append((self.words[int(i)], float(weights.weights[d])))
+        return ranked
+
+
+def _read_words_tsv(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            word, _, attributes = line.partition("\t")
+            yield word, [attribute for attribute in attributes.split(",") if attribute]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a memory-mapped word game index")
+    parser.add_argument("attributes", help="JSON file mapping attribute -> question")
+    parser.add_argument("words", help="TSV file: word<TAB>attribute,attribute,...")
+    parser.add_argument("output", help="index file to write")
+    args = parser.parse_args(argv)
+
+    with open(args.attributes, encoding="utf-8") as f:
+        attributes = json.load(f)
+    write_word_index(args.output, attributes, _read_words_tsv(args.words))
+
+    index = MmapWordIndex(args.output)
+    print(f"Wrote {args.output}: {len(index)} words, {len(index.attributes)} attributes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Token-budgeted history for the supervisor and agent LLM calls.
+
+`windowed_prompt(site, system_prompt)` is the prompt of a react agent or supervisor.
+The model sees its system prompt, one system message summarizing older turns and
+the last CONTEXT_KEEP_TURNS turns verbatim (a turn starts at a user message),
+trimmed to the call site's token budget. The graph state itself keeps the full
+history, and since this runs as the prompt rather than a graph node, the windowed
+input is never checkpointed.
+
+Older turns are folded into the summary CONTEXT_SUMMARY_CHUNK turns at a time, so
+the verbatim part holds between KEEP_TURNS and KEEP_TURNS + CHUNK - 1 turns and a
+summary call happens once per chunk rather than once per turn. Summaries are cached
+per thread by the number of messages they cover, so the supervisor and the agents
+share them instead of each paying for their own.
+
+Settings:
+    CONTEXT_WINDOW=true
+    CONTEXT_KEEP_TURNS=6
+    CONTEXT_SUMMARY_CHUNK=4
+    CONTEXT_MAX_TOKENS=4000            per call; CONTEXT_MAX_TOKENS_<SITE> overrides one site
+    CONTEXT_SUMMARY=llm                or "drop" to replace old turns with a one-line note
+"""
+import math
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    get_buffer_string,
+    trim_messages,
+)
+
+from .log import get_logger
+from .metrics import registry
+from .model import cached_model, model_name
+
+log = get_logger(__name__)
+
+CONTEXT_WINDOW = os.getenv("CONTEXT_WINDOW", "true").lower() == "true"
+KEEP_TURNS = int(os.getenv("CONTEXT_KEEP_TURNS", "6"))
+SUMMARY_CHUNK = max(1, int(os.getenv("CONTEXT_SUMMARY_CHUNK", "4")))
+MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "4000"))
+SUMMARY_MODE = os.getenv("CONTEXT_SUMMARY", "llm").lower()
+MAX_SUMMARIES = 10_000
+# Fold points kept per thread; call sites with different CONTEXT_KEEP_TURNS use different ones
+SUMMARIES_PER_THREAD = 4
+
+SUMMARY_PROMPT = """Summarize this conversation between a user and a game assistant in at most
+five sentences. Keep which games were played, their outcomes and anything the user asked for.
+
+PREVIOUS SUMMARY: {summary}
+
+NEW MESSAGES:
+{messages}"""
+
+summary_model = cached_model("history_summary")
+summaries_total = registry.counter(
+    "context_summaries_total", "History summaries per call site, computed or reused", ("site", "result")
+)
+input_tokens = registry.histogram(
+    "context_input_tokens", "Estimated prompt tokens sent per LLM call", ("site",),
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+
+# thread_id -> {messages folded in: summary text}, least recently used threads first
+summaries: OrderedDict[str, dict[int, str]] = OrderedDict()
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """The model's tiktoken encoding, or None when tiktoken or its data is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        log.warning("tokenizer_unavailable", error=str(e), fallback="4 characters per token")
+        return None
+
+
+def count_text_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return math.ceil(len(text) / 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(messages: list[BaseMessage]) -> int:
+    """Approximate chat tokens: content and tool calls plus a few tokens of framing per message."""
+    total = 2
+    for message in messages:
+        total += 4 + count_text_tokens(str(message.content))
+        for call in getattr(message, "tool_calls", None) or []:
+            total += count_text_tokens(f"{call['name']}{call['args']}")
+    return total
+
+
+def _window_start(messages: list[BaseMessage], keep_turns: int) -> int:
+    """Index of the user message that opens the last `keep_turns` turns (0 if there are fewer)."""
+    seen = 0
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            seen += 1
+            if seen == keep_turns:
+                return index
+    return 0
+
+
+def _fold_point(messages: list[BaseMessage], keep_turns: int, chunk: int) -> int:
+    """
+    Number of leading messages to summarize: whole turns, in multiples of `chunk`,
+    leaving at least `keep_turns` turns verbatim.
+    """
+    turn_starts = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    older_turns = len(turn_starts) - keep_turns
+    if older_turns < chunk:
+        return 0
+    # Messages before the first user message belong to the first turn
+    return turn_starts[older_turns // chunk * chunk]
+
+
+async def _fold(summary: str, messages: list[BaseMessage], folded: int) -> str:
+    if SUMMARY_MODE != "llm":
+        return f"{folded} earlier messages were left out."
+    response = await summary_model.ainvoke(SUMMARY_PROMPT.format(
+        summary=summary or "(none)", messages=get_buffer_string(messages)
+    ))
+    return str(response.content).strip()
+
+
+async def _summarize(site: str, thread_id: Optional[str], older: list[BaseMessage]) -> str:
+    """Summary of `older`, extending the thread's longest cached summary that fits inside it."""
+    if thread_id is None:
+        # No thread to key a cache on: summarize from scratch and keep nothing
+        summaries_total.inc(1, site, "computed")
+        return await _fold("", older, len(older))
+
+    cached = summaries.get(thread_id, {})
+    if len(older) in cached:
+        summaries.move_to_end(thread_id)
+        summaries_total.inc(1, site, "reused")
+        return cached[len(older)]
+
+    folded = max((count for count in cached if count < len(older)), default=0)
+    summary = await _fold(cached.get(folded, ""), older[folded:], len(older))
+    summaries_total.inc(1, site, "computed")
+
+    cached = summaries.setdefault(thread_id, {})
+    cached[len(older)] = summary
+    for count in sorted(cached)[:-SUMMARIES_PER_THREAD]:
+        del cached[count]
+    summaries.move_to_end(thread_id)
+    while len(summaries) > MAX_SUMMARIES:
+        summaries.popitem(last=False)
+    return summary
+
+
+def windowed_prompt(
+    site: str, system_prompt: str, keep_turns: Optional[int] = None, max_tokens: Optional[int] = None
+):
+    """
+    Prompt for create_react_agent/create_supervisor that windows the history.
+
+    Returns `system_prompt` unchanged when CONTEXT_WINDOW is off.
+    """
+    if not CONTEXT_WINDOW:
+        return system_prompt
+    keep_turns = keep_turns or KEEP_TURNS
+    max_tokens = max_tokens or int(os.getenv(f"CONTEXT_MAX_TOKENS_{site.upper()}", str(MAX_TOKENS)))
+    system_message = SystemMessage(content=system_prompt)
+
+    async def prompt(state, config) -> list[BaseMessage]:
+        messages = state["messages"]
+        start = _fold_point(messages, keep_turns, SUMMARY_CHUNK)
+        window = messages[start:]
+        prefix = [system_message]
+        if start:
+            thread_id = (config.get("configurable") or {}).get("thread_id")
+            summary = await _summarize(site, thread_id, messages[:start])
+            prefix.append(SystemMessage(content=f"Summary of the earlier conversation: {summary}"))
+
+        budget = max_tokens - count_tokens(prefix)
+        if count_tokens(window) > budget:
+            trimmed = trim_messages(
+                window, max_tokens=budget, token_counter=count_tokens,
+                strategy="last", start_on="human", allow_partial=False,
+            )
+            if not trimmed:
+                # Even the current turn is over budget; send it whole rather than break it up
+                last_human = _window_start(window, 1)
+                log.warning("context_over_budget", site=site, max_tokens=max_tokens)
+                trimmed = window[last_human:]
+            window = trimmed
+
+        llm_input = prefix + window
+        input_tokens.observe(count_tokens(llm_input), site)
+        return llm_input
+
+    return prompt
+
+
+if CONTEXT_WINDOW:
+    # Load (and on first use download) the tokenizer now rather than inside the first request
+    _encoding()
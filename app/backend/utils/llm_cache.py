@@ -0,0 +1,133 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    generations TEXT NOT NULL,
+    expires_at REAL
+);
+"""
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Exact-match key: llm_string carries the model name, temperature and other params."""
+    return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+
+class TieredLLMCache:
+    """
+    Two-tier response cache: an in-memory LRU in front of a SQLite file.
+
+    Disk hits are promoted to memory, so a prompt seen before costs one dict lookup
+    once warm. Each entry carries its own expiry, set by the call site that stored it.
+    """
+
+    def __init__(self, path: Optional[str] = "llm_cache.sqlite", *, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self.memory: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        self.counts = Counter()
+        self.lock = threading.RLock()
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+
+    def _remember(self, key: str, expires_at: Optional[float], generations) -> None:
+        self.memory[key] = (expires_at, generations)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str, site: str):
+        now = time.time()
+        with self.lock:
+            if (entry := self.memory.get(key)) is not None:
+                if entry[0] is None or entry[0] > now:
+                    self.memory.move_to_end(key)
+                    self.counts[f"{site}.memory_hits"] += 1
+                    return entry[1]
+                del self.memory[key]
+
+            if self.conn is not None:
+                row = self.conn.execute(
+                    "SELECT generations, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and (row[1] is None or row[1] > now):
+                    generations = loads(row[0])
+                    self._remember(key, row[1], generations)
+                    self.counts[f"{site}.disk_hits"] += 1
+                    return generations
+
+            self.counts[f"{site}.misses"] += 1
+            return None
+
+    def put(self, key: str, generations, ttl: Optional[float]) -> None:
+        expires_at = None if ttl is None else time.time() + ttl
+        with self.lock:
+            self._remember(key, expires_at, generations)
+            if self.conn is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?)",
+                    (key, dumps(list(generations)), expires_at),
+                )
+
+    def clear(self) -> None:
+        with self.lock:
+            self.memory.clear()
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict:
+        """Hit/miss counters per call site, plus totals."""
+        with self.lock:
+            sites: dict[str, dict[str, int]] = {}
+            for name, count in self.counts.items():
+                site, kind = name.rsplit(".", 1)
+                sites.setdefault(site, {"memory_hits": 0, "disk_hits": 0, "misses": 0})[kind] = count
+            totals = {
+                kind: sum(site[kind] for site in sites.values())
+                for kind in ("memory_hits", "disk_hits", "misses")
+            }
+            return {"entries_in_memory": len(self.memory), **totals, "sites": sites}
+
+
+class CallSiteCache(BaseCache):
+    """
+    LangChain cache for one call site: shares the tiered store, keeps its own TTL and counters.
+
+    Attach it with `model.model_copy(update={"cache": ...})`; see `cached_model`.
+    """
+
+    def __init__(self, store: TieredLLMCache, site: str, ttl: Optional[float] = None) -> None:
+        self.store = store
+        self.site = site
+        self.ttl = ttl
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        return self.store.get(cache_key(prompt, llm_string), self.site)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.store.put(cache_key(prompt, llm_string), return_val, self.ttl)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+    # Lookups are a dict hit or one indexed SQLite read, cheaper than a thread hop
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.update(prompt, llm_string, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        self.clear()
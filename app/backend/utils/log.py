@@ -0,0 +1,151 @@
+"""
+Structured logging for the backend.
+
+    log = get_logger(__name__)
+    log.debug("agent_result", messages=len(result["messages"]), result=result)
+
+Calls name an event and pass fields as keywords; nothing is formatted unless the level
+is enabled, so a disabled debug call costs one level check. Debug events can be
+sampled, field values are rendered with bounded `reprlib` limits, and records are
+written to stdout by a background queue listener, off the request path.
+
+Settings:
+    LOG_LEVEL=INFO                 DEBUG brings back the per-node and per-step traces
+    LOG_FORMAT=text                or "json" for one object per line
+    LOG_MAX_FIELD_CHARS=200        longer field values are cut
+    LOG_DEBUG_SAMPLE_RATE=1.0      fraction of debug events kept
+    LOG_QUEUE=true                 false writes synchronously from the caller
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import reprlib
+import sys
+from functools import lru_cache
+from typing import Any, Optional
+
+ROOT_LOGGER = "app"
+
+
+class FieldRepr(reprlib.Repr):
+    """reprlib limits keep rendering cost bounded even for the whole graph state."""
+
+    def __init__(self, max_chars: int) -> None:
+        super().__init__()
+        self.maxlevel = 3
+        self.maxdict = self.maxlist = self.maxtuple = self.maxset = 8
+        self.maxstring = self.maxother = self.maxlong = max_chars
+
+
+class StructuredFormatter(logging.Formatter):
+    def __init__(self, *, json_output: bool = False, max_field_chars: int = 200) -> None:
+        super().__init__()
+        self.json_output = json_output
+        self.max_field_chars = max_field_chars
+        self.repr = FieldRepr(max_field_chars)
+
+    def render(self, value: Any):
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        text = value if isinstance(value, str) else self.repr.repr(value)
+        if len(text) > self.max_field_chars:
+            text = f"{text[:self.max_field_chars]}...(+{len(text) - self.max_field_chars} chars)"
+        return text
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {key: self.render(value) for key, value in getattr(record, "fields", {}).items()}
+        if record.exc_info:
+            fields["exc"] = self.formatException(record.exc_info)
+
+        if self.json_output:
+            return json.dumps({
+                "ts": round(record.created, 6),
+                "level": record.levelname.lower(),
+                "logger": record.name,
+                "event": record.getMessage(),
+                **fields,
+            }, default=str)
+
+        text = " ".join(f"{key}={value}" for key, value in fields.items() if key != "exc")
+        line = f"{self.formatTime(record)} {record.levelname:7} {record.name} {record.getMessage()}"
+        line = f"{line} {text}" if text else line
+        return f"{line}\n{fields['exc']}" if "exc" in fields else line
+
+
+class StructuredLogger:
+    """Thin wrapper over a stdlib logger: events with keyword fields, optional sampling."""
+
+    __slots__ = ("logger", "debug_sample_rate")
+
+    def __init__(self, logger: logging.Logger, debug_sample_rate: float = 1.0) -> None:
+        self.logger = logger
+        self.debug_sample_rate = debug_sample_rate
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, event: str, /, sample: Optional[float] = None,
+            exc_info: bool = False, **fields) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        if sample is None and level <= logging.DEBUG:
+            sample = self.debug_sample_rate
+        if sample is not None and sample < 1.0 and random.random() >= sample:
+            return
+        self.logger.log(level, event, exc_info=exc_info, extra={"fields": fields}, stacklevel=3)
+
+    def debug(self, event: str, /, sample: Optional[float] = None, **fields) -> None:
+        self.log(logging.DEBUG, event, sample=sample, **fields)
+
+    def info(self, event: str, /, sample: Optional[float] = None, **fields) -> None:
+        self.log(logging.INFO, event, sample=sample, **fields)
+
+    def warning(self, event: str, /, sample: Optional[float] = None, **fields) -> None:
+        self.log(logging.WARNING, event, sample=sample, **fields)
+
+    def error(self, event: str, /, sample: Optional[float] = None, **fields) -> None:
+        self.log(logging.ERROR, event, sample=sample, **fields)
+
+    def exception(self, event: str, /, **fields) -> None:
+        """Error event with the current traceback attached."""
+        self.log(logging.ERROR, event, exc_info=True, **fields)
+
+
+@lru_cache(maxsize=None)
+def configure_logging() -> logging.Logger:
+    """Set up the `app` logger hierarchy from the LOG_* settings, once per process."""
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.propagate = False
+
+    formatter = StructuredFormatter(
+        json_output=os.getenv("LOG_FORMAT", "text").lower() == "json",
+        max_field_chars=int(os.getenv("LOG_MAX_FIELD_CHARS", "200")),
+    )
+    stream_handler = logging.StreamHandler(sys.stdout)
+
+    if os.getenv("LOG_QUEUE", "true").lower() == "true":
+        # Records are formatted by the caller and written by the listener thread
+        records = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(records)
+        queue_handler.setFormatter(formatter)
+        listener = logging.handlers.QueueListener(records, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        root.addHandler(queue_handler)
+    else:
+        stream_handler.setFormatter(formatter)
+        root.addHandler(stream_handler)
+    return root
+
+
+def get_logger(name: str) -> StructuredLogger:
+    configure_logging()
+    return StructuredLogger(
+        logging.getLogger(name),
+        debug_sample_rate=float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0")),
+    )
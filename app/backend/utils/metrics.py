@@ -0,0 +1,380 @@
+"""
+Prometheus-style metrics for the API, the graph and the LLM calls, served at /metrics.
+
+Counters, gauges and histograms live in one in-process registry and are rendered in
+the Prometheus text format, so any scraper or a plain curl can read them with no
+client library or collector running. Three hooks feed them:
+
+- `MetricsMiddleware` times every HTTP request by route template;
+- `GraphMetricsHandler`, a LangChain callback attached to the compiled graph, times
+  top-level nodes, counts their interrupts and errors, and records LLM latency,
+  tokens and errors per call site (the `call_site` metadata set by `model_for`);
+- `MeteredSerializer` wraps the checkpointer's serializer to count bytes written.
+
+The callback and the middleware also open spans (see `tracing`) when TRACE_EXPORTER is set.
+"""
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.errors import GraphInterrupt
+
+from .tracing import current_span, start_span
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()) -> None:
+        super().__init__(name, help, labels)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, *labels) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self.values.get(labels, 0)
+
+    def samples(self) -> list[str]:
+        with self.lock:
+            return [
+                f"{self.name}{_label_text(self.labels, labels)} {_number(value)}"
+                for labels, value in sorted(self.values.items())
+            ]
+
+
+class Gauge(Counter):
+    """A settable value, or one read from `callback` (label values -> value) at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple = (),
+                 callback: Optional[Callable[[], dict]] = None) -> None:
+        super().__init__(name, help, labels)
+        self.callback = callback
+
+    def set(self, value: float, *labels) -> None:
+        with self.lock:
+            self.values[labels] = value
+
+    def samples(self) -> list[str]:
+        if self.callback is not None:
+            with self.lock:
+                self.values.update(self.callback())
+        return super().samples()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = TIME_BUCKETS) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [count per bucket (+Inf last), sum]
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels) -> int:
+        series = self.series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> list[str]:
+        lines = []
+        with self.lock:
+            for labels, (counts, total) in sorted(self.series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, math.inf), counts):
+                    cumulative += count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_label_text(self.labels, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_label_text(self.labels, labels)} {_number(total)}")
+                lines.append(f"{self.name}_count{_label_text(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, help, labels, callback))
+
+    def histogram(self, name: str, help: str, labels: tuple = (), buckets: tuple = TIME_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being served")
+
+node_duration = registry.histogram(
+    "graph_node_duration_seconds", "Wall time of top-level graph nodes, interrupted runs included", ("node",)
+)
+node_interrupts = registry.counter(
+    "graph_interrupts_total", "Interrupts raised by top-level graph nodes", ("node",)
+)
+node_errors = registry.counter("graph_node_errors_total", "Top-level graph node failures", ("node",))
+
+llm_requests = registry.counter("llm_requests_total", "LLM calls per call site", ("site",))
+llm_duration = registry.histogram(
+    "llm_request_duration_seconds", "LLM call latency per call site", ("site",)
+)
+llm_tokens = registry.counter("llm_tokens_total", "LLM tokens per call site", ("site", "kind"))
+llm_errors = registry.counter("llm_errors_total", "Failed LLM calls per call site", ("site",))
+
+checkpoint_bytes = registry.counter(
+    "checkpoint_bytes_written_total", "Serialized checkpoint bytes written"
+)
+checkpoint_value_bytes = registry.histogram(
+    "checkpoint_value_bytes", "Size of each serialized checkpoint value", buckets=BYTE_BUCKETS
+)
+
+# store name -> function returning its live session count, or None if it cannot tell
+session_sources: dict[str, Callable[[], Optional[int]]] = {}
+
+
+def track_sessions(store: str, live_count: Callable[[], Optional[int]]) -> None:
+    """Report a session store's live count in the active_sessions gauge."""
+    session_sources[store] = live_count
+
+
+def _active_sessions() -> dict:
+    counts = {(store,): live_count() for store, live_count in session_sources.items()}
+    return {labels: count for labels, count in counts.items() if count is not None}
+
+
+active_sessions = registry.gauge(
+    "active_sessions", "Live sessions per store", ("store",), callback=_active_sessions
+)
+
+
+class MeteredSerializer:
+    """Wraps a checkpoint serializer and records the size of everything it writes."""
+
+    def __init__(self, inner) -> None:
+        self.inner = inner
+
+    def dumps_typed(self, obj):
+        typed = self.inner.dumps_typed(obj)
+        checkpoint_bytes.inc(len(typed[1]))
+        checkpoint_value_bytes.observe(len(typed[1]))
+        return typed
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+def _token_usage(response) -> tuple[int, int]:
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    prompt = completion = 0
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            prompt += metadata.get("input_tokens", 0)
+            completion += metadata.get("output_tokens", 0)
+    return prompt, completion
+
+
+class GraphMetricsHandler(BaseCallbackHandler):
+    """
+    Times top-level graph nodes and LLM calls from LangChain callbacks.
+
+    Runs inline so timings are not skewed by an executor hop and spans see the
+    request's context.
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        # run_id -> (metric label, start time, span)
+        self.nodes: dict = {}
+        self.llm_calls: dict = {}
+        # run_id -> parent run_id for open chain runs, to find the node an LLM call runs in
+        self.parents: dict = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None,
+                       tags=None, metadata=None, **kwargs) -> None:
+        metadata = metadata or {}
+        name = kwargs.get("name")
+        # Top-level nodes: the run named after its node, outside any subgraph namespace
+        if name != metadata.get("langgraph_node") or metadata.get("checkpoint_ns") or name == "__start__":
+            self.parents[run_id] = parent_run_id
+            return
+        span = start_span(f"node {name}", node=name, thread_id=metadata.get("thread_id"))
+        self.nodes[run_id] = (name, time.perf_counter(), span)
+
+    def _node_span(self, run_id):
+        while run_id is not None:
+            if run_id in self.nodes:
+                return self.nodes[run_id][2]
+            run_id = self.parents.get(run_id)
+        return None
+
+    def _end_node(self, run_id, error: Optional[BaseException] = None) -> None:
+        self.parents.pop(run_id, None)
+        entry = self.nodes.pop(run_id, None)
+        if entry is None:
+            return
+        name, started, span = entry
+        node_duration.observe(time.perf_counter() - started, name)
+        if isinstance(error, GraphInterrupt):
+            node_interrupts.inc(1, name)
+            if span is not None:
+                span.set(interrupted=True)
+            error = None
+        elif error is not None:
+            node_errors.inc(1, name)
+        if span is not None:
+            span.finish(error)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        self._end_node(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        self._end_node(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs) -> None:
+        self.parents[run_id] = parent_run_id
+
+    def on_tool_end(self, output, *, run_id, **kwargs) -> None:
+        self.parents.pop(run_id, None)
+
+    def on_tool_error(self, error, *, run_id, **kwargs) -> None:
+        self.parents.pop(run_id, None)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None,
+                            metadata=None, **kwargs) -> None:
+        metadata = metadata or {}
+        site = metadata.get("call_site") or metadata.get("langgraph_node") or "unknown"
+        span = start_span(f"llm {site}", self._node_span(parent_run_id), site=site)
+        self.llm_calls[run_id] = (site, time.perf_counter(), span)
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        entry = self.llm_calls.pop(run_id, None)
+        if entry is None:
+            return
+        site, started, span = entry
+        llm_requests.inc(1, site)
+        llm_duration.observe(time.perf_counter() - started, site)
+        prompt_tokens, completion_tokens = _token_usage(response)
+        llm_tokens.inc(prompt_tokens, site, "prompt")
+        llm_tokens.inc(completion_tokens, site, "completion")
+        if span is not None:
+            span.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+            span.finish()
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        entry = self.llm_calls.pop(run_id, None)
+        if entry is None:
+            return
+        site, started, span = entry
+        llm_requests.inc(1, site)
+        llm_errors.inc(1, site)
+        llm_duration.observe(time.perf_counter() - started, site)
+        if span is not None:
+            span.finish(error)
+
+
+class MetricsMiddleware:
+    """ASGI middleware: request count, latency and in-flight gauge per route template."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        http_in_flight.inc(1)
+        span = start_span(f"{scope['method']} {scope['path']}", method=scope["method"])
+        token = current_span.set(span) if span is not None else None
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.inc(-1)
+            # The matched route's template keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_requests.inc(1, scope["method"], route, status["code"])
+            http_request_duration.observe(elapsed, scope["method"], route)
+            if span is not None:
+                current_span.reset(token)
+                span.set(route=route, status=status["code"])
+                span.finish()
@@ -1,19 +1,75 @@
 import os
+from typing import Optional
+
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 
+from .llm_cache import CallSiteCache, TieredLLMCache
+from .model_providers import RecordingChatModel, ReplayChatModel, ScriptedChatModel
+
 load_dotenv()
 
 api_key = os.getenv("OPENAI_API_KEY")
 model_name = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
 temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
 
-model = ChatOpenAI(
-    temperature=temperature,
-    model_name=model_name,
-    api_key=api_key
+# "openai" (default), "record" (OpenAI, saving every response to MODEL_CASSETTE),
+# "replay" (serve MODEL_CASSETTE offline) or "fake" (scripted, deterministic)
+MODEL_PROVIDER = os.getenv("MODEL_PROVIDER", "openai").lower()
+MODEL_CASSETTE = os.getenv("MODEL_CASSETTE", "model_cassette.jsonl")
+# Synthetic latency for replay/fake: none, fixed:S, uniform:LOW,HIGH or lognormal:MU,SIGMA
+MODEL_LATENCY = os.getenv("MODEL_LATENCY", "none")
+
+
+def build_model():
+    if MODEL_PROVIDER == "fake":
+        return ScriptedChatModel(latency=MODEL_LATENCY)
+    if MODEL_PROVIDER == "replay":
+        return ReplayChatModel(
+            cassette_path=MODEL_CASSETTE,
+            latency=MODEL_LATENCY,
+            seed=int(os.getenv("MODEL_LATENCY_SEED", "0")),
+        )
+
+    openai_model = ChatOpenAI(
+        temperature=temperature,
+        model_name=model_name,
+        api_key=api_key
+    )
+    if MODEL_PROVIDER == "record":
+        return RecordingChatModel(inner=openai_model, cassette_path=MODEL_CASSETTE)
+    return openai_model
+
+
+model = build_model()
+
+# Response cache for call sites that opt in through cached_model(); agents stay uncached.
+# LLM_CACHE_DISABLE takes a comma-separated list of call sites to opt out again.
+LLM_CACHE = os.getenv("LLM_CACHE", "true").lower() == "true"
+LLM_CACHE_DISABLE = {site.strip() for site in os.getenv("LLM_CACHE_DISABLE", "").split(",") if site.strip()}
+llm_cache = TieredLLMCache(
+    os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite") or None,
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")),
 )
 
+
+def model_for(site: str):
+    """`model` tagged with its call site, which metrics and traces are labelled by."""
+    return model.model_copy(update={"metadata": {**(model.metadata or {}), "call_site": site}})
+
+
+def cached_model(site: str, ttl: Optional[float] = None):
+    """
+    `model_for(site)` with an exact-match response cache for that call site.
+
+    Identical prompts (same model name, temperature and text) are answered from the
+    cache until `ttl` seconds have passed, or forever when ttl is None.
+    """
+    site_model = model_for(site)
+    if not LLM_CACHE or site in LLM_CACHE_DISABLE:
+        return site_model
+    return site_model.model_copy(update={"cache": CallSiteCache(llm_cache, site, ttl)})
+
 # from langchain_groq import ChatGroq
 # from dotenv import load_dotenv, find_dotenv
 # load_dotenv()
@@ -0,0 +1,259 @@
+"""
+Chat models for running the graph without OpenAI.
+
+- `ScriptedChatModel` answers deterministically: the supervisor hands off by keyword,
+  react agents call their tool once (with placeholders for required arguments) and
+  then report its result, and the word game prompts get well-formed answers.
+- `RecordingChatModel` wraps a real model and appends every prompt/response pair
+  to a JSONL cassette.
+- `ReplayChatModel` serves responses from a cassette, after a synthetic latency.
+
+All three are plain BaseChatModels, so tool binding, caching and streaming behave as
+with ChatOpenAI.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+
+class LatencyModel:
+    """
+    Synthetic response latency, parsed from a spec string:
+    "none", "fixed:SECONDS", "uniform:LOW,HIGH" or "lognormal:MU,SIGMA".
+    """
+
+    def __init__(self, spec: str = "none", seed: Optional[int] = None) -> None:
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind or "none"
+        self.args = [float(arg) for arg in args.split(",") if arg]
+        self.rng = random.Random(seed)
+        if self.kind not in ("none", "fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency spec: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.args[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(*self.args)
+        if self.kind == "lognormal":
+            return self.rng.lognormvariate(*self.args)
+        return 0.0
+
+
+def _tool_names(kwargs: dict) -> list[str]:
+    return [tool["function"]["name"] for tool in kwargs.get("tools") or []]
+
+
+# Placeholder argument per JSON schema type, for scripted calls to tools with required args
+_PLACEHOLDER_ARGS = {"object": {}, "array": [], "string": "", "integer": 0, "number": 0, "boolean": False}
+
+
+def _placeholder_args(kwargs: dict, name: str) -> dict:
+    """Arguments that pass validation for the bound tool `name`: a placeholder per required field."""
+    for tool in kwargs.get("tools") or []:
+        if tool["function"]["name"] == name:
+            schema = tool["function"].get("parameters") or {}
+            properties = schema.get("properties", {})
+            return {
+                field: _PLACEHOLDER_ARGS.get(properties.get(field, {}).get("type"))
+                for field in schema.get("required", ())
+            }
+    return {}
+
+
+def prompt_key(messages: list[BaseMessage], kwargs: dict) -> str:
+    """Stable key for a prompt: message roles, text and tool calls plus the bound tool names."""
+    parts = []
+    for message in messages:
+        parts.append([
+            message.type,
+            message.content,
+            [(call["name"], call["args"], call["id"]) for call in getattr(message, "tool_calls", [])],
+            getattr(message, "tool_call_id", None),
+        ])
+    payload = json.dumps([parts, _tool_names(kwargs)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _ToolBindingMixin:
+    """bind_tools() that works for any BaseChatModel: tools reach _generate as OpenAI schemas."""
+
+    def bind_tools(
+        self, tools, *, tool_choice=None, parallel_tool_calls: Optional[bool] = None, **kwargs
+    ):
+        kwargs["tools"] = [convert_to_openai_tool(tool) for tool in tools]
+        if tool_choice is not None:
+            kwargs["tool_choice"] = tool_choice
+        if parallel_tool_calls is not None:
+            kwargs["parallel_tool_calls"] = parallel_tool_calls
+        return self.bind(**kwargs)
+
+
+# Keyword in the latest user message -> agent the scripted supervisor hands off to
+SCRIPTED_HANDOFFS = (
+    ("word", "word"),
+    ("number", "number"),
+    ("guess", "number"),
+    ("end", "end"),
+    ("quit", "end"),
+    ("stop", "end"),
+)
+
+
+class ScriptedChatModel(_ToolBindingMixin, BaseChatModel):
+    """Deterministic stand-in for the supervisor, the react agents and the word game prompts."""
+
+    latency: str = "none"
+    _latency: LatencyModel = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._latency = LatencyModel(self.latency, seed=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @staticmethod
+    def _last_human_text(messages: list[BaseMessage]) -> str:
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                return str(message.content).lower()
+        return ""
+
+    def _respond(self, messages: list[BaseMessage], kwargs: dict) -> AIMessage:
+        tools = _tool_names(kwargs)
+        last = messages[-1] if messages else HumanMessage("")
+        call_id = "call_" + prompt_key(messages, kwargs)[:16]
+
+        if tools:
+            # After any tool result (a game finishing or a handoff back), wrap up with text
+            if isinstance(last, ToolMessage):
+                return AIMessage(content=str(last.content))
+            handoffs = [name for name in tools if name.startswith("transfer_to_")]
+            if handoffs:
+                text = self._last_human_text(messages)
+                for keyword, agent in SCRIPTED_HANDOFFS:
+                    name = next((h for h in handoffs if agent in h), None)
+                    if keyword in text and name:
+                        return AIMessage(
+                            content="", tool_calls=[{"name": name, "args": {}, "id": call_id}]
+                        )
+                return AIMessage(content="Would you like to play the number game or the word game?")
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": tools[0], "args": _placeholder_args(kwargs, tools[0]), "id": call_id}],
+            )
+
+        prompt = str(last.content)
+        if match := re.search(r"QUESTION: (.+)", prompt):
+            return AIMessage(content=match.group(1).strip())
+        if match := re.search(r"AVAILABLE WORDS: ([^,\n]+)", prompt):
+            word = match.group(1).strip()
+            return AIMessage(content=f"Based on your answers, I think your word is {word}")
+        return AIMessage(content="OK")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._latency.sample())
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._latency.sample())
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs))])
+
+
+class RecordingChatModel(_ToolBindingMixin, BaseChatModel):
+    """Calls `inner` and appends each (prompt key, response) pair to a JSONL cassette."""
+
+    inner: BaseChatModel
+    cassette_path: str = "model_cassette.jsonl"
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return f"recording-{self.inner._llm_type}"
+
+    def _record(self, messages, kwargs, result: ChatResult) -> ChatResult:
+        entry = {
+            "key": prompt_key(messages, kwargs),
+            "tools": _tool_names(kwargs),
+            "prompt": str(messages[-1].content)[:200] if messages else "",
+            "response": message_to_dict(result.generations[0].message),
+        }
+        with self._lock, open(self.cassette_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return result
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return self._record(messages, kwargs, self.inner._generate(messages, stop=stop, **kwargs))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        result = await self.inner._agenerate(messages, stop=stop, **kwargs)
+        return self._record(messages, kwargs, result)
+
+
+class ReplayChatModel(_ToolBindingMixin, BaseChatModel):
+    """
+    Serves recorded responses after a synthetic latency. Prompts missing from the
+    cassette go to `ScriptedChatModel` (counted in `misses`) unless `strict` is set.
+    """
+
+    cassette_path: str = "model_cassette.jsonl"
+    latency: str = "none"
+    seed: Optional[int] = None
+    strict: bool = False
+    hits: int = 0
+    misses: int = 0
+    _responses: dict = PrivateAttr(default_factory=dict)
+    _latency: LatencyModel = PrivateAttr()
+    _fallback: ScriptedChatModel = PrivateAttr(default_factory=ScriptedChatModel)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._latency = LatencyModel(self.latency, seed=self.seed)
+        with open(self.cassette_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._responses.setdefault(entry["key"], entry["response"])
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _lookup(self, messages, kwargs) -> ChatResult:
+        recorded = self._responses.get(prompt_key(messages, kwargs))
+        if recorded is None:
+            if self.strict:
+                raise KeyError("Prompt not found in the model cassette")
+            self.misses += 1
+            message = self._fallback._respond(messages, kwargs)
+        else:
+            self.hits += 1
+            message = messages_from_dict([recorded])[0]
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._latency.sample())
+        return self._lookup(messages, kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._latency.sample())
+        return self._lookup(messages, kwargs)
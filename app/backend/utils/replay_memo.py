@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+from collections import Counter, OrderedDict
+
+from langgraph.config import get_config
+
+from ..shared_state.base import SharedStateBackend, get_shared_backend
+
+
+class ReplayMemo:
+    """
+    Remembers results of expensive calls (LLM requests) made inside interruptible tools.
+
+    LangGraph re-runs an interrupted tool from the top on every resume. Wrapping a call
+    with `call()` makes it execute once per (thread, tool call, step); later replays
+    get the stored result back. `executed()` reports how many real calls each step made.
+
+    Entries are grouped per thread, so `forget()` is one pop; the least recently
+    used threads are dropped above `max_threads`.
+    """
+
+    def __init__(self, max_threads: int = 10_000):
+        self.max_threads = max_threads
+        # thread_id -> ({(scope, step): result}, Counter of real calls per step)
+        self.threads = OrderedDict()
+        self.replays = 0
+
+    @staticmethod
+    def _thread_id() -> str:
+        return get_config()["configurable"]["thread_id"]
+
+    def _thread(self, thread_id: str) -> tuple[dict, Counter]:
+        memo = self.threads.get(thread_id)
+        if memo is None:
+            memo = self.threads[thread_id] = ({}, Counter())
+            while len(self.threads) > self.max_threads:
+                self.threads.popitem(last=False)
+        else:
+            self.threads.move_to_end(thread_id)
+        return memo
+
+    async def call(self, scope: str, step: str, fn, *args, **kwargs):
+        results, executions = self._thread(self._thread_id())
+        if (scope, step) in results:
+            self.replays += 1
+            return results[(scope, step)]
+
+        value = await fn(*args, **kwargs)
+        results[(scope, step)] = value
+        executions[step] += 1
+        return value
+
+    async def executed(self, thread_id: str) -> dict:
+        memo = self.threads.get(thread_id)
+        return dict(memo[1]) if memo else {}
+
+    async def forget(self, thread_id: str) -> None:
+        self.threads.pop(thread_id, None)
+
+
+class SharedReplayMemo(ReplayMemo):
+    """
+    `ReplayMemo` on a `SharedStateBackend`, so a resume served by another worker, or
+    after a restart, still replays instead of calling the model again.
+
+    Each thread is one hash holding results (JSON) and per-step call counts; it
+    expires `ttl_seconds` after the last call, like the thread's checkpoints.
+    Backend round trips run in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, backend: SharedStateBackend, *, ttl_seconds: float = 24 * 60 * 60):
+        super().__init__()
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(thread_id: str) -> str:
+        return f"replay_memo:{thread_id}"
+
+    async def call(self, scope: str, step: str, fn, *args, **kwargs):
+        key = self._key(self._thread_id())
+        result_field, count_field = f"result\x1f{scope}\x1f{step}", f"executed\x1f{step}"
+        stored, count = await asyncio.to_thread(self.backend.hmget, key, [result_field, count_field])
+        if stored is not None:
+            self.replays += 1
+            return json.loads(stored)
+
+        value = await fn(*args, **kwargs)
+        await asyncio.to_thread(self.backend.hset, key, {
+            result_field: json.dumps(value).encode(),
+            count_field: str(int(count or 0) + 1).encode(),
+        }, self.ttl_seconds)
+        return value
+
+    async def executed(self, thread_id: str) -> dict:
+        fields = await asyncio.to_thread(self.backend.hgetall, self._key(thread_id))
+        return {
+            field.split("\x1f", 1)[1]: int(value)
+            for field, value in fields.items()
+            if field.startswith("executed\x1f")
+        }
+
+    async def forget(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.backend.delete, self._key(thread_id))
+
+
+def build_replay_memo() -> ReplayMemo:
+    """A SharedReplayMemo when SHARED_STATE_BACKEND is set, otherwise an in-process one."""
+    backend = get_shared_backend()
+    if backend is not None:
+        return SharedReplayMemo(backend, ttl_seconds=float(os.getenv("CHECKPOINT_TTL_SECONDS", "86400")))
+    return ReplayMemo()
+
+
+replay_memo = build_replay_memo()
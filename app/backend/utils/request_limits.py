@@ -0,0 +1,63 @@
+"""
+Cheap request checks that run before any graph or LLM work.
+
+BodySizeLimitMiddleware rejects bodies over MAX_BODY_BYTES with a 413, from the
+Content-Length header when there is one and while reading the body otherwise.
+`json_body(Model)` is a dependency that parses and validates the raw body in one
+pass with pydantic's JSON parser; invalid payloads get FastAPI's usual 422.
+"""
+import os
+from typing import Callable, Type, TypeVar
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
+
+MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", str(512 * 1024)))
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware: 413 for request bodies larger than `max_bytes`."""
+
+    def __init__(self, app, max_bytes: int = MAX_BODY_BYTES) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                response = ORJSONResponse({"detail": "Request body too large"}, status_code=413)
+                return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail="Request body too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def json_body(model: Type[Model]) -> Callable:
+    """Dependency that returns the request body validated as `model`; an empty body counts as {}."""
+
+    async def parse(request: Request) -> Model:
+        try:
+            return model.model_validate_json(await request.body() or b"{}")
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False, include_input=False)
+            ])
+
+    return parse
@@ -0,0 +1,71 @@
+"""
+Compact JSON responses for the game endpoints.
+
+Responses are typed models encoded with orjson; unset fields are left out. Every
+game response carries a `state_version` that goes up by one per turn of the
+session and a `message_count` of the thread's history. With `?delta=true&since=N`
+a graph endpoint returns only the messages from offset N on plus the pending
+interrupt, so a turn costs the same to send however long the conversation is.
+The client passes back the last `message_count` it received, so a lost or retried
+response, or a second client on the same session, never skips messages. Large
+responses are gzipped by GZipMiddleware above GZIP_MIN_BYTES.
+"""
+import os
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from ..schemas.responses import GameDelta, GameResponse
+from .session_store import SessionRecord, build_session_store
+
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+
+
+class ResponseCursor(SessionRecord):
+    __slots__ = ("version",)
+
+    def __init__(self, version: int = 0):
+        super().__init__()
+        self.version = version
+
+
+# Lives as long as the thread's checkpoints, so versions never restart mid-session
+response_cursors = build_session_store(
+    ResponseCursor,
+    "response_cursor:",
+    max_entries=int(os.getenv("RESPONSE_CURSOR_MAX_SESSIONS", "100000")),
+    ttl_seconds=float(os.getenv("CHECKPOINT_TTL_SECONDS", "86400")),
+)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> ORJSONResponse:
+    """Encode a response model directly, skipping FastAPI's re-validation of the return value."""
+    return ORJSONResponse(
+        model.model_dump(mode="json", by_alias=True, exclude_unset=True), status_code=status_code
+    )
+
+
+async def graph_response(
+    result: dict, session_id: str, delta: bool = False, since: int = 0
+) -> ORJSONResponse:
+    """
+    Response for a graph turn. In delta mode `messages` starts at offset `since`
+    of the history; which messages a client has seen is the client's to track.
+    """
+    messages = result.get("messages") or []
+    cursor = await response_cursors.aget(session_id) or ResponseCursor()
+    cursor.version += 1
+    await response_cursors.aput(session_id, cursor)
+
+    fields = {"session_id": session_id, "state_version": cursor.version, "message_count": len(messages)}
+    if delta:
+        result = {
+            key: result[key]
+            for key in ("__interrupt__", "error", "game_report", "llm_calls")
+            if key in result
+        }
+        result["messages"] = messages[since:]
+        model = GameDelta.model_validate({**result, **fields})
+    else:
+        model = GameResponse.model_validate({**result, **fields})
+    return model_response(model)
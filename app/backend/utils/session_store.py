@@ -0,0 +1,227 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from ..shared_state.base import SharedStateBackend, get_shared_backend
+
+
+class SessionRecord:
+    """Base for compact session records; subclasses declare their fields in __slots__."""
+
+    __slots__ = ("touched",)
+
+    def __init__(self):
+        self.touched = time.monotonic()
+
+    @classmethod
+    def fields(cls) -> list:
+        return [
+            name
+            for klass in reversed(cls.__mro__)
+            for name in getattr(klass, "__slots__", ())
+            if name != "touched"
+        ]
+
+    def dump(self) -> bytes:
+        return json.dumps([getattr(self, name) for name in self.fields()]).encode()
+
+    @classmethod
+    def load(cls, data: bytes) -> "SessionRecord":
+        record = cls.__new__(cls)
+        for name, value in zip(cls.fields(), json.loads(data)):
+            setattr(record, name, value)
+        record.touched = time.monotonic()
+        return record
+
+
+class SessionStore:
+    """
+    In-process session store with an idle TTL and a max-entries LRU cap.
+
+    Sessions are kept in least-recently-used order, which is also oldest-touch-first,
+    so both the LRU cap and the TTL sweep only ever pop from the front. A background
+    thread sweeps expired sessions every `sweep_interval` seconds; `get` also treats an
+    expired session as missing, so the sweep only bounds memory, not correctness.
+    Idle time is measured with `clock`, time.monotonic unless given.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 100_000,
+        ttl_seconds: Optional[float] = 30 * 60,
+        sweep_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+
+        self.lock = threading.RLock()
+        self.sessions = OrderedDict()
+        self.evicted = 0
+        self.expired = 0
+        self.completed = 0
+
+        self._closed = threading.Event()
+        if ttl_seconds is not None:
+            self._worker = threading.Thread(
+                target=self._sweep_loop, name="session-store-sweeper", daemon=True
+            )
+            self._worker.start()
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def _is_expired(self, record: SessionRecord, now: float) -> bool:
+        return self.ttl_seconds is not None and now - record.touched > self.ttl_seconds
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        """Return the session and mark it as used, or None if it is missing or expired."""
+        with self.lock:
+            record = self.sessions.get(session_id)
+            if record is None:
+                return None
+            now = self.clock()
+            if self._is_expired(record, now):
+                del self.sessions[session_id]
+                self.expired += 1
+                return None
+            record.touched = now
+            self.sessions.move_to_end(session_id)
+            return record
+
+    def put(self, session_id: str, record: SessionRecord) -> SessionRecord:
+        with self.lock:
+            record.touched = self.clock()
+            self.sessions[session_id] = record
+            self.sessions.move_to_end(session_id)
+            while len(self.sessions) > self.max_entries:
+                self.sessions.popitem(last=False)
+                self.evicted += 1
+            return record
+
+    def delete(self, session_id: str) -> None:
+        """Drop a finished session."""
+        with self.lock:
+            if self.sessions.pop(session_id, None) is not None:
+                self.completed += 1
+
+    # In-memory and only briefly locked, so the async variants run inline
+    async def aget(self, session_id: str) -> Optional[SessionRecord]:
+        return self.get(session_id)
+
+    async def aput(self, session_id: str, record: SessionRecord) -> SessionRecord:
+        return self.put(session_id, record)
+
+    async def adelete(self, session_id: str) -> None:
+        self.delete(session_id)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Remove sessions idle for longer than ttl_seconds. Returns how many were removed."""
+        if self.ttl_seconds is None:
+            return 0
+        now = self.clock() if now is None else now
+        removed = 0
+        with self.lock:
+            while self.sessions:
+                record = next(iter(self.sessions.values()))
+                if not self._is_expired(record, now):
+                    break
+                self.sessions.popitem(last=False)
+                removed += 1
+            self.expired += removed
+        return removed
+
+    def _sweep_loop(self) -> None:
+        while not self._closed.wait(self.sweep_interval):
+            self.sweep()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "live_sessions": len(self.sessions),
+                "max_sessions": self.max_entries,
+                "evicted_sessions": self.evicted,
+                "expired_sessions": self.expired,
+                "completed_sessions": self.completed,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+class SharedSessionStore:
+    """
+    Session store on a `SharedStateBackend`, so any worker can continue any session.
+
+    Records are copies: callers must `put` a session again after changing it. Expiry
+    is left to the backend; the counters only cover this process. Async handlers
+    should use `aget`/`aput`/`adelete`, which make the round trip in a worker thread.
+    """
+
+    def __init__(
+        self,
+        backend: SharedStateBackend,
+        record_type: type,
+        *,
+        prefix: str = "session:",
+        ttl_seconds: Optional[float] = 30 * 60,
+    ) -> None:
+        self.backend = backend
+        self.record_type = record_type
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.completed = 0
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        data = self.backend.get(self.prefix + session_id)
+        return None if data is None else self.record_type.load(data)
+
+    def put(self, session_id: str, record: SessionRecord) -> SessionRecord:
+        self.backend.set(self.prefix + session_id, record.dump(), self.ttl_seconds)
+        return record
+
+    def delete(self, session_id: str) -> None:
+        self.backend.delete(self.prefix + session_id)
+        self.completed += 1
+
+    async def aget(self, session_id: str) -> Optional[SessionRecord]:
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def aput(self, session_id: str, record: SessionRecord) -> SessionRecord:
+        return await asyncio.to_thread(self.put, session_id, record)
+
+    async def adelete(self, session_id: str) -> None:
+        await asyncio.to_thread(self.delete, session_id)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "completed_sessions": self.completed,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def close(self) -> None:
+        pass
+
+
+def build_session_store(
+    record_type: type, prefix: str, *, max_entries: int, ttl_seconds: Optional[float]
+):
+    """A SharedSessionStore when SHARED_STATE_BACKEND is set, otherwise an in-process SessionStore."""
+    backend = get_shared_backend()
+    if backend is not None:
+        return SharedSessionStore(backend, record_type, prefix=prefix, ttl_seconds=ttl_seconds)
+    return SessionStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage
+
+from app.backend.tools.word_game_tools import pop_game_report
+from app.backend.utils.log import get_logger
+from app.backend.utils.replay_memo import replay_memo
+
+log = get_logger(__name__)
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def flush_checkpoints(graph) -> None:
+    """Commit grouped checkpoint writes so the next request can be served by any worker."""
+    flush = getattr(graph.checkpointer, "flush", None)
+    if flush is not None:
+        flush()
+
+
+async def finish_game(graph, session_id: str, complete: bool = False) -> dict:
+    """
+    Drop per-game state once a run ends without an interrupt, and return the
+    fields the final response reports about the game. With `complete` the
+    thread's checkpoints are also marked for early cleanup.
+    """
+    finished = {"llm_calls": await replay_memo.executed(session_id)}
+    await replay_memo.forget(session_id)
+    if report := pop_game_report(session_id):
+        checkpoint_writes = await asyncio.to_thread(graph.checkpointer.checkpoint_writes, session_id)
+        finished["game_report"] = {**report, "checkpoint_writes": checkpoint_writes}
+    if complete:
+        await asyncio.to_thread(graph.checkpointer.mark_completed, session_id)
+    return finished
+
+
+async def stream_graph_events(graph, graph_input, config, session_id: str, complete: bool = False):
+    """
+    Run the graph and yield SSE frames as soon as things happen:
+    node_start / node_end for every task, token for LLM output and interrupt
+    when the run pauses for the user. A final `end` frame closes the stream,
+    carrying `finish_game`'s fields when the run ended without an interrupt.
+    """
+    interrupted = False
+    try:
+        async for namespace, mode, chunk in graph.astream(
+            graph_input,
+            config,
+            stream_mode=["debug", "messages", "updates"],
+            subgraphs=True,
+        ):
+            if mode == "debug" and chunk["type"] in ("task", "task_result"):
+                yield sse_event(
+                    "node_start" if chunk["type"] == "task" else "node_end",
+                    {
+                        "node": chunk["payload"]["name"],
+                        "namespace": list(namespace),
+                        "step": chunk["step"],
+                    },
+                )
+            elif mode == "messages":
+                message, metadata = chunk
+                if isinstance(message, AIMessage) and message.content:
+                    yield sse_event(
+                        "token",
+                        {"content": message.content, "node": metadata.get("langgraph_node")},
+                    )
+            elif mode == "updates" and not namespace and "__interrupt__" in chunk:
+                interrupted = True
+                for pending in chunk["__interrupt__"]:
+                    yield sse_event("interrupt", {"value": pending.value, "session_id": session_id})
+
+        flush_checkpoints(graph)
+        finished = {} if interrupted else await finish_game(graph, session_id, complete)
+        yield sse_event("end", {"session_id": session_id, **finished})
+
+    except Exception as e:
+        log.exception("stream_failed", session_id=session_id, error=str(e))
+        yield sse_event("error", {"error": str(e), "session_id": session_id})
+
+
+async def run_graph_turn(graph, graph_input, config):
+    """
+    Run the graph to its next pause and return (result, nodes_ran).
+
+    The result matches what ainvoke returns, including `__interrupt__` while the
+    game waits for input; nodes_ran lists the top-level nodes executed this turn.
+    """
+    result, interrupts, nodes_ran = {}, [], []
+    async for mode, chunk in graph.astream(
+        graph_input, config, stream_mode=["values", "updates", "debug"]
+    ):
+        if mode == "values" and "__interrupt__" not in chunk:
+            # On a pause the last values chunk carries only the interrupt
+            result = chunk
+        elif mode == "updates" and "__interrupt__" in chunk:
+            interrupts.extend(chunk["__interrupt__"])
+        elif mode == "debug" and chunk["type"] == "task":
+            nodes_ran.append(chunk["payload"]["name"])
+
+    flush_checkpoints(graph)
+    result = dict(result)
+    if interrupts:
+        result["__interrupt__"] = interrupts
+    return result, nodes_ran
+
+
+async def has_pending_interrupt(graph, config) -> bool:
+    snapshot = await graph.aget_state(config)
+    return any(task.interrupts for task in snapshot.tasks)
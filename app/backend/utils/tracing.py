@@ -0,0 +1,141 @@
+"""
+Minimal OpenTelemetry-style spans with pluggable local exporters.
+
+    with span("word_game.resume", session_id=session_id):
+        ...
+
+Spans nest through a context variable and carry trace/span ids, timing, attributes
+and a status. Nothing leaves the process: TRACE_EXPORTER picks where finished
+spans go.
+
+    none    (default) spans are not recorded; span() is a cheap no-op
+    memory  the last TRACE_BUFFER_SIZE spans, served at /api/traces
+    jsonl   appended to TRACE_PATH, one span per line, for a local collector to tail
+"""
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "end", "attributes", "status")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, **attributes) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.end = None
+        self.attributes = attributes
+        self.status = "ok"
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.end = time.time()
+        if error is not None:
+            self.status = "error"
+            self.attributes["error"] = f"{type(error).__name__}: {error}"
+        exporter.export(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": None if self.end is None else round((self.end - self.start) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class NoopExporter:
+    enabled = False
+
+    def export(self, span: Span) -> None:
+        pass
+
+    def recent(self, limit: int = 100) -> list:
+        return []
+
+
+class MemoryExporter:
+    """Keeps the most recent spans in a ring buffer."""
+
+    enabled = True
+
+    def __init__(self, max_spans: int = 1000) -> None:
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def recent(self, limit: int = 100) -> list:
+        return [span.to_dict() for span in list(self.spans)[-limit:]]
+
+
+class JsonlExporter(MemoryExporter):
+    """Appends every span to a JSONL file and keeps the recent ones in memory too."""
+
+    def __init__(self, path: str, max_spans: int = 1000) -> None:
+        super().__init__(max_spans)
+        self.path = path
+        self.lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        super().export(span)
+        line = json.dumps(span.to_dict(), default=str)
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def build_exporter():
+    kind = os.getenv("TRACE_EXPORTER", "none").lower()
+    max_spans = int(os.getenv("TRACE_BUFFER_SIZE", "1000"))
+    if kind == "memory":
+        return MemoryExporter(max_spans)
+    if kind == "jsonl":
+        return JsonlExporter(os.getenv("TRACE_PATH", "traces.jsonl"), max_spans)
+    if kind != "none":
+        raise ValueError(f"Unknown TRACE_EXPORTER: {kind}")
+    return NoopExporter()
+
+
+exporter = build_exporter()
+
+
+def start_span(name: str, parent: Optional[Span] = None, **attributes) -> Optional[Span]:
+    """Open a span without making it current; the caller must finish() it. None when tracing is off."""
+    if not exporter.enabled:
+        return None
+    return Span(name, parent or current_span.get(), **attributes)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Record the enclosed block as a span, nested under the current one."""
+    if not exporter.enabled:
+        yield None
+        return
+    opened = Span(name, current_span.get(), **attributes)
+    token = current_span.set(opened)
+    try:
+        yield opened
+    except BaseException as e:
+        current_span.reset(token)
+        opened.finish(e)
+        raise
+    current_span.reset(token)
+    opened.finish()
@@ -586,11 +586,11 @@ def render_game_selection():
         st.markdown("""
         <div class="game-selector">
             <h3>🔢 Number Guessing Game</h3>
-            <p>Think of a number between 1-50, and I'll try to guess it using smart questioning!</p>
+            <p>Think of a number, and I'll try to guess it using smart questioning!</p>
             <ul style="font-size: 0.9rem;">
                 <li>AI-powered binary search algorithm</li>
-                <li>Interactive yes/no questioning</li>
-                <li>Maximum 6 questions to guess</li>
+                <li>One yes/higher/lower answer per guess</li>
+                <li>Maximum 6 questions for 1-50</li>
             </ul>
         </div>
         """, unsafe_allow_html=True)
@@ -605,13 +605,13 @@ def render_game_selection():
         st.markdown("""
         <div class="game-selector">
             <h3>🔤 Word Guessing Game</h3>
-            <p>Choose a word from the available list, and I'll guess it through 5 strategic questions!</p>
+            <p>Choose a word from the available list, and I'll guess it through a few strategic questions!</p>
             <p><strong>Available words:</strong><br>
             <code>apple, kiwi, desk, chair, car, pen</code></p>
             <ul style="font-size: 0.9rem;">
-                <li>LLM-generated intelligent questions</li>
+                <li>Information-gain question planner</li>
                 <li>Interactive yes/no/maybe questioning</li>
-                <li>Exactly 5 questions before final guess</li>
+                <li>Stops asking as soon as it is confident</li>
             </ul>
         </div>
         """, unsafe_allow_html=True)
@@ -725,6 +725,12 @@ def render_conversation():
                     options=["", "ready"],
                     key="ready_select"
                 )
+            elif 'yes/higher/lower' in question_lower or 'yes, higher or lower' in question_lower:
+                response_choice = st.selectbox(
+                    "Select your answer:",
+                    options=["", "yes", "higher", "lower"],
+                    key="ternary_select"
+                )
             elif 'higher or lower' in question_lower or 'higher or lower than' in question_lower:
                 response_choice = st.selectbox(
                     "Select your answer:",
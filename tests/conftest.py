@@ -0,0 +1,8 @@
+import os
+
+# The app reads its settings at import time: play against the scripted model with
+# process-local state, and never touch the on-disk caches of a development checkout.
+os.environ.setdefault("MODEL_PROVIDER", "fake")
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+os.environ.setdefault("LLM_CACHE_PATH", "")
+os.environ.setdefault("SHARED_STATE_BACKEND", "")
@@ -0,0 +1,83 @@
+from langgraph.checkpoint.base import empty_checkpoint
+
+from app.backend.checkpointers.bounded_memory_saver import BoundedMemorySaver
+
+
+def put_checkpoint(saver, thread_id: str, payload: str = "x" * 1000) -> dict:
+    """Write a checkpoint holding one channel value, chained onto the thread's latest."""
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    latest = saver.get_tuple(config)
+    if latest is not None:
+        config = latest.config
+    checkpoint = empty_checkpoint()
+    version = saver.get_next_version(
+        latest.checkpoint["channel_versions"].get("data") if latest else None, None
+    )
+    checkpoint["channel_values"] = {"data": payload}
+    checkpoint["channel_versions"] = {"data": version}
+    return saver.put(config, checkpoint, {}, {"data": version})
+
+
+def one_thread_bytes() -> int:
+    saver = BoundedMemorySaver()
+    put_checkpoint(saver, "probe")
+    return saver.thread_bytes("probe")
+
+
+def test_bytes_are_accounted_per_thread():
+    saver = BoundedMemorySaver()
+    for thread_id in ("t1", "t2"):
+        put_checkpoint(saver, thread_id)
+    put_checkpoint(saver, "t1")
+
+    assert saver.thread_bytes("t1") > saver.thread_bytes("t2") > 1000
+    assert saver.stats()["bytes"] == saver.thread_bytes("t1") + saver.thread_bytes("t2")
+
+    saver.delete_thread("t1")
+    assert saver.thread_bytes("t1") == 0
+    assert saver.stats()["bytes"] == saver.thread_bytes("t2")
+
+
+def test_pruning_keeps_the_latest_checkpoints():
+    saver = BoundedMemorySaver(keep_latest=2)
+    for turn in range(5):
+        put_checkpoint(saver, "t1", payload=f"turn {turn}".ljust(1000))
+
+    config = {"configurable": {"thread_id": "t1"}}
+    assert [t.checkpoint["channel_values"]["data"].strip() for t in saver.list(config)] == [
+        "turn 4",
+        "turn 3",
+    ]
+    assert saver.get_tuple(config).checkpoint["channel_values"]["data"].strip() == "turn 4"
+    # Blobs only the pruned checkpoints referenced are released too
+    assert 2000 < saver.thread_bytes("t1") < 3000
+    assert saver.checkpoint_writes("t1") == 5
+
+
+def test_completed_threads_are_evicted_first_then_least_recently_used():
+    saver = BoundedMemorySaver(max_bytes=int(one_thread_bytes() * 3.5))
+    for thread_id in ("t1", "t2", "t3"):
+        put_checkpoint(saver, thread_id)
+    saver.mark_completed("t2")
+    saver.get_tuple({"configurable": {"thread_id": "t1"}})
+    victims_bytes = saver.thread_bytes("t2") + saver.thread_bytes("t3")
+
+    put_checkpoint(saver, "t4")
+    assert list(saver.threads) == ["t3", "t1", "t4"]
+
+    put_checkpoint(saver, "t5")
+    assert list(saver.threads) == ["t1", "t4", "t5"]
+
+    stats = saver.stats()
+    assert stats["evictions"] == 2
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert stats["evicted_bytes"] == victims_bytes
+
+
+def test_thread_being_written_is_never_evicted():
+    saver = BoundedMemorySaver(max_bytes=one_thread_bytes() // 2)
+    put_checkpoint(saver, "t1")
+    put_checkpoint(saver, "t2")
+
+    assert list(saver.threads) == ["t2"]
+    assert saver.get_tuple({"configurable": {"thread_id": "t2"}}) is not None
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Any, Dict, List, Optional, TypedDict
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, StateGraph
+
+from app.backend.checkpointers.bounded_memory_saver import BoundedMemorySaver
+from app.backend.nodes import number_game
+from app.backend.schemas.game_state import GameState
+
+
+class FullState(TypedDict, total=False):
+    """GameState's keys without reducers: every write replaces the whole value."""
+
+    route_to: str
+    number_game_count: int
+    word_game_count: int
+    messages: List[Dict[str, Any]]
+    current_game: Optional[str]
+    session_id: Optional[str]
+    user_input: Optional[str]
+    game_status: Optional[str]
+    min_val: Optional[int]
+    max_val: Optional[int]
+    guess_history: Optional[List[str]]
+    asked_questions: Optional[List[str]]
+
+
+class FinishedGameAgent:
+    """Stands in for the react agent: answers once and the game is over."""
+
+    async def ainvoke(self, state):
+        return {"messages": [*state["messages"], AIMessage("I guessed it, thanks for playing!")]}
+
+
+async def full_state_node(state):
+    # What game nodes did before per-field reducers: echo the state with the changes applied
+    result = await number_game.number_game_node(state)
+    return {
+        **state,
+        "messages": state["messages"] + result["messages"],
+        "number_game_count": state.get("number_game_count", 0) + result["number_game_count"],
+    }
+
+
+def bytes_per_superstep(state_type, node) -> int:
+    builder = StateGraph(state_type)
+    builder.add_node("number_game", node)
+    builder.set_entry_point("number_game")
+    builder.add_edge("number_game", END)
+    saver = BoundedMemorySaver(keep_latest=1000)
+    graph = builder.compile(checkpointer=saver)
+
+    config = {"configurable": {"thread_id": "t1"}}
+    state = {
+        "route_to": "number_game",
+        "number_game_count": 0,
+        "word_game_count": 0,
+        "messages": [{"role": "user", "content": f"message {i}", "id": str(i)} for i in range(30)],
+        "current_game": "number_game",
+        "session_id": "t1",
+        "user_input": "ready",
+        "game_status": "playing",
+        "min_val": 1,
+        "max_val": 50,
+        "guess_history": [str(i) for i in range(20)],
+        "asked_questions": [f"question {i}" for i in range(20)],
+    }
+    asyncio.run(graph.ainvoke(state, config))
+    before = saver.thread_bytes("t1")
+    # Input step plus one game node step
+    asyncio.run(graph.ainvoke({"user_input": "again"}, config))
+    return (saver.thread_bytes("t1") - before) // 2
+
+
+def test_game_node_delta_writes_fewer_checkpoint_bytes(monkeypatch):
+    monkeypatch.setattr(number_game, "number_game_agent", FinishedGameAgent())
+    delta = bytes_per_superstep(GameState, number_game.number_game_node)
+    full = bytes_per_superstep(FullState, full_state_node)
+    assert delta < full * 0.8
+
+
+def test_client_counters_are_not_added_to_stored_state():
+    from app.backend.graph.graph import compiled_graph
+    from app.backend.main import app
+
+    client = TestClient(app)
+    body = {
+        "session_id": "counter-test",
+        "messages": [{"role": "user", "content": "hello there"}],
+        "number_game_count": 2,
+        "word_game_count": 1,
+    }
+    for _ in range(2):
+        assert client.post("/api/route", json=body).status_code == 200
+
+    stored = asyncio.run(compiled_graph.aget_state({"configurable": {"thread_id": "counter-test"}}))
+    assert stored.values.get("number_game_count", 0) == 0
+    assert stored.values.get("word_game_count", 0) == 0
+
+
+def test_end_game_turn_runs_under_the_fake_model():
+    from app.backend.main import app
+
+    client = TestClient(app)
+    body = {"session_id": "end-test", "messages": [{"role": "user", "content": "I'm done, end the game"}]}
+    response = client.post("/api/route", json=body)
+    assert response.status_code == 200
+
+    tool_results = [m["content"] for m in response.json()["messages"] if m["role"] == "tool"]
+    assert len(tool_results) == 1
+    assert "You played the Number Guessing Game" in tool_results[0]
+    assert "validation error" not in tool_results[0]
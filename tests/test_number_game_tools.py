@@ -0,0 +1,97 @@
+import asyncio
+import re
+from typing import TypedDict
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
+from langgraph.types import Command
+
+from app.backend.tools.number_game_tools import (
+    MAX_NUMBER,
+    MIN_NUMBER,
+    TERNARY,
+    guess_number,
+    parse_ternary_answer,
+)
+
+ternary_only = pytest.mark.skipif(not TERNARY, reason="NUMBER_GAME_TERNARY is off")
+
+
+@pytest.mark.parametrize(
+    "reply, expected",
+    [
+        ("yes", "yes"),
+        ("Y", "yes"),
+        ("Correct!", "yes"),
+        ("  higher. ", "higher"),
+        ("H", "higher"),
+        ("bigger", "higher"),
+        ("more", "higher"),
+        ("lower!", "lower"),
+        ("l", "lower"),
+        ("Smaller", "lower"),
+        ("less", "lower"),
+        # Ambiguous or unrelated replies are re-asked, never guessed at
+        ("higher or lower", None),
+        ("yes, higher", None),
+        ("no", None),
+        ("maybe", None),
+        ("h i g h e r", None),
+        ("", None),
+        ("!!", None),
+    ],
+)
+def test_parse_ternary_answer(reply, expected):
+    assert parse_ternary_answer(reply) == expected
+
+
+class State(TypedDict, total=False):
+    result: str
+
+
+async def play(state: State) -> State:
+    return {"result": await guess_number.ainvoke({})}
+
+
+def play_game(reply_to) -> tuple[str, int]:
+    """Play guess_number, answering each prompt with `reply_to(guess)`; returns (result, prompts)."""
+    builder = StateGraph(State)
+    builder.add_node("play", play)
+    builder.set_entry_point("play")
+    graph = builder.compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "game"}}
+
+    result, prompts = asyncio.run(graph.ainvoke({}, config)), 0
+    while "__interrupt__" in result:
+        prompts += 1
+        guess = int(re.findall(r"\d+", result["__interrupt__"][0].value)[-1])
+        result = asyncio.run(graph.ainvoke(Command(resume=reply_to(guess)), config))
+    return result["result"], prompts
+
+
+def answer_for(number: int):
+    return lambda guess: "yes" if guess == number else "higher" if number > guess else "lower"
+
+
+@ternary_only
+@pytest.mark.parametrize("number", [MIN_NUMBER, MIN_NUMBER + 1, MAX_NUMBER - 1, MAX_NUMBER])
+def test_guess_number_finds_the_range_bounds(number):
+    result, prompts = play_game(answer_for(number))
+    assert result == f"Great! I guessed your number: {number}"
+    assert prompts <= (MAX_NUMBER - MIN_NUMBER + 1).bit_length()
+
+
+@ternary_only
+@pytest.mark.parametrize("number", [MIN_NUMBER - 1, MAX_NUMBER + 1])
+def test_guess_number_reports_numbers_outside_the_range(number):
+    result, _ = play_game(answer_for(number))
+    assert result.startswith("Something went wrong")
+
+
+@ternary_only
+def test_guess_number_reasks_after_an_ambiguous_reply():
+    replies = iter(["higher or lower", "yes"])
+    result, prompts = play_game(lambda guess: next(replies))
+    assert result == f"Great! I guessed your number: {(MIN_NUMBER + MAX_NUMBER) // 2}"
+    assert prompts == 2
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.backend.shared_state.redis_backend import RedisStateBackend
+from app.backend.utils.session_store import SessionRecord, SessionStore, SharedSessionStore
+
+
+class Record(SessionRecord):
+    __slots__ = ("value",)
+
+    def __init__(self, value=None):
+        super().__init__()
+        self.value = value
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def store(clock, **kwargs) -> SessionStore:
+    kwargs.setdefault("sweep_interval", 3600)
+    return SessionStore(clock=clock, **kwargs)
+
+
+def test_idle_session_expires_after_ttl(clock):
+    sessions = store(clock, ttl_seconds=60)
+    sessions.put("s1", Record(1))
+
+    clock.now += 60
+    assert sessions.get("s1").value == 1
+    clock.now += 60.5
+    assert sessions.get("s1") is None
+    assert sessions.stats()["expired_sessions"] == 1
+    assert len(sessions) == 0
+
+
+def test_get_and_put_refresh_the_idle_timer(clock):
+    sessions = store(clock, ttl_seconds=60)
+    sessions.put("read", Record())
+    sessions.put("written", Record())
+    sessions.put("idle", Record())
+
+    for _ in range(3):
+        clock.now += 40
+        sessions.get("read")
+        sessions.put("written", Record())
+
+    assert sessions.get("idle") is None
+    assert sessions.get("read") is not None
+    assert sessions.get("written") is not None
+
+
+def test_sweep_removes_only_expired_sessions(clock):
+    sessions = store(clock, ttl_seconds=60)
+    sessions.put("old", Record())
+    clock.now += 30
+    sessions.put("new", Record())
+
+    clock.now += 45
+    assert sessions.sweep() == 1
+    assert list(sessions.sessions) == ["new"]
+    assert sessions.sweep(now=clock.now + 60) == 1
+    assert sessions.stats()["expired_sessions"] == 2
+
+
+def test_lru_cap_evicts_least_recently_used(clock):
+    sessions = store(clock, max_entries=3, ttl_seconds=None)
+    for session_id in ("s1", "s2", "s3"):
+        sessions.put(session_id, Record())
+    sessions.get("s1")
+
+    sessions.put("s4", Record())
+    assert list(sessions.sessions) == ["s3", "s1", "s4"]
+    sessions.put("s5", Record())
+    assert list(sessions.sessions) == ["s1", "s4", "s5"]
+    assert sessions.stats()["evicted_sessions"] == 2
+
+
+def test_delete_counts_completed_sessions(clock):
+    sessions = store(clock, ttl_seconds=None)
+    sessions.put("s1", Record())
+    sessions.delete("s1")
+    sessions.delete("s1")
+    assert "s1" not in sessions
+    assert sessions.stats()["completed_sessions"] == 1
+
+
+class RecordingBackend(RedisStateBackend):
+    """Notes which threads talk to the backend."""
+
+    def __init__(self, client):
+        super().__init__(client=client)
+        self.threads = set()
+
+    def get(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().set(*args, **kwargs)
+
+
+def test_shared_store_async_methods_run_off_the_event_loop():
+    fakeredis = pytest.importorskip("fakeredis")
+    backend = RecordingBackend(fakeredis.FakeRedis())
+    sessions = SharedSessionStore(backend, Record, prefix="test:")
+
+    async def roundtrip():
+        await sessions.aput("s1", Record(5))
+        stored = await sessions.aget("s1")
+        await sessions.adelete("s1")
+        return stored.value, await sessions.aget("s1")
+
+    assert asyncio.run(roundtrip()) == (5, None)
+    assert backend.threads and threading.get_ident() not in backend.threads
+
+
+def test_number_game_resume_is_404_after_expiry(monkeypatch, clock):
+    from app.backend.apis import number_game
+    from app.backend.main import app
+
+    monkeypatch.setattr(number_game.game_sessions, "clock", clock)
+    client = TestClient(app)
+    started = client.post("/api/number_game/play", json={"session_id": "expiring"})
+    assert started.status_code == 200
+    resume = {"session_id": "expiring", "user_input": "ready"}
+
+    clock.now += number_game.game_sessions.ttl_seconds - 1
+    assert client.post("/api/number_game/resume", json=resume).status_code == 200
+
+    clock.now += number_game.game_sessions.ttl_seconds + 1
+    expired = client.post("/api/number_game/resume", json=resume)
+    assert expired.status_code == 404
+    assert "expired" in expired.json()["error"]
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from typing import TypedDict
+
+import pytest
+from langgraph.graph import StateGraph
+from langgraph.types import Command, interrupt
+
+from app.backend.checkpointers.bounded_memory_saver import BoundedMemorySaver
+from app.backend.checkpointers.shared_saver import SharedStateSaver
+from app.backend.shared_state.redis_backend import RedisStateBackend
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class State(TypedDict, total=False):
+    answers: list
+
+
+def ask_twice(state: State) -> State:
+    return {"answers": [interrupt("first?"), interrupt("second?")]}
+
+
+def build_graph(checkpointer):
+    inner = StateGraph(State)
+    inner.add_node("ask", ask_twice)
+    inner.set_entry_point("ask")
+
+    outer = StateGraph(State)
+    # Compiled subgraph as a node, so checkpoints are written in two namespaces
+    outer.add_node("game", inner.compile())
+    outer.set_entry_point("game")
+    return outer.compile(checkpointer=checkpointer)
+
+
+async def play(graph, thread_id: str) -> dict:
+    config = {"configurable": {"thread_id": thread_id}}
+    await graph.ainvoke({"answers": []}, config)
+    await graph.ainvoke(Command(resume="a"), config)
+    return await graph.ainvoke(Command(resume="b"), config)
+
+
+class RecordingBackend(RedisStateBackend):
+    """Notes which threads talk to the backend."""
+
+    def __init__(self, client):
+        super().__init__(client=client)
+        self.threads = set()
+
+    def hset(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().hset(*args, **kwargs)
+
+    def hget(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().hget(*args, **kwargs)
+
+
+@pytest.fixture
+def redis_client():
+    client = fakeredis.FakeRedis()
+    yield client
+    client.close()
+
+
+def test_interrupted_game_resumes_from_redis(redis_client):
+    saver = SharedStateSaver(RedisStateBackend(client=redis_client))
+    result = asyncio.run(play(build_graph(saver), "t1"))
+    assert result["answers"] == ["a", "b"]
+
+    # A second saver on the same server (another worker) sees the finished thread
+    other = SharedStateSaver(RedisStateBackend(client=redis_client))
+    state = build_graph(other).get_state({"configurable": {"thread_id": "t1"}})
+    assert state.values["answers"] == ["a", "b"]
+    assert not state.next
+
+
+def test_checkpoint_writes_matches_memory_saver(redis_client):
+    saver, memory = SharedStateSaver(RedisStateBackend(client=redis_client)), BoundedMemorySaver()
+    asyncio.run(play(build_graph(saver), "t1"))
+    asyncio.run(play(build_graph(memory), "t1"))
+    assert saver.checkpoint_writes("t1") == memory.checkpoint_writes("t1") > 0
+
+
+def test_async_methods_run_off_the_event_loop(redis_client):
+    backend = RecordingBackend(redis_client)
+    asyncio.run(play(build_graph(SharedStateSaver(backend)), "t1"))
+    assert backend.threads
+    assert threading.get_ident() not in backend.threads
+
+
+def test_mark_completed_and_delete_cover_every_key(redis_client):
+    saver = SharedStateSaver(RedisStateBackend(client=redis_client), completed_ttl=30)
+    asyncio.run(play(build_graph(saver), "t1"))
+    keys = redis_client.keys("checkpoint:t1:*")
+    # Checkpoints without pending writes have no writes key, so this is a subset check
+    assert {key.decode() for key in keys} <= set(saver._thread_keys("t1"))
+
+    saver.mark_completed("t1")
+    assert all(0 < redis_client.pttl(key) <= 30_000 for key in keys)
+
+    saver.delete_thread("t1")
+    assert redis_client.keys("checkpoint:t1:*") == []
+
+
+def test_listing_across_threads_is_rejected(redis_client):
+    saver = SharedStateSaver(RedisStateBackend(client=redis_client))
+    asyncio.run(play(build_graph(saver), "t1"))
+    assert len(list(saver.list({"configurable": {"thread_id": "t1"}}))) > 0
+    with pytest.raises(ValueError, match="thread_id"):
+        list(saver.list(None))
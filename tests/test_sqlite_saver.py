@@ -0,0 +1,153 @@
+import asyncio
+import sqlite3
+import time
+from typing import TypedDict
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.graph import StateGraph
+from langgraph.types import Command, interrupt
+
+from app.backend.checkpointers.sqlite_saver import SqliteCheckpointSaver
+
+
+class State(TypedDict, total=False):
+    answers: list
+
+
+def ask_twice(state: State) -> State:
+    return {"answers": [interrupt("first?"), interrupt("second?")]}
+
+
+def build_graph(checkpointer):
+    builder = StateGraph(State)
+    builder.add_node("ask", ask_twice)
+    builder.set_entry_point("ask")
+    return builder.compile(checkpointer=checkpointer)
+
+
+def config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def stored_rows(path, thread_id: str) -> dict:
+    """Committed rows per table, as another process would see them."""
+    with sqlite3.connect(path) as conn:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table} WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+            for table in ("checkpoints", "blobs", "writes", "threads")
+        }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "checkpoints.sqlite")
+
+
+@pytest.fixture
+def saver(db_path):
+    saver = SqliteCheckpointSaver(db_path, flush_interval=60)
+    yield saver
+    saver.close()
+
+
+def test_thread_resumes_after_reopening(db_path):
+    saver = SqliteCheckpointSaver(db_path)
+    graph = build_graph(saver)
+    asyncio.run(graph.ainvoke({"answers": []}, config("t1")))
+    asyncio.run(graph.ainvoke(Command(resume="a"), config("t1")))
+    saver.close()
+
+    reopened = SqliteCheckpointSaver(db_path)
+    try:
+        result = asyncio.run(build_graph(reopened).ainvoke(Command(resume="b"), config("t1")))
+        assert result["answers"] == ["a", "b"]
+    finally:
+        reopened.close()
+
+
+def put_checkpoint(saver, thread_id: str) -> None:
+    checkpoint = empty_checkpoint()
+    saver.put({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}, checkpoint, {}, {})
+
+
+def test_writes_are_committed_in_groups(db_path):
+    saver = SqliteCheckpointSaver(db_path, batch_size=3, flush_interval=60)
+    try:
+        put_checkpoint(saver, "t1")
+        put_checkpoint(saver, "t1")
+        # Readers on other connections see nothing until the group is committed
+        assert stored_rows(db_path, "t1")["checkpoints"] == 0
+        assert saver.checkpoint_writes("t1") == 2
+
+        put_checkpoint(saver, "t1")
+        assert stored_rows(db_path, "t1")["checkpoints"] == 3
+
+        put_checkpoint(saver, "t1")
+        saver.flush()
+        assert stored_rows(db_path, "t1")["checkpoints"] == 4
+    finally:
+        saver.close()
+
+
+def test_background_flush_commits_within_the_interval(db_path):
+    saver = SqliteCheckpointSaver(db_path, batch_size=1000, flush_interval=0.01)
+    try:
+        build_graph(saver).invoke({"answers": []}, config("t1"))
+        deadline = time.monotonic() + 2
+        while stored_rows(db_path, "t1")["checkpoints"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stored_rows(db_path, "t1")["checkpoints"] > 0
+    finally:
+        saver.close()
+
+
+def test_cleanup_expired_removes_idle_threads_only(saver, db_path):
+    saver.ttl_seconds = 10
+    graph = build_graph(saver)
+    graph.invoke({"answers": []}, config("old"))
+    graph.invoke({"answers": []}, config("new"))
+    saver.conn.execute("UPDATE threads SET updated_at = updated_at - 60 WHERE thread_id = 'old'")
+
+    assert saver.cleanup_expired() == 1
+    assert saver.get_tuple(config("old")) is None
+    assert saver.get_tuple(config("new")) is not None
+    assert saver.cleanup_expired(now=time.time() + 11) == 1
+    assert saver.get_tuple(config("new")) is None
+
+
+def test_completed_thread_is_cleaned_up_despite_later_writes(saver):
+    graph = build_graph(saver)
+    graph.invoke({"answers": []}, config("done"))
+    graph.invoke({"answers": []}, config("open"))
+    saver.mark_completed("done")
+    # The final checkpoint of a finished run is written after it is marked
+    put_checkpoint(saver, "done")
+
+    assert saver.cleanup_expired() == 1
+    assert saver.get_tuple(config("done")) is None
+    assert saver.get_tuple(config("open")) is not None
+
+
+def test_old_threads_table_gains_new_columns(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE threads (thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)")
+        conn.execute("INSERT INTO threads VALUES ('t1', ?)", (time.time(),))
+
+    saver = SqliteCheckpointSaver(db_path)
+    saver.mark_completed("t1")
+    assert saver.checkpoint_writes("t1") == 0
+    assert saver.cleanup_expired() == 1
+    saver.close()
+
+
+def test_delete_thread_removes_every_row(saver, db_path):
+    graph = build_graph(saver)
+    graph.invoke({"answers": []}, config("t1"))
+    graph.invoke({"answers": []}, config("t2"))
+
+    saver.delete_thread("t1")
+    saver.flush()
+    assert stored_rows(db_path, "t1") == {"checkpoints": 0, "blobs": 0, "writes": 0, "threads": 0}
+    assert stored_rows(db_path, "t2")["checkpoints"] > 0
+    assert saver.checkpoint_writes("t1") == 0
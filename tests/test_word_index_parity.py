@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from app.backend.tools.word_game_planner import WordIndex, next_question, score_guess
+from app.backend.tools.word_index_file import MmapWordIndex, write_word_index
+
+NOISE = 0.1
+
+
+@pytest.fixture(scope="module")
+def indexes(tmp_path_factory):
+    """The same random vocabulary as a `WordIndex` and as a memory-mapped index file."""
+    rng = random.Random(7)
+    attributes = {f"attr{a}": f"Question {a}?" for a in range(12)}
+    # 150 words spans three 64-bit blocks, the last one partial
+    word_attributes = {
+        f"word{i}": {attribute for attribute in attributes if rng.random() < rng.uniform(0.1, 0.6)}
+        for i in range(150)
+    }
+    path = tmp_path_factory.mktemp("index") / "words.idx"
+    write_word_index(path, attributes, word_attributes.items())
+    return WordIndex(word_attributes, attributes.items(), word_attributes), MmapWordIndex(path)
+
+
+def random_answers(rng, attributes):
+    asked = rng.sample(attributes, rng.randint(0, 6))
+    return [(attribute, rng.choice(["yes", "no", "maybe"])) for attribute in asked]
+
+
+def by_word(index, weights):
+    return dict(index.top(weights, len(index)))
+
+
+@pytest.mark.parametrize("trial", range(25))
+def test_mmap_index_matches_word_index(indexes, trial):
+    dense, mapped = indexes
+    rng = random.Random(trial)
+    answers = random_answers(rng, dense.attributes)
+    asked = [attribute for attribute, _ in answers]
+
+    dense_weights = dense.posterior(answers, NOISE)
+    mapped_weights = mapped.posterior(answers, NOISE)
+    assert by_word(mapped, mapped_weights) == pytest.approx(by_word(dense, dense_weights))
+
+    for attribute in dense.attributes:
+        assert mapped.weighted_information_gain(mapped_weights, attribute, NOISE) == pytest.approx(
+            dense.weighted_information_gain(dense_weights, attribute, NOISE)
+        )
+
+    # Ties may break either way between float sums and popcounts, so compare gains
+    dense_pick = next_question(dense, dense.all_words, asked, dense_weights, NOISE)
+    mapped_pick = next_question(mapped, mapped.all_words, asked, mapped_weights, NOISE)
+    assert dense.weighted_information_gain(dense_weights, mapped_pick, NOISE) == pytest.approx(
+        dense.weighted_information_gain(dense_weights, dense_pick, NOISE)
+    )
+
+    dense_best, dense_confidence, _ = score_guess(dense, answers, NOISE)
+    mapped_best, mapped_confidence, _ = score_guess(mapped, answers, NOISE)
+    assert mapped_confidence == pytest.approx(dense_confidence)
+    assert by_word(dense, dense_weights)[mapped_best] == pytest.approx(dense_confidence)
+
+
+@pytest.mark.parametrize("trial", range(25))
+def test_mmap_index_narrows_like_word_index(indexes, trial):
+    dense, mapped = indexes
+    rng = random.Random(1000 + trial)
+    dense_candidates, mapped_candidates = dense.all_words, mapped.all_words
+    for attribute, answer in random_answers(rng, dense.attributes):
+        dense_candidates = dense.narrow(dense_candidates, attribute, answer)
+        mapped_candidates = mapped.narrow(mapped_candidates, attribute, answer)
+
+    assert mapped.words_in(mapped_candidates) == dense.words_in(dense_candidates)
+    asked = []
+    assert next_question(mapped, mapped_candidates, asked) == next_question(dense, dense_candidates, asked)